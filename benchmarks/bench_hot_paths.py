@@ -0,0 +1,196 @@
+"""
+Hot path benchmarks: search_people, get_profile, get_conversation_id and the pagination helpers.
+
+Each case runs against a local mock voyager server (in its own process, so
+its CPU isn't counted) and reports throughput, p50/p99 latency, client CPU
+time per call and peak memory allocated per call. Results can be saved and
+compared with a previous run, so regressions show up between versions:
+
+    $ python benchmarks/bench_hot_paths.py --save             # benchmarks/results/<version>-<commit>.json
+    $ python benchmarks/bench_hot_paths.py --compare benchmarks/results/1.1.0-abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# benchmark the working tree, not an installed copy
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+# the mock server lives with the tests
+sys.path.insert(0, os.path.join(ROOT_DIR, "tests"))
+
+import linkedin_api  # noqa: E402
+from linkedin_api.session_store import SessionStore  # noqa: E402
+from mock_server import MockVoyagerServer, mock_linkedin, start_process  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+# name -> call, given the api and the iteration number
+CASES = {
+    "search_people": lambda api, i: api.search_people(keywords="python", limit=49, start=0),
+    "get_profile": lambda api, i: api.get_profile(f"person-{i}"),
+    "get_conversation_id": lambda api, i: api.get_conversation_id("person-19"),
+    "iter_connections": lambda api, i: list(api.iter_connections()),
+    "iter_invitations": lambda api, i: list(api.iter_invitations()),
+    "refresh_sent_invitations": lambda api, i: api.refresh_sent_invitations(full=True),
+    "iter_sales_people_search": lambda api, i: list(
+        api.sales_navigator().iter_sales_people_search("python", limit=100)
+    ),
+}
+
+# metric -> True if higher is better
+METRICS = {
+    "calls_per_s": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "cpu_ms_per_call": False,
+    "alloc_kb_per_call": False,
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def bench_case(api, call, iterations, threads, alloc_iterations):
+    for i in range(3):  # warm up connections and caches
+        call(api, i)
+
+    latencies = []
+
+    def timed(i):
+        started = time.perf_counter()
+        call(api, i)
+        latencies.append(time.perf_counter() - started)
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(timed, range(iterations)))
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    allocations = []
+    tracemalloc.start()
+    for i in range(alloc_iterations):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        call(api, i)
+        allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        "calls_per_s": iterations / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_ms_per_call": cpu / iterations * 1000,
+        "alloc_kb_per_call": statistics.median(allocations) / 1024,
+    }
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each metric against [baseline]; return the number of regressions beyond [threshold].
+    """
+    regressions = 0
+    print(f"\ncompared with {baseline['version']} ({baseline['commit']}):")
+    if (baseline["threads"], baseline["iterations"]) != (results["threads"], results["iterations"]):
+        print("warning: baseline ran with different --threads/--iterations")
+    for case, metrics in results["cases"].items():
+        if case not in baseline["cases"]:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before = baseline["cases"][case][metric]
+            after = metrics[metric]
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(f"{case:>26} {metric:>18}: {before:10.2f} -> {after:10.2f} ({change:+.1%}){flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--iterations", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=1, help="concurrent callers")
+    parser.add_argument("--alloc-iterations", type=int, default=5)
+    parser.add_argument("-k", "--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--save", action="store_true", help=f"store the results in {RESULTS_DIR}")
+    parser.add_argument("--compare", metavar="RESULTS", help="results file to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="relative change counted as a regression"
+    )
+    args = parser.parse_args()
+
+    process, base_url = start_process(MockVoyagerServer())
+    try:
+        with tempfile.TemporaryDirectory() as cookie_dir:
+            api = mock_linkedin(
+                base_url, session_store=SessionStore(cookie_dir), pool_maxsize=args.threads
+            )
+            results = {
+                "version": linkedin_api.__version__,
+                "commit": commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.time(),
+                "iterations": args.iterations,
+                "threads": args.threads,
+                "cases": {},
+            }
+            for case in args.cases:
+                metrics = bench_case(
+                    api, CASES[case], args.iterations, args.threads, args.alloc_iterations
+                )
+                results["cases"][case] = metrics
+                print(
+                    f"{case:>26}: {metrics['calls_per_s']:8.1f} calls/s  "
+                    f"p50 {metrics['p50_ms']:7.2f} ms  p99 {metrics['p99_ms']:7.2f} ms  "
+                    f"cpu {metrics['cpu_ms_per_call']:7.2f} ms  "
+                    f"alloc {metrics['alloc_kb_per_call']:8.1f} KB"
+                )
+    finally:
+        process.terminate()
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{results['version']}-{results['commit']}.json")
+        with open(path, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"\nsaved {path}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+HTTP/2 against HTTP/1.1: concurrent get_profile and search_people through each transport, against the mock server.
+
+Runs [--calls] calls, [--concurrency] at a time, through a Client with the
+default requests connection pool (HTTP/1.1) and through one with an
+HTTP2Transport (HTTP/2 with prior knowledge, multiplexed on one connection),
+and reports throughput, p50/p99 latency, client CPU time per call and the
+connections the server accepted. The mock server runs in its own process,
+with [--latency] ms added to every response.
+
+The mock server speaks plain http, so HTTP/1.1 isn't charged the TLS
+handshake each of its connections costs against www.linkedin.com.
+
+    $ python benchmarks/bench_http2.py --concurrency 32
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# benchmark the working tree, not an installed copy
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+# the mock server lives with the tests
+sys.path.insert(0, os.path.join(ROOT_DIR, "tests"))
+
+from linkedin_api.http2 import HTTP2Transport  # noqa: E402
+from linkedin_api.session_store import SessionStore  # noqa: E402
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin, start_process  # noqa: E402
+
+# name -> call, given the api and the iteration number
+CASES = {
+    "get_profile": lambda api, i: api.get_profile(f"person-{i}"),
+    "search_people": lambda api, i: api.search_people(keywords="python", limit=49, start=0),
+}
+
+# name -> Client keyword arguments, given the concurrency
+TRANSPORTS = {
+    "http/1.1": lambda concurrency: {"pool_maxsize": concurrency},
+    "http/2": lambda concurrency: {"transport": HTTP2Transport(http1=False)},
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def connections(base_url):
+    # less the connection this request is sent on
+    return requests.get(f"{base_url}/__mock/stats").json()["connections"] - 1
+
+
+def run(base_url, transport, case, calls, concurrency):
+    with tempfile.TemporaryDirectory() as cookie_dir:
+        api = mock_linkedin(
+            base_url, session_store=SessionStore(cookie_dir), **TRANSPORTS[transport](concurrency)
+        )
+        call = CASES[case]
+        latencies = []
+
+        def timed(i):
+            started = time.perf_counter()
+            call(api, i)
+            latencies.append(time.perf_counter() - started)
+
+        opened = connections(base_url)
+        cpu = time.process_time()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed, range(calls)))
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu
+        opened = connections(base_url) - opened - 1
+        api.client.transport.close()
+
+    return {
+        "calls_per_s": calls / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_ms_per_call": cpu / calls * 1000,
+        "connections": opened,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("-n", "--calls", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=5, help="ms added to every response")
+    args = parser.parse_args()
+
+    faults = FaultProfile(latency=("constant", args.latency / 1000))
+    process, base_url = start_process(MockVoyagerServer(faults=faults))
+    try:
+        for case in args.cases:
+            for transport in TRANSPORTS:
+                result = run(base_url, transport, case, args.calls, args.concurrency)
+                print(
+                    f"{case:>14} {transport:>8}: {result['calls_per_s']:8.1f} calls/s  "
+                    f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+                    f"cpu {result['cpu_ms_per_call']:6.2f} ms/call  "
+                    f"{result['connections']} connections"
+                )
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    main()
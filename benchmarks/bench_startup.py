@@ -0,0 +1,100 @@
+"""
+Startup benchmark: time from `import linkedin_api` to the first completed request.
+
+Each run is a fresh interpreter that starts from a stored session and talks to
+the local mock voyager server, so the numbers are the client's own startup cost.
+
+    $ python benchmarks/bench_startup.py [--runs 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# benchmark the working tree, not an installed copy
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+# the mock server lives with the tests
+sys.path.insert(0, os.path.join(ROOT_DIR, "tests"))
+
+
+def _seed_session(directory, account):
+    from requests.cookies import RequestsCookieJar
+    from linkedin_api.session_store import SessionStore
+
+    cookiejar = RequestsCookieJar()
+    cookiejar.set("li_at", "stub", domain="127.0.0.1", expires=int(time.time()) + 30 * 24 * 3600)
+    cookiejar.set("JSESSIONID", '"ajax:stub"', domain="127.0.0.1", expires=int(time.time()) + 30 * 24 * 3600)
+    SessionStore(directory).save(account, cookiejar)
+
+
+def run_once(base_url, cookie_dir):
+    """
+    Return the startup phases of this interpreter, in milliseconds.
+    """
+    started = time.perf_counter()
+    from linkedin_api import Linkedin
+    from linkedin_api.client import Client
+    from linkedin_api.session_store import SessionStore
+
+    imported = time.perf_counter()
+    client = Client(evade=lambda: None, session_store=SessionStore(cookie_dir))
+    client.API_BASE_URL = base_url
+    api = Linkedin("bench@example.com", "password", client=client)
+    constructed = time.perf_counter()
+
+    api._fetch("/me").json()
+    first_request = time.perf_counter()
+
+    return {
+        "import_ms": (imported - started) * 1000,
+        "construct_ms": (constructed - imported) * 1000,
+        "first_request_ms": (first_request - constructed) * 1000,
+        "total_ms": (first_request - started) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--once", nargs=2, metavar=("BASE_URL", "COOKIE_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        print(json.dumps(run_once(*args.once)))
+        return
+
+    from mock_server import MockVoyagerServer
+
+    server = MockVoyagerServer().start()
+    base_url = f"{server.base_url}/voyager/api"
+
+    with tempfile.TemporaryDirectory() as cookie_dir:
+        _seed_session(cookie_dir, "bench@example.com")
+
+        runs = []
+        for _ in range(args.runs):
+            out = subprocess.run(
+                [sys.executable, __file__, "--once", base_url, cookie_dir],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            runs.append(json.loads(out))
+
+    server.stop()
+
+    for phase in runs[0]:
+        values = [run[phase] for run in runs]
+        print(
+            f"{phase:>18}: median {statistics.median(values):8.2f}  "
+            f"min {min(values):8.2f}  max {max(values):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Load driver: concurrent workloads through Linkedin against the mock server, under each fault profile.
+
+For every fault profile in tests/mock_server.py's PROFILES (or those given),
+runs [--calls] calls, [--concurrency] at a time, of a mix of get_profile,
+search_people, get_conversation_id and iter_invitations, and reports
+throughput, failures by type, retry amplification (requests the server
+received per request the client was asked to send) and tail latency.
+
+    $ python benchmarks/load_driver.py --profiles healthy flaky --retries 3
+
+With --adaptive, requests in flight are bounded by an AdaptiveLimiter rather
+than the concurrency alone, and the limit it converged on is reported.
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# drive the working tree, not an installed copy
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+# the mock server lives with the tests
+sys.path.insert(0, os.path.join(ROOT_DIR, "tests"))
+
+from linkedin_api.concurrency import AdaptiveLimiter  # noqa: E402
+from linkedin_api.session_store import SessionStore  # noqa: E402
+from mock_server import PROFILES, MockVoyagerServer, mock_linkedin, start_process  # noqa: E402
+
+# (call, weight) of the workload mix
+WORKLOAD = (
+    (lambda api, i: api.get_profile(f"person-{i}"), 4),
+    (lambda api, i: api.search_people(keywords="python", limit=25, start=0), 3),
+    (lambda api, i: api.get_conversation_id("person-7"), 2),
+    (lambda api, i: list(api.iter_invitations(page_size=25)), 1),
+)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def run_profile(name, calls, concurrency, retries, retry_backoff, adaptive=False):
+    limiter = AdaptiveLimiter(initial=1, max_limit=concurrency) if adaptive else None
+    process, base_url = start_process(MockVoyagerServer(faults=PROFILES[name]))
+    try:
+        with tempfile.TemporaryDirectory() as cookie_dir:
+            api = mock_linkedin(
+                base_url,
+                session_store=SessionStore(cookie_dir),
+                pool_maxsize=concurrency,
+                retries=retries,
+                retry_backoff=retry_backoff,
+                concurrency=limiter,
+            )
+
+            # count the requests the client is asked to send, before retries
+            lock = threading.Lock()
+            sent = [0]
+            request = api.client.request
+
+            def counted_request(*args, **kwargs):
+                with lock:
+                    sent[0] += 1
+                return request(*args, **kwargs)
+
+            api.client.request = counted_request
+
+            mix = [call for call, weight in WORKLOAD for _ in range(weight)]
+            latencies = []
+            failures = collections.Counter()
+
+            def timed(i):
+                started = time.perf_counter()
+                try:
+                    mix[i % len(mix)](api, i)
+                except Exception as e:
+                    failures[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(timed, range(calls)))
+            elapsed = time.perf_counter() - started
+
+        stats = requests.get(f"{base_url}/__mock/stats").json()
+    finally:
+        process.terminate()
+
+    succeeded = calls - sum(failures.values())
+    return {
+        "calls": calls,
+        "succeeded": succeeded,
+        "calls_per_s": succeeded / elapsed,
+        "failures": dict(failures),
+        "requests": sent[0],
+        "server_requests": stats["requests"],
+        "server_statuses": stats["statuses"],
+        "amplification": stats["requests"] / sent[0] if sent[0] else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "p999_ms": percentile(latencies, 99.9) * 1000,
+        "limit": limiter.limit if limiter is not None else concurrency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument("-n", "--calls", type=int, default=400)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--retries", type=int, default=3, help="Client(retries=...)")
+    parser.add_argument(
+        "--retry-backoff", type=float, default=0.05, help="Client(retry_backoff=...), seconds"
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true", help="bound requests in flight with an AdaptiveLimiter"
+    )
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.profiles:
+        result = run_profile(
+            name, args.calls, args.concurrency, args.retries, args.retry_backoff, args.adaptive
+        )
+        results[name] = result
+        failures = ", ".join(f"{k} {v}" for k, v in sorted(result["failures"].items())) or "none"
+        print(
+            f"{name:>12}: {result['calls_per_s']:8.1f} calls/s  "
+            f"{result['succeeded']}/{result['calls']} ok  "
+            f"amplification {result['amplification']:5.2f}x  "
+            f"p50 {result['p50_ms']:8.1f} ms  p99 {result['p99_ms']:8.1f} ms  "
+            f"p99.9 {result['p999_ms']:8.1f} ms  limit {result['limit']:3d}  failures: {failures}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
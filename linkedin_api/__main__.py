@@ -0,0 +1,5 @@
+import sys
+
+from linkedin_api.cli import main
+
+sys.exit(main())
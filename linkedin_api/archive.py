@@ -0,0 +1,313 @@
+"""
+Compressed archive of raw Linkedin responses, and offline re-parsing from it
+
+Every response sent through a Client with an archive is appended, with its
+request, to a compressed JSONL segment; segments rotate once they hold
+[segment_size] bytes. `replay` feeds the archived responses back through the
+current Linkedin parsers, so a dataset can be reprocessed without the network.
+
+zstd compression requires zstandard: pip install linkedin_api[archive]
+"""
+import base64
+import collections
+import glob
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+from linkedin_api.transport import make_response
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+# numbers the segments opened by this process, so their names never collide
+_segment_numbers = itertools.count()
+
+
+class ResponseArchive(object):
+    """
+    Appends raw responses to rotating, compressed JSONL segments in [directory].
+
+    Each process writes its own segments, so many processes can share a directory.
+    """
+
+    def __init__(self, directory, segment_size=64 * 1024 * 1024, compression="zstd", level=3):
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"unsupported compression {compression!r}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstandard is required for zstd archives: pip install linkedin_api[archive]"
+            )
+
+        self.directory = directory
+        self.segment_size = segment_size
+        self.compression = compression
+        self.level = level
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._writer = None
+        self._written = 0
+
+    def _open_segment(self):
+        name = (
+            f"{int(time.time() * 1000):013d}-{os.getpid()}-{next(_segment_numbers):06d}"
+            f"{_EXTENSIONS[self.compression]}"
+        )
+        path = os.path.join(self.directory, name)
+        if self.compression == "zstd":
+            self._file = open(path, "ab")
+            self._writer = zstandard.ZstdCompressor(level=self.level).stream_writer(
+                self._file, closefd=False
+            )
+        else:
+            self._file = None
+            self._writer = gzip.open(path, "ab", compresslevel=self.level)
+        self._written = 0
+
+    def _close_segment(self):
+        if self._writer is None:
+            return
+
+        self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = self._writer = None
+
+    def record(self, response):
+        """
+        Append [response] and the request that produced it.
+        """
+        request = response.request
+        body = request.body
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", "replace")
+
+        line = json.dumps(
+            {
+                "time": time.time(),
+                "method": request.method,
+                "url": request.url,
+                "request_body": body,
+                "status": response.status_code,
+                "content_type": response.headers.get("content-type"),
+                "body": base64.b64encode(response.content).decode("ascii"),
+            }
+        ).encode("utf-8") + b"\n"
+
+        with self._lock:
+            if self._writer is None or self._written >= self.segment_size:
+                self._close_segment()
+                self._open_segment()
+
+            self._writer.write(line)
+            # keep every record readable if the process dies
+            if self.compression == "zstd":
+                self._writer.flush(zstandard.FLUSH_BLOCK)
+            else:
+                self._writer.flush()
+            self._written += len(line)
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def segments(self):
+        paths = []
+        for extension in _EXTENSIONS.values():
+            paths.extend(glob.glob(os.path.join(self.directory, "*" + extension)))
+
+        return sorted(paths, key=os.path.basename)
+
+    def records(self):
+        """
+        Yield every archived record, oldest first, with its body decoded to bytes.
+        """
+        for path in self.segments():
+            for record in _read_segment(path):
+                record["body"] = base64.b64decode(record["body"])
+                yield record
+
+
+# raised reading a segment cut short, i.e. by a crash mid-write
+_TRUNCATED_ERRORS = (EOFError, OSError) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+def _read_segment(path):
+    with open(path, "rb") as f:
+        if path.endswith(_EXTENSIONS["zstd"]):
+            if zstandard is None:
+                raise ImportError(
+                    "zstandard is required for zstd archives: pip install linkedin_api[archive]"
+                )
+            raw = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        else:
+            raw = gzip.GzipFile(fileobj=f)
+
+        lines = io.BufferedReader(raw)
+        while True:
+            try:
+                line = lines.readline()
+            except _TRUNCATED_ERRORS:
+                logger.info(f"archive segment {path} is truncated")
+                return
+            if not line:
+                return
+            if not line.endswith(b"\n"):
+                logger.info(f"archive segment {path} ends with a partial record")
+                return
+
+            yield json.loads(line)
+
+
+class ArchiveAdapter(BaseAdapter):
+    """
+    Answers requests with archived responses, rather than the network.
+
+    Responses are fed in as records; the latest record for a (method, url) wins.
+    At most [max_records] are held, oldest dropped first.
+    """
+
+    def __init__(self, records=(), max_records=None):
+        super().__init__()
+        self.max_records = max_records
+        self._responses = collections.OrderedDict()
+        for record in records:
+            self.feed(record)
+
+    def feed(self, record):
+        key = (record["method"], record["url"])
+        self._responses.pop(key, None)
+        self._responses[key] = record
+        if self.max_records is not None and len(self._responses) > self.max_records:
+            self._responses.popitem(last=False)
+
+    def send(self, request, **kwargs):
+        record = self._responses.get((request.method, request.url))
+        if record is None:
+            raise requests.ConnectionError(f"not archived: {request.method} {request.url}")
+
+        return make_response(
+            request, record["status"], record["body"], content_type=record.get("content_type")
+        )
+
+    def close(self):
+        pass
+
+
+def offline_linkedin(adapter):
+    """
+    Return a Linkedin instance whose requests are all answered by [adapter].
+    """
+    from linkedin_api.client import Client
+    from linkedin_api.linkedin import Linkedin
+
+    client = Client(evade=lambda: None, transport=adapter)
+
+    return Linkedin(None, None, client=client)
+
+
+def _route_profile(method):
+    def route(path, query):
+        return method, {"public_id": path.split("/")[-2]}
+
+    return route
+
+
+def _route_company(path, query):
+    return "get_company", {"public_id": query.get("universalName", [""])[0]}
+
+
+def _route_search(path, query):
+    # a page of people search results; the search can't be called again with the
+    # same url, so the archived page is parsed as search_people parses it
+    from linkedin_api.linkedin import parse_people_search
+
+    if "resultType->PEOPLE" not in query.get("filters", [""])[0]:
+        return None
+
+    kwargs = {
+        "keywords": query.get("keywords", [""])[0].strip() or None,
+        "start": int(query.get("start", ["0"])[0]),
+        "limit": int(query.get("count", ["0"])[0]) or None,
+    }
+    return "search_people", kwargs, parse_people_search
+
+
+# archived GET path -> Linkedin method (and its arguments) that produced it, or
+# (method, arguments, parser) of a response re-parsed from its archived body;
+# a route may return None to skip a response
+REPLAY_ROUTES = (
+    (re.compile(r"/identity/profiles/[^/]+/profileView$"), _route_profile("get_profile")),
+    (
+        re.compile(r"/identity/profiles/[^/]+/profileContactInfo$"),
+        _route_profile("get_profile_contact_info"),
+    ),
+    (re.compile(r"/organization/companies$"), _route_company),
+    (re.compile(r"/search/blended$"), _route_search),
+)
+
+
+def replay(archive, routes=REPLAY_ROUTES, lookahead=32):
+    """
+    Re-parse archived responses with the current Linkedin parsers, offline.
+
+    Yield (method, kwargs, result) for each archived response matching [routes].
+    A call is replayed once [lookahead] more records have been read, so the
+    sub-requests it made (i.e. get_profile's skills) are available to it.
+    """
+    adapter = ArchiveAdapter(max_records=lookahead * 4)
+    api = offline_linkedin(adapter)
+    pending = collections.deque()
+
+    def call(record, method, kwargs, parse=None):
+        try:
+            if parse is not None:
+                return method, kwargs, parse(json.loads(record["body"]))
+            return method, kwargs, getattr(api, method)(**kwargs)
+        except Exception as e:
+            logger.info(f"replaying {method}({kwargs}) failed: {e}")
+            return method, kwargs, None
+
+    for index, record in enumerate(archive.records()):
+        adapter.feed(record)
+
+        if record["method"] == "GET" and record["status"] == 200:
+            url = urlparse(record["url"])
+            for pattern, route in routes:
+                if pattern.search(url.path):
+                    routed = route(url.path, parse_qs(url.query))
+                    if routed is not None:
+                        pending.append((index, record, routed))
+                    break
+
+        while pending and pending[0][0] + lookahead <= index:
+            _, pending_record, routed = pending.popleft()
+            yield call(pending_record, *routed)
+
+    while pending:
+        _, pending_record, routed = pending.popleft()
+        yield call(pending_record, *routed)
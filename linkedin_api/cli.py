@@ -0,0 +1,334 @@
+"""
+linkedin-api: run a JSONL job file through a pool of worker processes.
+
+Each line of the job file is one job, either a profile id:
+
+    "tom-quirk"
+
+or an object naming the method to call and its arguments:
+
+    {"id": "job-1", "method": "get_profile", "public_id": "tom-quirk"}
+    {"method": "search_people", "keywords": "python", "regions": ["au:4910"]}
+
+Results are streamed to the output file as JSON lines or, with --format
+parquet, to people/experience/education/skills Parquet datasets in the output
+directory (get_profile, get_profile_connections and search_people jobs only;
+requires pyarrow). Jobs that succeed are recorded in a checkpoint file, so
+running the same command again resumes where it stopped and retries the jobs
+that failed, including those whose method returned nothing (i.e. get_profile
+returning {} when throttled). Workers share one session store, so the account
+logs in at most once.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from linkedin_api.client import Client
+from linkedin_api.linkedin import Linkedin
+from linkedin_api.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+# read-only methods a job may call
+JOB_METHODS = (
+    "get_profile",
+    "get_profile_contact_info",
+    "get_profile_skills",
+    "get_profile_connections",
+    "get_profile_updates",
+    "get_company",
+    "get_company_updates",
+    "get_school",
+    "search",
+    "search_people",
+)
+
+# methods whose results --format parquet can write
+PARQUET_METHODS = ("get_profile", "get_profile_connections", "search_people")
+
+_api = None
+
+
+def parse_job(line, line_number):
+    """
+    Return (job_id, method, kwargs) of a job file line.
+    """
+    job = json.loads(line)
+    if not isinstance(job, dict):
+        job = {"public_id": job}
+
+    job_id = str(job.pop("id", line_number))
+    method = job.pop("method", "get_profile")
+    if method not in JOB_METHODS:
+        raise ValueError(f"job {job_id}: unsupported method {method!r}")
+
+    return job_id, method, job
+
+
+def load_jobs(path):
+    """
+    Return [(job_id, method, kwargs)] of every job in the job file at [path].
+    """
+    jobs = []
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                jobs.append(parse_job(line, line_number))
+
+    return jobs
+
+
+def load_checkpoint(path):
+    """
+    Return the ids of the jobs already completed.
+    """
+    try:
+        with open(path, "r") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def _init_worker(username, password, cookie_dir):
+    global _api
+    client = Client(session_store=SessionStore(cookie_dir))
+    _api = Linkedin(username, password, client=client)
+
+
+def result_error(result):
+    """
+    Return why [result] is a failure, or None. Methods such as get_profile
+    return {} (rather than raising) when a request fails.
+    """
+    if result is None or result == {}:
+        return "empty result"
+    if isinstance(result, dict) and result.get("status", 200) != 200:
+        return f"status {result['status']}"
+
+    return None
+
+
+def _run_job(job):
+    job_id, method, kwargs = job
+    try:
+        result = getattr(_api, method)(**kwargs)
+    except Exception as e:
+        return job_id, method, None, f"{type(e).__name__}: {e}"
+
+    error = result_error(result)
+    if error is not None:
+        return job_id, method, None, error
+
+    return job_id, method, result, None
+
+
+class JsonlSink(object):
+    """
+    Appends each job's result (or error) to the JSONL file at [path].
+    """
+
+    # jobs written between flushes; each write is flushed
+    flush_every = 1
+
+    def __init__(self, path):
+        self._file = open(path, "a")
+
+    def write(self, job_id, method, result, error):
+        record = {"id": job_id, "method": method}
+        if error is None:
+            record["result"] = result
+        else:
+            record["error"] = error
+
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink(object):
+    """
+    Writes each job's result to Parquet datasets in [directory]. Errors are only logged.
+
+    Rows are only safely on disk once flushed, every [flush_every] jobs.
+    """
+
+    flush_every = 500
+
+    def __init__(self, directory):
+        from linkedin_api.export import ProfileWriter
+
+        self._writer = ProfileWriter(directory)
+
+    def write(self, job_id, method, result, error):
+        if error is not None:
+            return
+
+        if method == "get_profile":
+            self._writer.write_profile(result)
+            return
+
+        people = result[1] if method == "search_people" else result
+        for person in people:
+            self._writer.write_person(person)
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+
+def _mark_done(done, job_ids):
+    # record [job_ids], whose results have been flushed, in the checkpoint file [done]
+    for job_id in job_ids:
+        done.write(job_id + "\n")
+    done.flush()
+    job_ids.clear()
+
+
+class Progress(object):
+    """
+    Job counts and throughput, reported to stderr at most every [interval] seconds.
+    """
+
+    def __init__(self, total, interval=1.0, stream=sys.stderr):
+        self.total = total
+        self.interval = interval
+        self.stream = stream
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._reported = 0
+
+    def update(self, failed=False):
+        self.done += 1
+        self.failed += failed
+        now = time.perf_counter()
+        if now - self._reported >= self.interval or self.done == self.total:
+            self._reported = now
+            self.report()
+
+    def report(self, end="\r"):
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        self.stream.write(
+            f"{self.done}/{self.total} jobs, {self.failed} failed, "
+            f"{rate:.2f} jobs/s, {elapsed:.0f}s elapsed{end}"
+        )
+        self.stream.flush()
+
+
+def run(
+    jobs,
+    output,
+    checkpoint,
+    username,
+    password,
+    cookie_dir=None,
+    workers=4,
+    output_format="jsonl",
+    failures=None,
+):
+    """
+    Run [jobs] not yet recorded in [checkpoint], writing results to [output].
+
+    The jobs that fail this run are written to [failures] (default:
+    [checkpoint].failed) as JSON lines, and left out of [checkpoint]. Completed
+    jobs are only added to [checkpoint] once their results are flushed to [output].
+
+    Return the Progress of the run.
+    """
+    completed = load_checkpoint(checkpoint)
+    pending = [job for job in jobs if job[0] not in completed]
+    progress = Progress(len(pending))
+    if not pending:
+        return progress
+
+    cookie_dir = cookie_dir or SessionStore().directory
+    with multiprocessing.Pool(
+        workers, initializer=_init_worker, initargs=(username, password, cookie_dir)
+    ) as pool, open(checkpoint, "a") as done, open(failures or f"{checkpoint}.failed", "w") as failed:
+        sink = ParquetSink(output) if output_format == "parquet" else JsonlSink(output)
+        # completed, but not yet flushed to the output
+        unflushed = []
+        try:
+            for job_id, method, result, error in pool.imap_unordered(_run_job, pending):
+                sink.write(job_id, method, result, error)
+                if error is None:
+                    unflushed.append(job_id)
+                    if len(unflushed) >= sink.flush_every:
+                        sink.flush()
+                        _mark_done(done, unflushed)
+                else:
+                    logger.info(f"job {job_id} failed: {error}")
+                    failed.write(json.dumps({"id": job_id, "method": method, "error": error}) + "\n")
+                    failed.flush()
+
+                progress.update(failed=error is not None)
+        finally:
+            sink.close()
+            _mark_done(done, unflushed)
+
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="linkedin-api",
+        description="Run a JSONL job file through a pool of worker processes.",
+    )
+    parser.add_argument("jobs", help="JSONL job file")
+    parser.add_argument(
+        "-o", "--output", required=True, help="JSONL file (or, for parquet, directory) results are written to"
+    )
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument(
+        "--checkpoint", help="file recording completed job ids (default: OUTPUT.done)"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=4, help="worker processes")
+    parser.add_argument(
+        "--username", default=os.getenv("LINKEDIN_USERNAME"), help="default: $LINKEDIN_USERNAME"
+    )
+    parser.add_argument(
+        "--password", default=os.getenv("LINKEDIN_PASSWORD"), help="default: $LINKEDIN_PASSWORD"
+    )
+    parser.add_argument("--cookie-dir", help="session store directory shared by the workers")
+    args = parser.parse_args(argv)
+
+    if not (args.username and args.password):
+        parser.error("credentials missing: pass --username/--password or set LINKEDIN_USERNAME/LINKEDIN_PASSWORD")
+
+    jobs = load_jobs(args.jobs)
+    if args.format == "parquet":
+        unsupported = {method for _, method, _ in jobs} - set(PARQUET_METHODS)
+        if unsupported:
+            parser.error(f"--format parquet does not support {', '.join(sorted(unsupported))} jobs")
+
+    logging.basicConfig(level=logging.INFO)
+
+    progress = run(
+        jobs,
+        args.output,
+        args.checkpoint or f"{args.output}.done",
+        args.username,
+        args.password,
+        cookie_dir=args.cookie_dir,
+        workers=args.workers,
+        output_format=args.format,
+    )
+    progress.report(end="\n")
+
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
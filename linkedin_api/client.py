@@ -1,12 +1,49 @@
 import requests
-import pickle
+from requests.adapters import HTTPAdapter
+import random
+import contextlib
+import functools
 import logging
+import threading
+import time
+from time import sleep
 
-import linkedin_api.settings as settings
+import urllib3
+
+from linkedin_api import deadlines
+from linkedin_api.deadlines import DeadlineExceeded
+from linkedin_api.quota import QuotaExceeded, endpoint_family
+from linkedin_api.rate_limit import RateLimitExceeded
+from linkedin_api.session_store import SessionStore
 
 logger = logging.getLogger(__name__)
 
 
+def default_evade(start: int = 2, end: int = 10) -> None:
+    """
+    A catch-all method to try and evade suspension from Linkedin.
+    Currenly, just delays the request by a random (bounded) time
+    """
+    delay = random.uniform(2, 10)
+    left = deadlines.remaining()
+    if left is not None and delay >= left:
+        raise DeadlineExceeded("pacing would outlast the deadline")
+    sleep(delay)  # sleep a random duration to try and evade suspention
+
+
+def _failed_to_connect(error):
+    """
+    Return True if [error], a requests.ConnectionError, was raised before the
+    request was sent: i.e. the connection was refused or timed out.
+    """
+    reason = error.args[0] if error.args else None
+    # urllib3 wraps the error in a MaxRetryError
+    reason = getattr(reason, "reason", reason)
+    return isinstance(error, requests.ConnectTimeout) or isinstance(
+        reason, urllib3.exceptions.ConnectTimeoutError
+    )
+
+
 class ChallengeException(Exception):
     pass
 
@@ -18,10 +55,19 @@ class UnauthorizedException(Exception):
 class Client(object):
     """
     Class to act as a client for the Linkedin API.
+
+    A single authenticated session (cookies, connection pool and pacing) that
+    is shared by the voyager and Sales Navigator APIs.
+
+    A client is safe to share between threads: the session's headers are never
+    mutated after construction (the csrf-token is added to each request), and
+    authentication swaps in a complete cookie jar under a lock. Keep
+    [pool_maxsize] at least the number of threads, so connections are reused.
     """
 
     # Settings for general Linkedin API calls
     API_BASE_URL = "https://www.linkedin.com/voyager/api"
+    SALES_API_BASE_URL = "https://www.linkedin.com/sales-api"
     REQUEST_HEADERS = {
         "user-agent": " ".join(
             [
@@ -49,77 +95,466 @@ class Client(object):
         "Accept-Language": "en-us",
     }
 
-    def __init__(self, debug=False, refresh_cookies=False):
+    # refresh a session this long (seconds) before its cookies expire
+    SESSION_REFRESH_MARGIN = 60 * 60
+    # wait this long (seconds) after a failed refresh before trying again, while the session lasts
+    SESSION_REFRESH_BACKOFF = 10 * 60
+
+    # throttled (429, and Linkedin's 999) or unavailable responses worth retrying
+    RETRY_STATUSES = (429, 502, 503, 504, 999)
+    RETRY_MAX_DELAY = 60
+    # methods retried after any connection error; others (i.e. the POST of
+    # send_message) only when the connection failed before the request was sent
+    RETRY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    # (connect, read) timeouts in seconds, and those of endpoint families (see linkedin_api.quota.FAMILIES)
+    TIMEOUT = (10, 30)
+    TIMEOUTS = {"search": (10, 60)}
+
+    def __init__(
+        self,
+        debug=False,
+        refresh_cookies=False,
+        proxies={},
+        evade=default_evade,
+        session_store=None,
+        session_max_age=None,
+        pool_maxsize=10,
+        archive=None,
+        transport=None,
+        retries=0,
+        retry_backoff=1.0,
+        metrics=None,
+        profiler=None,
+        quota=None,
+        account=None,
+        rate_limiter=None,
+        concurrency=None,
+        timeout=None,
+        timeouts=None,
+    ):
         self.session = requests.session()
-        self.session.headers = Client.REQUEST_HEADERS
+        self.session.headers = dict(Client.REQUEST_HEADERS)
+        # requests adapter sending every request, i.e. a linkedin_api.transport.ReplayTransport
+        self.transport = transport or HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount("https://", self.transport)
+        self.session.mount("http://", self.transport)
+        self.proxies = proxies
+        self.evade = evade
+        self.session_store = session_store or SessionStore()
+        # ResponseArchive every response is appended to, if any
+        self.archive = archive
+        # times a request is retried after a RETRY_STATUSES response or a connection error
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        # linkedin_api.metrics.Metrics every request is recorded in, if any
+        self.metrics = metrics
+        # linkedin_api.profiling.Profiler timing the phases of every public API call, if any
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self.transport)
+        # linkedin_api.quota.QuotaManager every request takes budget from, charged to [account]
+        # (default: the username given to set_credentials)
+        self.quota = quota
+        self.account = account
+        # linkedin_api.rate_limit.RateLimiter every request takes a token from, i.e. shared
+        # with the other processes sending as the account
+        self.rate_limiter = rate_limiter
+        # linkedin_api.concurrency.AdaptiveLimiter bounding the requests in flight, if any
+        self.concurrency = concurrency
+        # (connect, read) timeouts of requests, and of the requests to each endpoint family
+        self.timeout = timeout or Client.TIMEOUT
+        self.timeouts = dict(Client.TIMEOUTS, **(timeouts or {}))
 
         self.logger = logger
         self._use_cookie_cache = not refresh_cookies
-        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+        if debug:
+            logging.getLogger("linkedin_api").setLevel(logging.DEBUG)
+
+        self._credentials = None
+        self._authenticated = False
+        self._auth_lock = threading.RLock()
+        # (cookie jar, csrf-token) of the session, replaced as one
+        self._session_cookies = (None, None)
+        # bumped on every authentication, so concurrent 401s re-authenticate once
+        self._auth_generation = 0
+
+        self.session_max_age = session_max_age
+        self._session_saved_at = None
+        self._session_expires_at = None
+        # when refreshing the session last failed, if it did since the last login
+        self._refresh_failed_at = None
+        self._health_check_stop = None
+
+    @property
+    def csrf_token(self):
+        return self._session_cookies[1]
+
+    def set_credentials(self, username, password):
+        """
+        Authenticate as [username] on the first request, rather than now.
+        """
+        self._credentials = (username, password)
+        self._authenticated = False
+        if self.account is None:
+            self.account = username
+
+    def session_is_stale(self):
+        """
+        Return True if the session's cookies are about to expire, or it is older than session_max_age.
+        """
+        now = time.time()
+        if (
+            self._session_expires_at is not None
+            and now >= self._session_expires_at - Client.SESSION_REFRESH_MARGIN
+        ):
+            return True
+
+        return (
+            self.session_max_age is not None
+            and self._session_saved_at is not None
+            and now - self._session_saved_at >= self.session_max_age
+        )
+
+    def session_is_expired(self):
+        """
+        Return True if the session's cookies have expired.
+        """
+        return self._session_expires_at is not None and time.time() >= self._session_expires_at
+
+    def _refresh_is_due(self):
+        # stale, and not backing off from a failed refresh (unless the session has expired)
+        if not self.session_is_stale():
+            return False
+        return (
+            self._refresh_failed_at is None
+            or time.time() - self._refresh_failed_at >= Client.SESSION_REFRESH_BACKOFF
+            or self.session_is_expired()
+        )
+
+    def ensure_authenticated(self):
+        """
+        Authenticate with the credentials given to set_credentials, once,
+        and again whenever the session is stale.
+
+        A refresh that fails (i.e. with a ChallengeException) is logged, and the
+        session used until it expires; the next one is tried SESSION_REFRESH_BACKOFF
+        seconds later, rather than logging in again on every request.
+        """
+        if self._credentials is None:
+            return
+        if self._authenticated and not self._refresh_is_due():
+            return
+
+        with self._auth_lock:
+            if not self._authenticated:
+                self.authenticate(*self._credentials)
+            elif self._refresh_is_due():
+                self.logger.info("Session is about to expire, refreshing")
+                try:
+                    self.authenticate(*self._credentials, refresh=True)
+                except Exception as e:
+                    if self.session_is_expired():
+                        raise
+                    self._refresh_failed_at = time.time()
+                    self.logger.warning(f"Session refresh failed, keeping the current session: {e}")
+
+    def reauthenticate(self, generation=None):
+        """
+        Log in again, unless the session has been refreshed since [generation].
+
+        Return False if there are no credentials to log in with.
+        """
+        if self._credentials is None:
+            return False
+
+        with self._auth_lock:
+            if generation is None or generation == self._auth_generation:
+                self.authenticate(*self._credentials, refresh=True)
+
+        return True
+
+    def check_session(self):
+        """
+        Return True if Linkedin still accepts the session. Cheap, and not paced.
+        """
+        res = self._send("GET", f"{Client.API_BASE_URL}/me")
+
+        return res.status_code == 200
+
+    def start_health_check(self, interval=600):
+        """
+        Check the session every [interval] seconds in a background thread,
+        re-authenticating as soon as it is stale or rejected with a 401.
+
+        Other failures (i.e. throttled with a 429 or 999) never log in again:
+        repeated logins are what gets an account challenged.
+        """
+        self.stop_health_check()
+        stop = self._health_check_stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self._check_health()
+                except Exception as e:
+                    self.logger.info(f"session health check failed: {e}")
+
+        threading.Thread(target=run, name="linkedin-session-health", daemon=True).start()
+
+    def _check_health(self):
+        # the session as checked, so a concurrent 401 replay isn't followed by a second login
+        generation = self._auth_generation
+        if self.session_is_stale():
+            self.ensure_authenticated()
+            return
+
+        res = self._send("GET", f"{Client.API_BASE_URL}/me")
+        if res.status_code == 401:
+            self.logger.info("Session rejected, re-authenticating")
+            self.reauthenticate(generation)
+        elif res.status_code != 200:
+            self.logger.info(f"session health check got a {res.status_code}")
+
+    def stop_health_check(self):
+        if self._health_check_stop is not None:
+            self._health_check_stop.set()
+            self._health_check_stop = None
+
+    def request(self, method, url, evade=None, **kwargs):
+        """
+        Send a request through the shared session, paced by [evade] (default: self.evade).
+
+        A request rejected with a 401 is replayed once, after re-authenticating.
+        Throttled or failed requests are retried up to self.retries times.
+
+        Raises DeadlineExceeded if the deadline in force (see linkedin_api.deadlines)
+        passes before a response arrives.
+        """
+        deadlines.check(f"{method} {url}")
+        self.ensure_authenticated()
+        started = time.perf_counter()
+        (evade or self.evade)()
+        deadlines.check(f"{method} {url}")
+        waited = time.perf_counter() - started
+        if self.metrics is not None:
+            self.metrics.observe_pacing(waited)
+        if self.profiler is not None:
+            self.profiler.record("wait", waited)
+
+        generation = self._auth_generation
+        with self._span(method, url) as span:
+            res = self._send_with_retries(method, url, **kwargs)
+
+            if res.status_code == 401 and self._credentials is not None:
+                self.logger.info("Session rejected, re-authenticating")
+                self.reauthenticate(generation)
+                res = self._send_with_retries(method, url, **kwargs)
+
+            if span is not None:
+                span.set_attribute("http.response.status_code", res.status_code)
+
+        if self.archive is not None:
+            self.archive.record(res)
+
+        return res
+
+    def retry_delay(self, attempt, res=None):
+        """
+        Return the seconds to wait before retry [attempt] (from 0): the response's
+        Retry-After if given, otherwise an exponential backoff with jitter.
+        """
+        retry_after = res is not None and res.headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), Client.RETRY_MAX_DELAY)
+
+        delay = self.retry_backoff * 2 ** attempt * random.uniform(0.5, 1)
+        return min(delay, Client.RETRY_MAX_DELAY)
+
+    def _send_with_retries(self, method, url, **kwargs):
+        attempt = 0
+        while True:
+            error = None
+            try:
+                res = self._send(method, url, **kwargs)
+            except requests.Timeout as e:
+                if deadlines.expired():
+                    raise DeadlineExceeded(f"{method} {url} ran out of time") from e
+                # a connect timeout is a connection error, worth retrying
+                if not isinstance(e, requests.ConnectionError) or attempt >= self.retries:
+                    raise
+                res, error = None, e
+                self.logger.info(f"{method} {url} failed: {e}")
+            except requests.ConnectionError as e:
+                # the server may have acted on a request reset mid-flight, i.e. sent a message
+                if attempt >= self.retries or (
+                    method.upper() not in Client.RETRY_METHODS and not _failed_to_connect(e)
+                ):
+                    raise
+                res, error = None, e
+                self.logger.info(f"{method} {url} failed: {e}")
+            else:
+                if res.status_code not in Client.RETRY_STATUSES or attempt >= self.retries:
+                    return res
+
+            delay = self.retry_delay(attempt, res)
+            left = deadlines.remaining()
+            if left is not None and delay >= left:
+                raise DeadlineExceeded(f"{method} {url} can't be retried in time") from error
+            self.logger.info(
+                f"retrying {method} {url} in {delay:.1f}s ({attempt + 1}/{self.retries})"
+            )
+            sleep(delay)
+            if self.profiler is not None:
+                self.profiler.record("wait", delay)
+            attempt += 1
+
+    def _send(self, method, url, headers=None, **kwargs):
+        """
+        Send a request with the session's csrf-token, leaving the session's headers untouched.
+        """
+        cookies, csrf_token = self._session_cookies
+        if csrf_token is not None:
+            headers = {"csrf-token": csrf_token, **(headers or {})}
+            # the cookies the csrf-token belongs to, even if a login has replaced them since
+            kwargs.setdefault("cookies", cookies)
+
+        if self.quota is not None or self.rate_limiter is not None:
+            self._take_turn(url)
+        kwargs.setdefault("timeout", self.timeout_for(url))
+
+        request = self.session.request
+        if self.profiler is not None:
+            request = functools.partial(self.profiler.send, request)
+        if self.concurrency is not None:
+            request = functools.partial(self.concurrency.send, request)
+
+        if self.metrics is None:
+            return request(method, url, headers=headers, proxies=self.proxies, **kwargs)
+
+        started = time.perf_counter()
+        res = None
+        try:
+            res = request(method, url, headers=headers, proxies=self.proxies, **kwargs)
+        finally:
+            self.metrics.observe_request(method, url, res, time.perf_counter() - started)
+        return res
+
+    def timeout_for(self, url):
+        """
+        Return the (connect, read) timeout of a request to [url]: that of its
+        endpoint family, cut to the time left before the deadline in force.
+        """
+        timeout = self.timeouts.get(endpoint_family(url), self.timeout)
+        left = deadlines.remaining()
+        if left is None:
+            return timeout
+        if left <= 0:
+            raise DeadlineExceeded(f"no time left for {url}")
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return tuple(left if t is None else min(t, left) for t in timeout)
+
+    def _take_turn(self, url):
+        # wait for the account's budget for [url], then for its rate limit
+        started = time.perf_counter()
+        account = self.account or "default"
+        deadline = deadlines.current()
+        try:
+            if self.quota is not None:
+                self.quota.acquire(account, url, deadline=deadline)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(account, timeout=deadlines.remaining())
+        except (QuotaExceeded, RateLimitExceeded) as e:
+            # a wait cut short by the call's deadline is the call running out of time
+            missed = getattr(e, "deadline", deadline)
+            if deadline is not None and missed == deadline:
+                raise DeadlineExceeded(f"no turn for {url} before the deadline") from e
+            raise
+        if self.profiler is not None:
+            self.profiler.record("wait", time.perf_counter() - started)
+
+    def _span(self, method, url):
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.span(method, url)
 
     def _request_session_cookies(self):
         """
         Return a new set of session cookies as given by Linkedin.
         """
-        if self._use_cookie_cache:
-            self.logger.debug("Attempting to use cached cookies")
-            try:
-                with open(settings.COOKIE_FILE_PATH, "rb") as f:
-                    cookies = pickle.load(f)
-                    if cookies:
-                        return cookies
-            except FileNotFoundError:
-                self.logger.debug(
-                    "Cookie file not found. Requesting new cookies.")
-
-        res = requests.get(
-            f"{Client.AUTH_BASE_URL}/uas/authenticate",
-            headers=Client.AUTH_REQUEST_HEADERS,
-        )
+        url = f"{Client.AUTH_BASE_URL}/uas/authenticate"
+        res = requests.get(url, headers=Client.AUTH_REQUEST_HEADERS, timeout=self.timeout_for(url))
 
         return res.cookies
 
     def _set_session_cookies(self, cookiejar):
         """
-        Set cookies of the current session and save them to a file.
+        Set cookies of the current session.
+
+        The jar and its csrf-token are published together, so a concurrent
+        request never pairs a new JSESSIONID with the old csrf-token.
         """
+        self._session_cookies = (cookiejar, cookiejar["JSESSIONID"].strip('"'))
         self.session.cookies = cookiejar
-        self.session.headers["csrf-token"] = self.session.cookies["JSESSIONID"].strip(
-            '"'
-        )
-        with open(settings.COOKIE_FILE_PATH, "wb") as f:
-            pickle.dump(cookiejar, f)
 
-    def authenticate(self, username, password):
+    def _set_authenticated(self, username):
+        metadata = self.session_store.metadata(username) or {}
+        self._session_saved_at = metadata.get("saved_at")
+        self._session_expires_at = metadata.get("expires_at")
+        self._refresh_failed_at = None
+        self._auth_generation += 1
+        self._authenticated = True
+
+    def authenticate(self, username, password, refresh=False):
         """
         Authenticate with Linkedin.
 
-        Return a session object that is authenticated.
+        A session stored for [username] that has not expired is reused without
+        logging in again, unless [refresh] is set; otherwise the new session is
+        stored once logged in.
         """
-        self._set_session_cookies(self._request_session_cookies())
+        with self._auth_lock, self.session_store.lock(username):
+            if self._use_cookie_cache and not refresh:
+                self.logger.debug("Attempting to use stored session")
+                cookies = self.session_store.load(username)
+                reused = bool(cookies and "li_at" in cookies and "JSESSIONID" in cookies)
+                if self.metrics is not None:
+                    self.metrics.cache("session", reused)
+                if reused:
+                    self._set_session_cookies(cookies)
+                    self._set_authenticated(username)
+                    return
 
-        payload = {
-            "session_key": username,
-            "session_password": password,
-            "JSESSIONID": self.session.cookies["JSESSIONID"],
-        }
+            # log in with a separate jar, so concurrent requests keep the current session
+            cookies = self._request_session_cookies()
 
-        res = requests.post(
-            f"{Client.AUTH_BASE_URL}/uas/authenticate",
-            data=payload,
-            cookies=self.session.cookies,
-            headers=Client.AUTH_REQUEST_HEADERS,
-        )
+            payload = {
+                "session_key": username,
+                "session_password": password,
+                "JSESSIONID": cookies["JSESSIONID"],
+            }
 
-        data = res.json()
+            url = f"{Client.AUTH_BASE_URL}/uas/authenticate"
+            res = requests.post(
+                url,
+                data=payload,
+                cookies=cookies,
+                headers=Client.AUTH_REQUEST_HEADERS,
+                timeout=self.timeout_for(url),
+            )
 
-        if data and data["login_result"] != "PASS":
-            raise ChallengeException(data["login_result"])
+            data = res.json()
 
-        if res.status_code == 401:
-            raise UnauthorizedException()
+            if data and data["login_result"] != "PASS":
+                raise ChallengeException(data["login_result"])
+
+            if res.status_code == 401:
+                raise UnauthorizedException()
 
-        if res.status_code != 200:
-            raise Exception()
+            if res.status_code != 200:
+                raise Exception()
 
-        self._set_session_cookies(res.cookies)
+            self._set_session_cookies(res.cookies)
+            self.session_store.save(username, self.session.cookies)
+            self._set_authenticated(username)
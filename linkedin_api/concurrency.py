@@ -0,0 +1,153 @@
+"""
+Adaptive concurrency limit (AIMD) for the requests of one account
+
+Give a Client an AdaptiveLimiter and at most `limit` of its requests are in
+flight at once. While responses come back healthy and the limit is in use,
+the limit grows by one every `limit` responses (additive increase); a
+throttled response (429, 503 or 999), a timeout or a p99 latency well above
+the best seen cuts it by a factor (multiplicative decrease). A batch job
+running more threads than the account can sustain so converges on the highest
+concurrency that doesn't get it throttled.
+
+With metrics, the current limit and requests in flight are exported as the
+concurrency_limit and concurrency_in_flight gauges.
+"""
+import threading
+import time
+from collections import deque
+
+import requests
+
+from linkedin_api import deadlines, profiling
+from linkedin_api.deadlines import DeadlineExceeded
+
+# responses telling the client to back off
+THROTTLE_STATUSES = (429, 503, 999)
+
+
+class AdaptiveLimiter(object):
+    """
+    Thread-safe AIMD limit on the requests in flight.
+
+    [initial], [min_limit], [max_limit] - of the limit
+    [backoff] - factor the limit is multiplied by when throttled
+    [latency_window] - latencies the p99 is taken over
+    [latency_tolerance] - the p99 may rise to this multiple of the best p99 seen before the limit is cut
+    [metrics] - linkedin_api.metrics.Metrics the limit is exported to, labelled with [name]
+    """
+
+    def __init__(
+        self,
+        initial=4,
+        min_limit=1,
+        max_limit=64,
+        backoff=0.5,
+        latency_window=100,
+        latency_tolerance=2.0,
+        metrics=None,
+        name="default",
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.metrics = metrics
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._latencies = deque(maxlen=latency_window)
+        # lowest p99 seen, creeping up so it follows a slower network
+        self._baseline = None
+        # requests sent before the last cut don't cut the limit again
+        self._cut_at = 0.0
+        self._export()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        """
+        Wait for a free slot and take it. Return the time the request is sent, for release.
+        """
+        started = time.perf_counter()
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                left = deadlines.remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded("no request slot free before the deadline")
+                self._cond.wait(left)
+            self._in_flight += 1
+            self._export()
+        now = time.perf_counter()
+        profiling.record("wait", now - started)
+        return now
+
+    def release(self, sent_at, res=None, error=None):
+        """
+        Free the slot of a request sent at [sent_at], adapting the limit to its
+        response [res] or [error].
+        """
+        latency = time.perf_counter() - sent_at
+        throttled = (res is not None and res.status_code in THROTTLE_STATUSES) or isinstance(
+            error, requests.Timeout
+        )
+
+        with self._cond:
+            # only a limit in use is worth raising
+            saturated = self._in_flight * 2 >= self._limit
+            self._in_flight -= 1
+            if throttled:
+                self._cut(sent_at)
+            elif res is not None:
+                self._latencies.append(latency)
+                if len(self._latencies) == self._latencies.maxlen and self._latency_rising():
+                    self._cut(sent_at)
+                elif saturated:
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._export()
+            self._cond.notify_all()
+
+    def send(self, request, method, url, **kwargs):
+        """
+        Send a request with [request] (i.e. session.request) once a slot is free.
+        """
+        sent_at = self.acquire()
+        res = None
+        error = None
+        try:
+            res = request(method, url, **kwargs)
+            return res
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.release(sent_at, res, error)
+
+    def _latency_rising(self):
+        ordered = sorted(self._latencies)
+        p99 = ordered[int(0.99 * (len(ordered) - 1))]
+        if self._baseline is None or p99 < self._baseline:
+            self._baseline = p99
+            return False
+        self._baseline *= 1.01
+        return p99 > self._baseline * self.latency_tolerance
+
+    def _cut(self, sent_at):
+        if sent_at < self._cut_at:
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._cut_at = time.perf_counter()
+        # latencies at the old limit say nothing about the new one
+        self._latencies.clear()
+
+    def _export(self):
+        if self.metrics is not None:
+            self.metrics.set("concurrency_limit", self.limit, account=self.name)
+            self.metrics.set("concurrency_in_flight", self._in_flight, account=self.name)
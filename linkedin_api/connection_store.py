@@ -0,0 +1,226 @@
+"""
+Local, indexed store of the current profile's 1st-degree connections
+"""
+import logging
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS connections (
+    urn_id TEXT PRIMARY KEY,
+    public_id TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    occupation TEXT,
+    title TEXT COLLATE NOCASE,
+    company TEXT COLLATE NOCASE,
+    location TEXT COLLATE NOCASE,
+    created_at INTEGER,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS connections_public_id ON connections (public_id);
+CREATE INDEX IF NOT EXISTS connections_title ON connections (title);
+CREATE INDEX IF NOT EXISTS connections_company ON connections (company);
+CREATE INDEX IF NOT EXISTS connections_location ON connections (location);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_COLUMNS = (
+    "urn_id",
+    "public_id",
+    "first_name",
+    "last_name",
+    "occupation",
+    "title",
+    "company",
+    "location",
+    "created_at",
+    "synced_at",
+)
+
+# fetched from profiles by sync(enrich=True); a sync without enrich keeps them
+_ENRICHED_COLUMNS = ("title", "company", "location")
+
+_COMMIT_EVERY = 1000
+
+
+def split_occupation(occupation):
+    """
+    Return the (title, company) of an occupation such as "Engineer at Acme".
+    """
+    title, sep, company = (occupation or "").rpartition(" at ")
+    if not sep:
+        return occupation or None, None
+
+    return title.strip() or None, company.strip() or None
+
+
+class ConnectionStore(object):
+    """
+    SQLite store of connections, indexed by urn, public id, title, company and location.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM connections").fetchone()[0]
+
+    def _get_meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def upsert(self, connection, synced_at=None):
+        """
+        Insert or update a connection, as yielded by Linkedin.iter_connections.
+
+        [title], [company] and [location] are taken from the connection when set.
+        Otherwise a new connection's title and company are parsed from its
+        occupation, and a stored connection keeps the ones it has (i.e. enriched).
+        """
+        title, company = split_occupation(connection.get("occupation"))
+        row = {
+            "title": title,
+            "company": company,
+            "location": None,
+            "synced_at": synced_at or time.time(),
+        }
+        row.update({key: connection[key] for key in _COLUMNS if connection.get(key)})
+
+        updates = [
+            f"{key} = COALESCE(?, {key})" if key in _ENRICHED_COLUMNS else f"{key} = excluded.{key}"
+            for key in _COLUMNS
+            if key != "urn_id"
+        ]
+        self._conn.execute(
+            f"INSERT INTO connections ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_COLUMNS))}) "
+            f"ON CONFLICT(urn_id) DO UPDATE SET {', '.join(updates)}",
+            [row.get(key) for key in _COLUMNS]
+            + [connection.get(key) or None for key in _ENRICHED_COLUMNS],
+        )
+
+    def sync(self, api, full=False, enrich=False):
+        """
+        Update the store from the network of [api], a Linkedin instance.
+
+        Connections are listed most recently added first, so unless [full] is set
+        (or the store is empty) listing stops at the newest connection already
+        stored. A full sync also removes connections that no longer exist, once
+        every connection has been listed; a listing cut short (i.e. throttled)
+        raises before anything is removed.
+        [enrich] - fetch each new connection's profile for its current title,
+            company and location
+
+        Return the number of connections written.
+        """
+        watermark = None if full else self._get_meta("last_created_at")
+        newest = watermark
+        synced_at = time.time()
+        written = 0
+
+        for connection in api.iter_connections():
+            created_at = connection.get("created_at")
+            if watermark is not None and created_at is not None and created_at <= watermark:
+                break
+
+            if enrich:
+                connection = dict(connection, **self._profile_fields(api, connection))
+
+            self.upsert(connection, synced_at=synced_at)
+            written += 1
+            if created_at is not None and (newest is None or created_at > newest):
+                newest = created_at
+
+            if written % _COMMIT_EVERY == 0:
+                self._conn.commit()
+                logger.debug(f"synced {written} connections")
+
+        if full and written:
+            self._conn.execute("DELETE FROM connections WHERE synced_at < ?", (synced_at,))
+        elif full:
+            logger.warning("no connections listed, so none were removed")
+
+        if newest is not None:
+            self._set_meta("last_created_at", newest)
+        self._set_meta("synced_at", synced_at)
+        self._conn.commit()
+
+        return written
+
+    @staticmethod
+    def _profile_fields(api, connection):
+        profile = api.get_profile(urn_id=connection["urn_id"])
+        fields = {"location": profile.get("locationName")}
+
+        current = [
+            item for item in profile.get("experience", [])
+            if not item.get("timePeriod", {}).get("endDate")
+        ]
+        if current:
+            fields["title"] = current[0].get("title")
+            fields["company"] = current[0].get("companyName")
+
+        return fields
+
+    def get(self, urn_id=None, public_id=None):
+        """
+        Return the stored connection with the given [urn_id] or [public_id], or None.
+        """
+        if urn_id is not None:
+            row = self._conn.execute(
+                "SELECT * FROM connections WHERE urn_id = ?", (urn_id,)
+            ).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT * FROM connections WHERE public_id = ?", (public_id,)
+            ).fetchone()
+
+        return dict(row) if row else None
+
+    def find(self, title=None, company=None, location=None, limit=None):
+        """
+        Return stored connections matching every given field.
+
+        Fields match case-insensitively on prefix, e.g. company="acme" matches "Acme Corp".
+        """
+        clauses = []
+        params = []
+        for column, prefix in (("title", title), ("company", company), ("location", location)):
+            if prefix is None:
+                continue
+            # a range, rather than LIKE, so the NOCASE index is always used
+            clauses.append(f"{column} >= ? AND {column} < ?")
+            params.extend([prefix, prefix + "\U0010ffff"])
+
+        query = "SELECT * FROM connections"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [dict(row) for row in self._conn.execute(query, params)]
@@ -0,0 +1,127 @@
+"""
+Deadlines covering everything a call does: pacing, quota and rate limit waits, retries and sub-requests
+
+A deadline is set per thread, with `within` or the deadline keyword every
+public method of Linkedin accepts:
+
+    api.get_profile('billy-g', deadline=30)
+
+Requests sent before it are given at most the time left as their connect and
+read timeouts, waits that would outlast it fail straight away, and a call that
+runs out of time raises DeadlineExceeded. Nested deadlines only ever shorten
+the one in force.
+
+Pacing counts against the deadline too: default_evade sleeps 2 to 10 seconds
+before every request, so give shorter deadlines to Clients created with a
+quicker (or no) evade.
+"""
+import contextlib
+import functools
+import inspect
+import threading
+import time
+
+_local = threading.local()
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def current():
+    """
+    Return the deadline (a time.monotonic() time) in force on this thread, or None.
+    """
+    return getattr(_local, "deadline", None)
+
+
+def remaining():
+    """
+    Return the seconds left before the deadline in force, or None if there is none.
+    """
+    deadline = current()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired():
+    """
+    Return True if the deadline in force has passed.
+    """
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check(what="call"):
+    """
+    Raise DeadlineExceeded if the deadline in force has passed.
+    """
+    if expired():
+        raise DeadlineExceeded(f"{what} ran out of time")
+
+
+@contextlib.contextmanager
+def until(deadline):
+    """
+    Run the block with [deadline] (a time.monotonic() time, or None) in force,
+    unless an earlier one already is.
+    """
+    previous = current()
+    if deadline is not None and (previous is None or deadline < previous):
+        _local.deadline = deadline
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def within(seconds):
+    """
+    Run the block with a deadline [seconds] from now (None for none).
+    """
+    return until(None if seconds is None else time.monotonic() + seconds)
+
+
+def accepts_deadline(cls):
+    """
+    Class decorator giving every public method of [cls] a deadline keyword:
+    seconds the whole call, sub-requests included, may take.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+        if inspect.isgeneratorfunction(method):
+            setattr(cls, name, _generator_with_deadline(method))
+        else:
+            setattr(cls, name, _with_deadline(method))
+    return cls
+
+
+def _with_deadline(method):
+    @functools.wraps(method)
+    def call(*args, deadline=None, **kwargs):
+        if deadline is None:
+            return method(*args, **kwargs)
+        with within(deadline):
+            return method(*args, **kwargs)
+
+    return call
+
+
+def _generator_with_deadline(method):
+    # the deadline runs from the call, and is in force whenever the generator is
+    @functools.wraps(method)
+    def call(*args, deadline=None, **kwargs):
+        at = None if deadline is None else time.monotonic() + deadline
+        items = method(*args, **kwargs)
+        try:
+            while True:
+                with until(at):
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                yield item
+        finally:
+            items.close()
+
+    return call
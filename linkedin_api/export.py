@@ -0,0 +1,291 @@
+"""
+Columnar (Arrow/Parquet) export of people, profiles and connections
+
+Rows are buffered as columns and written as one Arrow record batch every
+[batch_size] rows, so memory stays bounded however large the export.
+
+Requires pyarrow: pip install linkedin_api[arrow]
+"""
+import os
+import uuid
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+from linkedin_api.utils.helpers import get_id_from_urn
+
+# (column, arrow type) of each table
+PEOPLE_FIELDS = (
+    ("urn_id", "string"),
+    ("public_id", "string"),
+    ("first_name", "string"),
+    ("last_name", "string"),
+    ("headline", "string"),
+    ("location", "string"),
+    ("industry", "string"),
+    ("summary", "string"),
+    ("network_depth", "string"),
+    ("created_at", "int64"),
+)
+EXPERIENCE_FIELDS = (
+    ("urn_id", "string"),
+    ("title", "string"),
+    ("company_name", "string"),
+    ("company_urn", "string"),
+    ("location", "string"),
+    ("start_year", "int32"),
+    ("start_month", "int32"),
+    ("end_year", "int32"),
+    ("end_month", "int32"),
+    ("description", "string"),
+)
+EDUCATION_FIELDS = (
+    ("urn_id", "string"),
+    ("school_name", "string"),
+    ("degree_name", "string"),
+    ("field_of_study", "string"),
+    ("start_year", "int32"),
+    ("end_year", "int32"),
+)
+SKILLS_FIELDS = (
+    ("urn_id", "string"),
+    ("name", "string"),
+)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for columnar export: pip install linkedin_api[arrow]"
+        )
+
+
+def schema(fields):
+    """
+    Return the Arrow schema of [fields], e.g. PEOPLE_FIELDS.
+    """
+    _require_pyarrow()
+    return pa.schema([(name, getattr(pa, type_name)()) for name, type_name in fields])
+
+
+# PEOPLE_FIELDS column <- key of a get_profile profile
+PROFILE_KEYS = {
+    "urn_id": "profile_id",
+    "public_id": "publicIdentifier",
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "headline": "headline",
+    "location": "locationName",
+    "industry": "industryName",
+    "summary": "summary",
+}
+# PEOPLE_FIELDS column <- key of a search_people result or connection
+PERSON_KEYS = {name: name for name, _ in PEOPLE_FIELDS}
+# PEOPLE_FIELDS column <- key of a search_people result or connection read when the column's own is empty
+PERSON_FALLBACK_KEYS = {"headline": "occupation"}
+
+
+def is_profile(person):
+    """
+    Return True if [person] is a get_profile profile, rather than a search_people result or connection.
+    """
+    return "profile_id" in person or "firstName" in person
+
+
+def urn_id(value):
+    """
+    Return [value] with any urn: prefix (i.e. of a connection's urn_id) removed.
+    """
+    if value and value.startswith("urn:"):
+        return get_id_from_urn(value)
+    return value
+
+
+def person_row(person):
+    """
+    Return the PEOPLE_FIELDS row of a search_people result, connection or get_profile profile.
+    """
+    if is_profile(person):
+        return {name: person.get(key) for name, key in PROFILE_KEYS.items()}
+
+    row = {name: person.get(key) for name, key in PERSON_KEYS.items()}
+    for name, key in PERSON_FALLBACK_KEYS.items():
+        row[name] = row[name] or person.get(key)
+    row["urn_id"] = urn_id(row["urn_id"])
+    return row
+
+
+def _date(time_period, key):
+    date = (time_period or {}).get(key) or {}
+    return date.get("year"), date.get("month")
+
+
+def experience_rows(profile):
+    for item in profile.get("experience", []):
+        start_year, start_month = _date(item.get("timePeriod"), "startDate")
+        end_year, end_month = _date(item.get("timePeriod"), "endDate")
+        yield {
+            "urn_id": profile.get("profile_id"),
+            "title": item.get("title"),
+            "company_name": item.get("companyName"),
+            "company_urn": item.get("companyUrn"),
+            "location": item.get("locationName"),
+            "start_year": start_year,
+            "start_month": start_month,
+            "end_year": end_year,
+            "end_month": end_month,
+            "description": item.get("description"),
+        }
+
+
+def education_rows(profile):
+    for item in profile.get("education", []):
+        yield {
+            "urn_id": profile.get("profile_id"),
+            "school_name": item.get("schoolName"),
+            "degree_name": item.get("degreeName"),
+            "field_of_study": item.get("fieldOfStudy"),
+            "start_year": _date(item.get("timePeriod"), "startDate")[0],
+            "end_year": _date(item.get("timePeriod"), "endDate")[0],
+        }
+
+
+def skills_rows(profile):
+    for item in profile.get("skills", []):
+        yield {"urn_id": profile.get("profile_id"), "name": item.get("name")}
+
+
+class ParquetWriter(object):
+    """
+    Writes rows of [fields] to the Parquet file at [path], a record batch at a time.
+    """
+
+    def __init__(self, path, fields, batch_size=1000, compression="zstd"):
+        _require_pyarrow()
+        self.path = path
+        self.schema = schema(fields)
+        self.batch_size = batch_size
+        self.rows = 0
+        self._columns = {name: [] for name in self.schema.names}
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def write(self, row):
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        self.rows += 1
+
+        if len(self._columns[self.schema.names[0]]) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        if not self._columns[self.schema.names[0]]:
+            return
+
+        self._writer.write_batch(pa.RecordBatch.from_pydict(self._columns, schema=self.schema))
+        for column in self._columns.values():
+            column.clear()
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ProfileWriter(object):
+    """
+    Writes profiles to [directory] as people, experience, education and skills datasets.
+
+    Each writer adds a new part file to each dataset, so several writers (or
+    resumed runs) never overwrite each other, and another on every flush. Read
+    a dataset back with pyarrow.parquet.read_table(os.path.join(directory, "people")).
+
+    A part file has no Parquet footer, and so can't be read, until it is closed:
+    it is written under a hidden name (which readers skip) until then.
+    """
+
+    TABLES = (
+        ("people", PEOPLE_FIELDS),
+        ("experience", EXPERIENCE_FIELDS),
+        ("education", EDUCATION_FIELDS),
+        ("skills", SKILLS_FIELDS),
+    )
+
+    def __init__(self, directory, batch_size=1000, compression="zstd"):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.compression = compression
+        self.writers = {}
+        for table, _ in ProfileWriter.TABLES:
+            os.makedirs(os.path.join(directory, table), exist_ok=True)
+        self._open()
+
+    def _open(self):
+        part = f"part-{uuid.uuid4().hex}.parquet"
+        for table, fields in ProfileWriter.TABLES:
+            self.writers[table] = ParquetWriter(
+                os.path.join(self.directory, table, f".{part}"),
+                fields,
+                batch_size=self.batch_size,
+                compression=self.compression,
+            )
+
+    def write_person(self, person):
+        """
+        Write a search_people result or connection (people only).
+        """
+        self.writers["people"].write(person_row(person))
+
+    def write_profile(self, profile):
+        """
+        Write a get_profile profile, including its skills if fetched.
+        """
+        self.writers["people"].write(person_row(profile))
+        self.writers["experience"].write_all(experience_rows(profile))
+        self.writers["education"].write_all(education_rows(profile))
+        self.writers["skills"].write_all(skills_rows(profile))
+
+    def flush(self):
+        """
+        Finish the current part files, so the rows written so far can be read
+        even if the process is killed later, and start new ones.
+        """
+        if not any(writer.rows for writer in self.writers.values()):
+            return
+        self.close()
+        self._open()
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+            directory, name = os.path.split(writer.path)
+            os.replace(writer.path, os.path.join(directory, name.lstrip(".")))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_people(path, people, batch_size=1000, compression="zstd"):
+    """
+    Write an iterable of people (i.e. iter_connections()) to the Parquet file at [path].
+
+    Return the number of rows written.
+    """
+    with ParquetWriter(path, PEOPLE_FIELDS, batch_size=batch_size, compression=compression) as writer:
+        writer.write_all(person_row(person) for person in people)
+
+    return writer.rows
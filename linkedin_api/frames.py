@@ -0,0 +1,125 @@
+"""
+Column-oriented results and pandas DataFrames for bulk analysis
+
+Results are gathered straight into dicts of lists (one list per column)
+rather than a dict per row, and skills, companies and locations become
+pandas categoricals, so aggregations over many profiles run vectorized.
+
+DataFrames require pandas: pip install linkedin_api[pandas]
+"""
+try:
+    import pandas as pd
+except ImportError:  # optional dependency
+    pd = None
+
+from linkedin_api.export import (
+    PEOPLE_FIELDS,
+    PERSON_FALLBACK_KEYS,
+    PERSON_KEYS,
+    PROFILE_KEYS,
+    is_profile,
+    urn_id,
+)
+
+# columns stored as categoricals
+CATEGORICAL_COLUMNS = ("location", "industry", "network_depth", "company_name", "skill")
+
+
+def people_columns(people):
+    """
+    Return {column: [values]} of PEOPLE_FIELDS for search_people results, connections or profiles.
+
+    Columns are read with export's key tables, so frames and Parquet exports of the same people agree.
+    """
+    columns = {name: [] for name, _ in PEOPLE_FIELDS}
+    items = list(columns.items())
+
+    for person in people:
+        profile = is_profile(person)
+        keys = PROFILE_KEYS if profile else PERSON_KEYS
+        for name, column in items:
+            key = keys.get(name)
+            column.append(person.get(key) if key else None)
+
+        if not profile:
+            for name, key in PERSON_FALLBACK_KEYS.items():
+                if not columns[name][-1]:
+                    columns[name][-1] = person.get(key)
+
+    columns["urn_id"] = [urn_id(value) for value in columns["urn_id"]]
+    return columns
+
+
+def skills_columns(skills_by_profile):
+    """
+    Return {"urn_id": [...], "skill": [...]} for (urn_id, get_profile_skills() result) pairs.
+    """
+    urn_ids = []
+    skills = []
+    for urn_id, profile_skills in skills_by_profile:
+        names = [item.get("name") for item in profile_skills]
+        skills.extend(names)
+        urn_ids.extend([urn_id] * len(names))
+
+    return {"urn_id": urn_ids, "skill": skills}
+
+
+def experience_columns(profiles):
+    """
+    Return {"urn_id", "title", "company_name", "current"} columns for get_profile profiles.
+    """
+    columns = {"urn_id": [], "title": [], "company_name": [], "current": []}
+    for profile in profiles:
+        for item in profile.get("experience", []):
+            columns["urn_id"].append(profile.get("profile_id"))
+            columns["title"].append(item.get("title"))
+            columns["company_name"].append(item.get("companyName"))
+            columns["current"].append(not (item.get("timePeriod") or {}).get("endDate"))
+
+    return columns
+
+
+def to_frame(columns):
+    """
+    Return a DataFrame of [columns], with CATEGORICAL_COLUMNS dictionary-encoded.
+    """
+    if pd is None:
+        raise ImportError("pandas is required for DataFrames: pip install linkedin_api[pandas]")
+
+    return pd.DataFrame(
+        {
+            name: pd.Categorical(values) if name in CATEGORICAL_COLUMNS else values
+            for name, values in columns.items()
+        }
+    )
+
+
+def people_frame(people):
+    return to_frame(people_columns(people))
+
+
+def skills_frame(skills_by_profile):
+    return to_frame(skills_columns(skills_by_profile))
+
+
+def experience_frame(profiles):
+    return to_frame(experience_columns(profiles))
+
+
+def skill_frequency(skills):
+    """
+    Return the number of profiles listing each skill, most common first, from a skills_frame.
+    """
+    counts = skills.drop_duplicates()["skill"].value_counts()
+    return counts[counts > 0]
+
+
+def company_counts(experience, current_only=True):
+    """
+    Return the number of profiles at each company, most common first, from an experience_frame.
+    """
+    if current_only:
+        experience = experience[experience["current"]]
+
+    counts = experience.drop_duplicates(["urn_id", "company_name"])["company_name"].value_counts()
+    return counts[counts > 0]
@@ -0,0 +1,204 @@
+"""
+HTTP/2 transport, multiplexing concurrent requests on one connection
+
+Requests sends each concurrent request on its own HTTP/1.1 connection, so
+many threads sharing a Client open many TCP connections and TLS handshakes.
+Give the Client an HTTP2Transport and their requests are sent as streams of
+a single HTTP/2 connection per host instead, with compressed headers:
+
+    client = Client(transport=HTTP2Transport())
+
+Requests still prepares the requests and handles cookies and redirects; only
+sending them goes through httpx. httpcore's HTTP/2 connections can't be shared
+by threads (concurrent streams corrupt the connection's state, i.e. HEADERS are
+sent out of stream id order), so the transport drives them from an event loop
+of its own, on one thread, which the requesting threads hand requests to.
+Requires httpx with h2: pip install linkedin_api[http2]
+"""
+import asyncio
+import threading
+from http.client import HTTPMessage
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+# headers HTTP/2 forbids; requests sends "Connection: keep-alive" by default
+_CONNECTION_HEADERS = frozenset(
+    ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+)
+
+
+def _requests_error(error):
+    # the requests exception the rest of the client (retries, deadlines) expects for an httpx one
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(error)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.ReadTimeout(error)
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(error)
+    return error
+
+
+async def _read_chunk(chunks):
+    # the next chunk of [chunks], an async iterator, or None once it is exhausted
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+class _OriginalResponse(object):
+    # what requests reads cookies from
+    def __init__(self, headers):
+        self.msg = HTTPMessage()
+        for name, value in headers.multi_items():
+            self.msg[name] = value
+
+    def info(self):
+        return self.msg
+
+
+class _Body(object):
+    """
+    The raw body of a response, read as requests reads a urllib3 response's.
+    """
+
+    def __init__(self, response, run):
+        self._response = response
+        # runs a coroutine on the transport's event loop
+        self._run = run
+        self._original_response = _OriginalResponse(response.headers)
+        self.version = 20 if response.extensions.get("http_version") == b"HTTP/2" else 11
+
+    def stream(self, chunk_size=None, decode_content=True):
+        chunks = self._response.aiter_bytes(chunk_size)
+        while True:
+            chunk = self._run(_read_chunk(chunks))
+            if chunk is None:
+                return
+            yield chunk
+
+    def read(self, amt=None, decode_content=True):
+        return b"".join(self.stream())
+
+    def close(self):
+        self._run(self._response.aclose())
+
+    def release_conn(self):
+        self.close()
+
+
+class HTTP2Transport(requests.adapters.BaseAdapter):
+    """
+    Requests adapter sending requests with httpx, over HTTP/2 where the server speaks it.
+
+    [http1] - False to speak HTTP/2 only, which plain http:// servers (i.e. the
+        mock server) are then spoken to with prior knowledge
+    [max_connections] - open at once, per proxy; each carries many requests
+    [proxy] - url of a proxy for requests sent without one. Proxies given with
+        a request (the Client's, an account's or the environment's, i.e.
+        HTTPS_PROXY) take precedence, as they do with requests' own adapter;
+        each proxy gets its own connections
+    [verify] - TLS verification, as httpx takes it
+    """
+
+    def __init__(self, http1=True, max_connections=10, proxy=None, verify=True, retries=0):
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for HTTP2Transport: pip install linkedin_api[http2]"
+            )
+        super().__init__()
+        self.http1 = http1
+        self.proxy = proxy
+        self._options = dict(
+            http1=http1,
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections),
+            verify=verify,
+            retries=retries,
+        )
+        # {proxy url (None for none): httpx transport}, only used on the event loop
+        self._transports = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="HTTP2Transport", daemon=True
+        )
+        self._thread.start()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        proxy = requests.utils.select_proxy(request.url, proxies) if proxies else None
+        if proxy:
+            proxy = requests.utils.prepend_scheme_if_needed(proxy, "http")
+
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in _CONNECTION_HEADERS
+        ]
+
+        response = self._run(
+            self._handle(
+                proxy or self.proxy,
+                httpx.Request(
+                    request.method,
+                    request.url,
+                    headers=headers,
+                    content=body,
+                    extensions={
+                        "timeout": {"connect": connect, "read": read, "write": read, "pool": connect}
+                    },
+                )
+            )
+        )
+        return self.build_response(request, response)
+
+    async def _handle(self, proxy, request):
+        # send [request] through the transport of [proxy]
+        transport = self._transports.get(proxy)
+        if transport is None:
+            transport = self._transports[proxy] = httpx.AsyncHTTPTransport(proxy=proxy, **self._options)
+        return await transport.handle_async_request(request)
+
+    async def _close_transports(self):
+        for transport in self._transports.values():
+            await transport.aclose()
+
+    def _run(self, coroutine):
+        """
+        Run [coroutine] on the transport's event loop and return its result,
+        raising httpx errors as the requests errors they correspond to.
+        """
+        try:
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+        except httpx.HTTPError as e:
+            raise _requests_error(e) from e
+
+    def build_response(self, request, response):
+        res = requests.Response()
+        res.status_code = response.status_code
+        res.headers = CaseInsensitiveDict(response.headers.items())
+        res.encoding = get_encoding_from_headers(res.headers)
+        res.reason = response.extensions.get("reason_phrase", b"").decode("latin-1")
+        res.raw = _Body(response, self._run)
+        res.url = request.url
+        res.request = request
+        res.connection = self
+        return res
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        self._run(self._close_transports())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
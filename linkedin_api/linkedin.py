@@ -1,16 +1,17 @@
 """
 Provides linkedin api-related code
 """
-import random
+import os
 import logging
-from time import sleep
 from urllib.parse import urlencode
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 
-from linkedin_api.utils.helpers import get_id_from_urn
+from linkedin_api.utils.helpers import check_status, get_id_from_urn, load_json, save_json
 
 from linkedin_api.client import Client
+from linkedin_api import deadlines
 
 import math
 
@@ -20,50 +21,60 @@ class UnconnectedException(Exception):
     pass 
 
 
-def default_evade(start: int = 2, end: int = 10) -> None:
-    """
-    A catch-all method to try and evade suspension from Linkedin.
-    Currenly, just delays the request by a random (bounded) time
-    """
-    sleep(random.uniform(2, 10))  # sleep a random duration to try and evade suspention
-
-
+@deadlines.accepts_deadline
 class Linkedin(object):
     """
     Class for accessing Linkedin API.
+
+    Every public method accepts a deadline keyword: seconds the call may take,
+    pacing, retries and sub-requests included (see linkedin_api.deadlines).
     """
 
     _MAX_UPDATE_COUNT = 100  # max seems to be 100
     _MAX_SEARCH_COUNT = 49  # max seems to be 49
     _MAX_SEARCH_RETURNED = 1000
+    _MAX_SENT_INVITATIONS_COUNT = 100  # max seems to be 100
+    _MAX_INVITATIONS_COUNT = 100
+    _MAX_CONNECTIONS_COUNT = 40  # max seems to be 40
     _MAX_REPEATED_REQUESTS = (
         200
     )  # VERY conservative max requests count to avoid rate-limit
 
-    def __init__(self, username, password, refresh_cookies=False, debug=False):
-        self.client = Client(refresh_cookies=refresh_cookies, debug=debug)
-        self.proxies = self.client.proxies
-        self.client.authenticate(username, password)
-        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+    def __init__(self, username, password, refresh_cookies=False, debug=False, proxies={}, client=None):
+        if client is None:
+            client = Client(refresh_cookies=refresh_cookies, debug=debug, proxies=proxies)
+        if username is not None:
+            # authenticated on the first request
+            client.set_credentials(username, password)
+        self.client = client
+        if client.profiler is not None:
+            client.profiler.attach(self)
         self.logger = logger
 
+        # sent invitations, {toMemberId: entityUrn}
+        self._sent_invitations = {}
+
+    def sales_navigator(self):
+        """
+        Return a Sales Navigator API sharing this instance's client (login, session and pacing)
+        """
+        from linkedin_api.sales_navigator import Linkedin as SalesNavigator
+
+        return SalesNavigator(None, None, client=self.client)
+
     def _fetch(self, uri, **kwargs):
         """
         GET request to Linkedin API
         """
-        default_evade(start=0, end=0)
-
         url = f"{self.client.API_BASE_URL}{uri}"
-        return self.client.session.get(url,proxies=self.proxies, **kwargs)
+        return self.client.request("GET", url, **kwargs)
 
     def _post(self, uri, **kwargs):
         """
         POST request to Linkedin API
         """
-        default_evade(start=0, end=0)
-
         url = f"{self.client.API_BASE_URL}{uri}"
-        return self.client.session.post(url,proxies=self.proxies ,**kwargs)
+        return self.client.request("POST", url, **kwargs)
 
     def get_current_profile(self):
         """
@@ -334,89 +345,7 @@ class Linkedin(object):
                                    lastName = lastName, currentCompanies = currentCompanies, schools = schools, regions = regions, past_companies=past_companies, 
                                    company=company, school=school, connection_of=connection_of)
 
-        if not data:
-            return 0, []
-
-        try:
-            number = data.get('data').get('metadata').get('totalResultCount')
-
-            if number > Linkedin._MAX_SEARCH_RETURNED:
-                number = Linkedin._MAX_SEARCH_RETURNED 
-
-            users_data = data.get("data").get("elements")[0].get("elements")
-            uncluded_data = [included for included in data.get("included") if "publicIdentifier" in included]
-        except:
-            return 0, []
-        
-        users = []
-
-        for user_data in users_data:
-            for included in uncluded_data:
-                if user_data.get("targetUrn") == included.get("entityUrn"):
-                    users.append({
-                        "urn_id": user_data.get("targetUrn"),
-                        "data": user_data,
-                        "included": included
-                    })
-        
-        results=[]
-
-        for user in users:
-            try:
-                public_id = user.get("data", {}).get("publicIdentifier", "")
-            except TypeError:
-                public_id = ""
-            try:
-                first_name = user.get("included", {}).get("firstName", "")
-            except TypeError:
-                first_name = ""
-            try:
-                last_name = user.get("included", {}).get("lastName", "")
-            except TypeError:
-                last_name = ""
-            try:
-                headline = user.get("data",{}).get("headline", {}).get("text", "")
-            except TypeError:
-                headline = ""
-            try:
-                snippet = user.get("data", {}).get("snippetText", {}).get("text", "")
-            except TypeError:
-                snippet = ""
-            try:
-                location = user.get("data", {}).get("subline", {}).get("text", "")
-            except TypeError:
-                location = ""
-            try:
-                network_depth = user.get("data", {}).get("secondaryTitle", {}).get("text", "")
-            except TypeError:
-                network_depth = ""
-            try:
-                display_picture_url = user.get("included", {}).get("picture", {}).get("rootUrl", "") + user.get("included", {}).get("picture", {}).get("artifacts", [{}, ])[0].get("fileIdentifyingUrlPathSegment", {})
-                if display_picture_url is None:
-                    display_picture_url = ""
-            except:
-                display_picture_url = ""
-            try:  
-                navigation_url = user.get("data", {}).get("navigationUrl", "")
-            except TypeError:
-                navigation_url = ""
-
-            results.append(
-                {
-                    "urn_id": user.get("urn_id").split(':')[-1],
-                    "public_id": public_id,
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "headline": headline,
-                    "snippet": snippet,
-                    "location": location,
-                    "network_depth": network_depth,
-                    "displayPictureUrl": display_picture_url,
-                    "navigation_url": navigation_url
-                }
-            )
-
-        return number, results
+        return parse_people_search(data)
 
 
     def get_current_profile_connections(self, start=None):
@@ -433,6 +362,86 @@ class Linkedin(object):
 
         return data
 
+    def iter_connections(self, checkpoint_path=None, sink=None, page_size=_MAX_CONNECTIONS_COUNT):
+        """
+        Yield every 1st-degree connection of the current profile, most recently added first.
+
+        [checkpoint_path] - file holding the offset reached so far; an existing
+            checkpoint resumes the export and it is removed once the export completes
+        [sink] - writable file object; each connection is written to it as a JSON line
+        [page_size] - connections per request
+
+        Each page is written to [sink] and checkpointed before it is yielded; without
+        a sink, a page is checkpointed as its last connection is taken, so stopping
+        midway through a page resumes from its start. A page that can't be fetched
+        (i.e. throttled) raises requests.HTTPError and keeps the checkpoint; only an
+        empty page completes the export.
+        """
+        checkpoint = (checkpoint_path and load_json(checkpoint_path)) or {}
+        start = checkpoint.get("start", 0)
+
+        while True:
+            params = {"count": page_size, "sortType": "RECENTLY_ADDED", "start": start}
+            res = self._fetch(
+                f"/relationships/connections?{urlencode(params)}",
+                headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
+            )
+            check_status(res)
+
+            data = res.json()
+
+            included = {
+                item["entityUrn"]: item
+                for item in data.get("included", [])
+                if "entityUrn" in item
+            }
+            elements = data.get("data", {}).get("elements") or [
+                included[urn] for urn in data.get("data", {}).get("*elements", [])
+                if urn in included
+            ]
+
+            connections = []
+            for element in elements:
+                mini_profile = element.get("miniProfile") or included.get(
+                    element.get("*miniProfile")
+                )
+                if not mini_profile:
+                    continue
+
+                connections.append(
+                    {
+                        "urn_id": get_id_from_urn(mini_profile["entityUrn"]),
+                        "public_id": mini_profile.get("publicIdentifier", ""),
+                        "first_name": mini_profile.get("firstName", ""),
+                        "last_name": mini_profile.get("lastName", ""),
+                        "occupation": mini_profile.get("occupation", ""),
+                        "created_at": element.get("createdAt"),
+                    }
+                )
+
+            if not connections:
+                break
+
+            start += page_size
+
+            if sink is not None:
+                for connection in connections:
+                    sink.write(json.dumps(connection) + "\n")
+                sink.flush()
+                taken, rest = [], connections
+            else:
+                taken, rest = connections[:-1], connections[-1:]
+
+            yield from taken
+            if checkpoint_path:
+                save_json(checkpoint_path, {"start": start})
+            yield from rest
+
+            self.logger.debug(f"connections grew to {start}")
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
     def get_quantity_of_current_profile_connections(self):
         res = self._fetch(
             f'/search/blended?count=10&filters=List(network-%3EF,resultType-%3EPEOPLE)&origin=MEMBER_PROFILE_CANNED_SEARCH&q=all&queryContext=List(spellCorrectionEnabled-%3Etrue,relatedSearchesEnabled-%3Etrue)&start=0',
@@ -859,8 +868,6 @@ class Linkedin(object):
         """"
         Return current user profile
         """
-        default_evade(start=0, end=1)  # sleep a random duration to try and evade suspention
-
         res = self._fetch(f"/me")
 
         data = res.json()
@@ -871,6 +878,15 @@ class Linkedin(object):
         """
         Return list of new invites
         """
+        res = self._fetch_invitations(start, limit)
+
+        if res.status_code != 200:
+            return []
+
+        response_payload = res.json()
+        return [element["invitation"] for element in response_payload["elements"]]
+
+    def _fetch_invitations(self, start, limit):
         params = {
             "start": start,
             "count": limit,
@@ -878,16 +894,29 @@ class Linkedin(object):
             "q": "receivedInvitation"
         }
 
-        res = self.client.session.get(
-            f"{self.client.API_BASE_URL}/relationships/invitationViews",
-            params=params
-        )
+        return self._fetch("/relationships/invitationViews", params=params)
 
-        if res.status_code != 200:
-            return []
+    def iter_invitations(self, page_size=_MAX_INVITATIONS_COUNT):
+        """
+        Yield every pending invitation, one page of [page_size] at a time.
 
-        response_payload = res.json()
-        return [element["invitation"] for element in response_payload["elements"]]
+        Replying to an invitation removes it from the pending list and shifts the
+        pages after it, so collect the invitations before replying to them.
+        Raises requests.HTTPError if a page can't be fetched (i.e. throttled),
+        rather than ending early.
+        """
+        start = 0
+        while start / page_size < Linkedin._MAX_REPEATED_REQUESTS:
+            res = self._fetch_invitations(start, page_size)
+            check_status(res)
+            invitations = [element["invitation"] for element in res.json()["elements"]]
+            yield from invitations
+
+            if len(invitations) < page_size:
+                return
+
+            start += page_size
+            self.logger.debug(f"invitations grew to {start}")
 
     def reply_invitation(self, invitation_entity_urn, invitation_shared_secret, action="accept"):
         """
@@ -907,14 +936,57 @@ class Linkedin(object):
             "isGenericInvitation": False
         })
 
-        res = self.client.session.post(
-            f"{self.client.API_BASE_URL}/relationships/invitations/{invitation_id}",
+        res = self._post(
+            f"/relationships/invitations/{invitation_id}",
             params=params,
             data=payload
         )
 
         return res.status_code == 200
 
+    def reply_invitations(self, decisions, concurrency=4):
+        """
+        Reply to many invites, with up to [concurrency] replies in flight.
+        @Param: decisions: iterable of (invitation, action) pairs, where
+            invitation is as returned by get_invitations/iter_invitations
+        @Param: concurrency: int
+        Returns {invitation entityUrn: True if sucess, False otherwise}
+
+        Once the deadline in force passes, replies in flight fail and the
+        invitations not yet replied to are left out of the results.
+        """
+        results = {}
+        # the workers run under the caller's deadline
+        deadline = deadlines.current()
+
+        def reply(invitation, action):
+            try:
+                with deadlines.until(deadline):
+                    return self.reply_invitation(
+                        invitation["entityUrn"], invitation["sharedSecret"], action=action
+                    )
+            except Exception as e:
+                self.logger.info(f"reply to {invitation.get('entityUrn')} failed: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = {}
+            for invitation, action in decisions:
+                if deadlines.expired():
+                    break
+                if len(pending) >= concurrency:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+
+                future = executor.submit(reply, invitation, action)
+                pending[future] = invitation["entityUrn"]
+
+            for future in as_completed(pending):
+                results[pending[future]] = future.result()
+
+        return results
+
     def add_connection(self, profile_urn_id=None, message=None):
         data = '{"trackingId":"yvzykVorToqcOuvtxjSFMg==","invitations":[],"excludeInvitations":[],"invitee":{"com.linkedin.voyager.growth.invitation.InviteeProfile":{"profileId":' + \
             '"' + profile_urn_id + '"' + '}}}'
@@ -940,20 +1012,70 @@ class Linkedin(object):
 
     def get_sent_invintations(self, start=0):
         res = self._fetch(
-            f"/relationships/sentInvitationViewsV2?count=100&invitationType=CONNECTION&q=invitationType&start=" + str(start),
+            f"/relationships/sentInvitationViewsV2?count={Linkedin._MAX_SENT_INVITATIONS_COUNT}&invitationType=CONNECTION&q=invitationType&start=" + str(start),
             headers={"accept": "application/vnd.linkedin.normalized+json+2.1"}
         )       
+        # a throttled page has no invitations, which would read as the last page
+        check_status(res)
 
         data = res.json()
 
         return data 
 
-    def get_invitation_entity_urn(self, profile_urn=''):    
-        sent_invitations = self.get_sent_invintations().get('included', {})
-        for sent_invite in sent_invitations:
-            if sent_invite.get('toMemberId', '') == profile_urn:
-                return sent_invite.get('entityUrn', '')
+    def refresh_sent_invitations(self, full=False):
+        """
+        Update the index of sent invitations, keyed by `toMemberId`.
+
+        Sent invitations are returned newest first, so by default paging stops at
+        the first page holding an invitation that is already indexed. Such an
+        incremental refresh never drops invitations accepted or withdrawn since
+        (other than by withdraw_invitation), so their entityUrns stay indexed.
+        [full] - discard the index and page through every sent invitation
+
+        A page that can't be fetched (i.e. throttled) raises requests.HTTPError.
+        """
+        known = set() if full else set(self._sent_invitations.values())
+        found = {}
+
+        start = 0
+        while start / Linkedin._MAX_SENT_INVITATIONS_COUNT < Linkedin._MAX_REPEATED_REQUESTS:
+            data = self.get_sent_invintations(start=start)
+            invitations = [
+                item for item in data.get("included", []) if "toMemberId" in item
+            ]
+
+            for invitation in invitations:
+                found.setdefault(invitation["toMemberId"], invitation.get("entityUrn", ""))
+
+            if (
+                len(invitations) < Linkedin._MAX_SENT_INVITATIONS_COUNT
+                or any(invitation.get("entityUrn") in known for invitation in invitations)
+            ):
+                break
+
+            start += Linkedin._MAX_SENT_INVITATIONS_COUNT
+            self.logger.debug(f"sent invitations grew to {len(found)}")
+
+        if full:
+            self._sent_invitations = found
+        else:
+            self._sent_invitations.update(found)
+
+        return self._sent_invitations
 
+    def get_invitation_entity_urn(self, profile_urn=''):
+        """
+        Return the entityUrn of the invitation sent to [profile_urn], or None.
+
+        The sent invitations index is refreshed only when [profile_urn] is not in it.
+        """
+        indexed = profile_urn in self._sent_invitations
+        if self.client.metrics is not None:
+            self.client.metrics.cache("sent_invitations", indexed)
+        if not indexed:
+            self.refresh_sent_invitations()
+
+        return self._sent_invitations.get(profile_urn)
 
     def withdraw_invitation(self, entity_urn=''):
 
@@ -968,8 +1090,32 @@ class Linkedin(object):
             f"/relationships/invitations?action=closeInvitations",
             data=json.dumps(payload)
         )
-        
-        return res.status_code == 200 
+
+        if res.status_code != 200:
+            return False
+
+        for member_id, invitation_urn in list(self._sent_invitations.items()):
+            if invitation_urn == entity_urn:
+                del self._sent_invitations[member_id]
+
+        return True
+
+    def withdraw_invitations(self, member_ids):
+        """
+        Withdraw the invitations sent to each of [member_ids].
+
+        The sent invitations index is refreshed once, up front (raising
+        requests.HTTPError if a page of it can't be fetched).
+        Return {member_id: True if withdrawn, False otherwise}
+        """
+        self.refresh_sent_invitations()
+
+        results = {}
+        for member_id in member_ids:
+            entity_urn = self._sent_invitations.get(member_id)
+            results[member_id] = bool(entity_urn) and self.withdraw_invitation(entity_urn)
+
+        return results
 
     def get_typehead(self, keywords=None, type=None):
         res = self._fetch(
@@ -982,3 +1128,92 @@ class Linkedin(object):
         elements = data.get("data").get("elements")
 
         return elements
+
+
+def parse_people_search(data):
+    """
+    Return (total, people) of a people search response, as search_people does.
+    """
+    if not data:
+        return 0, []
+
+    try:
+        number = data.get('data').get('metadata').get('totalResultCount')
+
+        if number > Linkedin._MAX_SEARCH_RETURNED:
+            number = Linkedin._MAX_SEARCH_RETURNED 
+
+        users_data = data.get("data").get("elements")[0].get("elements")
+        uncluded_data = [included for included in data.get("included") if "publicIdentifier" in included]
+    except:
+        return 0, []
+    
+    users = []
+
+    for user_data in users_data:
+        for included in uncluded_data:
+            if user_data.get("targetUrn") == included.get("entityUrn"):
+                users.append({
+                    "urn_id": user_data.get("targetUrn"),
+                    "data": user_data,
+                    "included": included
+                })
+    
+    results=[]
+
+    for user in users:
+        try:
+            public_id = user.get("data", {}).get("publicIdentifier", "")
+        except TypeError:
+            public_id = ""
+        try:
+            first_name = user.get("included", {}).get("firstName", "")
+        except TypeError:
+            first_name = ""
+        try:
+            last_name = user.get("included", {}).get("lastName", "")
+        except TypeError:
+            last_name = ""
+        try:
+            headline = user.get("data",{}).get("headline", {}).get("text", "")
+        except TypeError:
+            headline = ""
+        try:
+            snippet = user.get("data", {}).get("snippetText", {}).get("text", "")
+        except TypeError:
+            snippet = ""
+        try:
+            location = user.get("data", {}).get("subline", {}).get("text", "")
+        except TypeError:
+            location = ""
+        try:
+            network_depth = user.get("data", {}).get("secondaryTitle", {}).get("text", "")
+        except TypeError:
+            network_depth = ""
+        try:
+            display_picture_url = user.get("included", {}).get("picture", {}).get("rootUrl", "") + user.get("included", {}).get("picture", {}).get("artifacts", [{}, ])[0].get("fileIdentifyingUrlPathSegment", {})
+            if display_picture_url is None:
+                display_picture_url = ""
+        except:
+            display_picture_url = ""
+        try:  
+            navigation_url = user.get("data", {}).get("navigationUrl", "")
+        except TypeError:
+            navigation_url = ""
+
+        results.append(
+            {
+                "urn_id": user.get("urn_id").split(':')[-1],
+                "public_id": public_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "headline": headline,
+                "snippet": snippet,
+                "location": location,
+                "network_depth": network_depth,
+                "displayPictureUrl": display_picture_url,
+                "navigation_url": navigation_url
+            }
+        )
+
+    return number, results
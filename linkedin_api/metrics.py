@@ -0,0 +1,289 @@
+"""
+Per-endpoint request metrics, a Prometheus exporter and optional OpenTelemetry spans
+
+Give a Client a Metrics and every request it sends is counted by endpoint
+template (i.e. /voyager/api/identity/profiles/{id}/profileView), method and
+status, with latency, response size, JSON decode time and pacing wait. Cache
+lookups (stored sessions, the sent invitations index) are counted as hits or
+misses. `Metrics.render` returns the Prometheus text format, and `serve`
+exposes it over HTTP for scraping.
+
+Spans require opentelemetry-api: pip install linkedin_api[otel]
+"""
+import contextlib
+import functools
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+try:
+    from opentelemetry import trace
+except ImportError:  # optional dependency
+    trace = None
+
+# path segments following these are ids
+_ID_PARENTS = frozenset(("profiles", "conversations", "invitations", "companies", "schools"))
+# path segments that are ids wherever they appear: numbers, urns and rest.li keys
+_ID_SEGMENT = re.compile(r"\d{3,}|^\d+$|[:(%]")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name -> (type, help) of each metric
+METRICS = {
+    "requests_total": ("counter", "Requests sent, by endpoint, method and status."),
+    "request_duration_seconds": ("histogram", "Time from sending a request to its last byte."),
+    "response_bytes": ("histogram", "Size of response bodies."),
+    "decode_duration_seconds": ("histogram", "Time spent decoding JSON response bodies."),
+    "pacing_wait_seconds": ("histogram", "Time requests waited on pacing (evade) before sending."),
+    "request_errors_total": ("counter", "Requests that failed without a response."),
+    "cache_requests_total": ("counter", "Cache lookups, by cache and result (hit or miss)."),
+    "concurrency_limit": ("gauge", "Requests an account may have in flight (AdaptiveLimiter)."),
+    "concurrency_in_flight": ("gauge", "Requests an account has in flight (AdaptiveLimiter)."),
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def endpoint_template(path):
+    """
+    Return [path] (a url path) with its ids replaced by {id}, i.e.
+    /voyager/api/identity/profiles/tom-quirk/profileView -> /voyager/api/identity/profiles/{id}/profileView
+    """
+    segments = path.rstrip("/").split("/")
+    for i, segment in enumerate(segments):
+        if (i and segments[i - 1] in _ID_PARENTS) or _ID_SEGMENT.search(segment):
+            segments[i] = "{id}"
+
+    return "/".join(segments) or "/"
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+class _Histogram(object):
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class Metrics(object):
+    """
+    Thread-safe registry of counters, gauges and histograms, keyed by name and labels.
+
+    [namespace] - prefix of every exported metric name
+    [tracer] - OpenTelemetry tracer spans are started on; True for the global
+        tracer of linkedin_api, None for no spans
+    """
+
+    def __init__(self, namespace="linkedin_api", tracer=None):
+        self.namespace = namespace
+        if tracer is True:
+            if trace is None:
+                raise ImportError(
+                    "opentelemetry-api is required for spans: pip install linkedin_api[otel]"
+                )
+            tracer = trace.get_tracer("linkedin_api")
+        self.tracer = tracer
+
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._types = {name: kind for name, (kind, _) in METRICS.items()}
+        self._help = {name: text for name, (_, text) in METRICS.items()}
+
+    def describe(self, name, kind, text):
+        """
+        Declare metric [name] of [kind] (counter, gauge or histogram), exported with [text] as its help.
+        """
+        self._types[name] = kind
+        self._help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def cache(self, cache, hit):
+        self.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def observe_pacing(self, seconds):
+        self.observe("pacing_wait_seconds", seconds)
+
+    def observe_request(self, method, url, res, seconds):
+        """
+        Record a request to [url] answered by [res] (None if it failed) after [seconds].
+        """
+        endpoint = endpoint_template(urlparse(url).path)
+        if res is None:
+            self.inc("request_errors_total", endpoint=endpoint, method=method)
+            return
+
+        self.inc("requests_total", endpoint=endpoint, method=method, status=str(res.status_code))
+        self.observe("request_duration_seconds", seconds, endpoint=endpoint, method=method)
+        self.observe("response_bytes", len(res.content), buckets=SIZE_BUCKETS, endpoint=endpoint)
+        self._time_json(res, endpoint)
+
+    def _time_json(self, res, endpoint):
+        # callers decode the body themselves, so time it when they do
+        json = res.json
+
+        def timed_json(**kwargs):
+            started = time.perf_counter()
+            try:
+                return json(**kwargs)
+            finally:
+                self.observe(
+                    "decode_duration_seconds", time.perf_counter() - started, endpoint=endpoint
+                )
+
+        res.json = timed_json
+
+    @contextlib.contextmanager
+    def span(self, method, url):
+        """
+        Trace the block as an OpenTelemetry client span, if this registry has a tracer.
+
+        Yields the span (or None), so the response status can be set on it.
+        """
+        if self.tracer is None:
+            yield None
+            return
+
+        endpoint = endpoint_template(urlparse(url).path)
+        with self.tracer.start_as_current_span(
+            f"{method} {endpoint}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": method,
+                "url.full": url,
+                "linkedin_api.endpoint": endpoint,
+            },
+        ) as span:
+            yield span
+
+    def counter(self, name, **labels):
+        """
+        Return the value of counter (or gauge) [name] with [labels], or 0.
+        """
+        key = (name, _labels(labels))
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0))
+
+    def histogram(self, name, **labels):
+        """
+        Return {"count", "sum"} of histogram [name] with [labels].
+        """
+        with self._lock:
+            histogram = self._histograms.get((name, _labels(labels)))
+            if histogram is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": histogram.count, "sum": histogram.sum}
+
+    def render(self):
+        """
+        Return every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (key, (h.buckets, list(h.counts), h.sum, h.count))
+                for key, h in self._histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def header(name):
+            if name not in described:
+                described.add(name)
+                full = f"{self.namespace}_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} {self._types.get(name, 'untyped')}")
+
+        def sample(name, labels, value):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            label_text = "{" + label_text + "}" if label_text else ""
+            lines.append(f"{self.namespace}_{name}{label_text} {_number(value)}")
+
+        for (name, labels), value in counters + gauges:
+            header(name)
+            sample(name, labels, value)
+
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            header(name)
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                sample(f"{name}_bucket", labels + (("le", _number(bound)),), cumulative)
+            sample(f"{name}_bucket", labels + (("le", "+Inf"),), count)
+            sample(f"{name}_sum", labels, total)
+            sample(f"{name}_count", labels, count)
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(metrics, port=9464, host="127.0.0.1"):
+    """
+    Expose [metrics] at http://[host]:[port]/metrics from a background thread.
+
+    Return the server; stop it with server.shutdown().
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,340 @@
+"""
+Per-call phase profiling of the public API methods
+
+Give a Client a Profiler and every public method of a Linkedin (or Sales
+Navigator) instance built on it is timed, with the time of each call broken
+down into phases:
+
+    wait          pacing (evade), quota, rate limit, concurrency and retry backoff waits
+    connect       opening connections, TLS handshakes included
+    ttfb          sending requests until their response headers arrive
+    download      reading response bodies
+    decode        res.json()
+    sub_requests  other public methods called by the method (i.e. get_profile_skills from get_profile)
+    parse         the rest: the method's own work on the responses
+
+`Profiler.report` summarizes calls by method as a table; `chrome_trace` and
+`folded` export every call for flamegraph viewers (chrome://tracing, Perfetto,
+speedscope or flamegraph.pl).
+
+A method's phases are those of the thread calling it, so work it hands to a
+thread pool is profiled as separate top-level calls.
+"""
+import collections
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# in report order; parse and sub_requests are derived, the rest measured
+PHASES = ("wait", "connect", "ttfb", "download", "decode", "parse", "sub_requests")
+
+_local = threading.local()
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _current():
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def record(phase, seconds):
+    """
+    Add [seconds] of [phase], ending now, to the call being profiled on this thread, if any.
+    """
+    call = _current()
+    if call is not None:
+        call.phases[phase] += seconds
+        call.events.append((phase, time.perf_counter() - seconds, seconds))
+
+
+class _Call(object):
+    __slots__ = ("name", "thread", "parent", "phases", "events", "slices", "children", "duration")
+
+    def __init__(self, name):
+        self.name = name
+        self.thread = threading.get_ident()
+        self.parent = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        # (phase, start, seconds) of each measured phase
+        self.events = []
+        # (start, seconds) the call ran for; generators run in several slices
+        self.slices = []
+        self.children = []
+        self.duration = 0.0
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            record("connect", time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            record("connect", time.perf_counter() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class Profiler(object):
+    """
+    Thread-safe recorder of the phases of public API calls.
+
+    [max_calls] - top-level calls kept for chrome_trace and folded; the
+        summary covers every call regardless
+    """
+
+    def __init__(self, max_calls=10000):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._calls = collections.deque(maxlen=max_calls)
+        # name -> [calls, seconds, {phase: seconds}]
+        self._totals = {}
+
+    def attach(self, api, prefix=""):
+        """
+        Profile every public method of [api], a Linkedin or Sales Navigator instance,
+        reported as [prefix] followed by the method's name.
+        """
+        for name, method in inspect.getmembers(type(api), inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            bound = getattr(api, name)
+            if inspect.isgeneratorfunction(method):
+                setattr(api, name, self._wrap_generator(prefix + name, bound))
+            else:
+                setattr(api, name, self._wrap(prefix + name, bound))
+
+    def instrument(self, adapter):
+        """
+        Time the connections opened by [adapter], a requests HTTPAdapter.
+
+        Other transports (i.e. a ReplayTransport) never connect, so have no connect phase.
+        """
+        poolmanager = getattr(adapter, "poolmanager", None)
+        if poolmanager is not None:
+            poolmanager.pool_classes_by_scheme = {
+                "http": _TimedHTTPConnectionPool,
+                "https": _TimedHTTPSConnectionPool,
+            }
+
+    def record(self, phase, seconds):
+        record(phase, seconds)
+
+    def send(self, request, method, url, stream=False, **kwargs):
+        """
+        Send a request with [request] (i.e. session.request), timing its phases.
+        """
+        call = _current()
+        if call is None:
+            return request(method, url, stream=stream, **kwargs)
+
+        connected = call.phases["connect"]
+        started = time.perf_counter()
+        # streamed, so the headers arrive before the body is read
+        res = request(method, url, stream=True, **kwargs)
+        headers = time.perf_counter()
+        connected = call.phases["connect"] - connected
+        call.phases["ttfb"] += headers - started - connected
+        call.events.append(("ttfb", started + connected, headers - started - connected))
+
+        if not stream:
+            res.content
+            record("download", time.perf_counter() - headers)
+        self._time_json(res)
+        return res
+
+    def _time_json(self, res):
+        json = res.json
+
+        def timed_json(**kwargs):
+            started = time.perf_counter()
+            try:
+                return json(**kwargs)
+            finally:
+                record("decode", time.perf_counter() - started)
+
+        res.json = timed_json
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            call = self._enter(_Call(name))
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._exit(call, started)
+                self._finish(call)
+
+        return profiled
+
+    def _wrap_generator(self, name, method):
+        # only the time spent producing items is the call's, not the caller's between them
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            call = _Call(name)
+            items = method(*args, **kwargs)
+            try:
+                while True:
+                    self._enter(call)
+                    started = time.perf_counter()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    finally:
+                        self._exit(call, started)
+                    yield item
+            finally:
+                items.close()
+                self._finish(call)
+
+        return profiled
+
+    def _enter(self, call):
+        stack = _stack()
+        if not call.slices and stack:
+            call.parent = stack[-1]
+            call.parent.children.append(call)
+        stack.append(call)
+        return call
+
+    def _exit(self, call, started):
+        seconds = time.perf_counter() - started
+        stack = _stack()
+        stack.pop()
+        call.slices.append((started, seconds))
+        call.duration += seconds
+        if stack:
+            stack[-1].phases["sub_requests"] += seconds
+
+    def _finish(self, call):
+        phases = call.phases
+        phases["parse"] = max(
+            0.0, call.duration - sum(v for k, v in phases.items() if k != "parse")
+        )
+        with self._lock:
+            totals = self._totals.get(call.name)
+            if totals is None:
+                totals = self._totals[call.name] = [0, 0.0, dict.fromkeys(PHASES, 0.0)]
+            totals[0] += 1
+            totals[1] += call.duration
+            for phase, seconds in phases.items():
+                totals[2][phase] += seconds
+            if call.parent is None:
+                self._calls.append(call)
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+            self._totals.clear()
+
+    def summary(self):
+        """
+        Return a row per method, slowest first: {"method", "calls", "total", "mean", **phases},
+        times in seconds.
+        """
+        with self._lock:
+            rows = [
+                dict({"method": name, "calls": calls, "total": seconds, "mean": seconds / calls}, **phases)
+                for name, (calls, seconds, phases) in self._totals.items()
+            ]
+
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def report(self):
+        """
+        Return the summary as a table: mean milliseconds per call, and the share of each phase.
+        """
+        header = f"{'method':<32} {'calls':>7} {'mean ms':>9}"
+        header += "".join(f" {phase:>12}" for phase in PHASES)
+        lines = [header, "-" * len(header)]
+        for row in self.summary():
+            total = row["total"] or 1
+            shares = "".join(f" {row[phase] / total * 100:>11.1f}%" for phase in PHASES)
+            lines.append(f"{row['method']:<32} {row['calls']:>7} {row['mean'] * 1000:>9.2f}{shares}")
+        return "\n".join(lines)
+
+    def _walk(self):
+        with self._lock:
+            calls = list(self._calls)
+
+        pending = [(call, (call.name,)) for call in reversed(calls)]
+        while pending:
+            call, stack = pending.pop()
+            yield call, stack
+            pending.extend((child, stack + (child.name,)) for child in reversed(call.children))
+
+    def chrome_trace(self):
+        """
+        Return the kept calls as a Chrome trace (the Trace Event Format): each call
+        is a slice, with its measured phases nested in it.
+        """
+        pid = os.getpid()
+
+        def event(name, category, tid, start, seconds):
+            return {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "pid": pid,
+                "tid": tid,
+                "ts": (start - self._origin) * 1e6,
+                "dur": seconds * 1e6,
+            }
+
+        events = []
+        for call, _ in self._walk():
+            for start, seconds in call.slices:
+                events.append(event(call.name, "call", call.thread, start, seconds))
+            for phase, start, seconds in call.events:
+                events.append(event(phase, "phase", call.thread, start, seconds))
+
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def folded(self):
+        """
+        Return the kept calls as folded stacks (microseconds), i.e. for flamegraph.pl:
+
+            get_profile;ttfb 1520
+            get_profile;get_profile_skills;ttfb 910
+        """
+        samples = collections.Counter()
+        for call, stack in self._walk():
+            path = ";".join(stack)
+            for phase in PHASES:
+                if phase != "sub_requests" and call.phases[phase]:
+                    samples[f"{path};{phase}"] += call.phases[phase] * 1e6
+
+        return "".join(f"{path} {round(us)}\n" for path, us in samples.items() if round(us))
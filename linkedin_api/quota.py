@@ -0,0 +1,217 @@
+"""
+Request budgets per account and endpoint family, over rolling windows
+
+Give a Client a QuotaManager and every request it sends first takes a unit of
+its account's budget for the request's endpoint family (search, profiles,
+messaging, ...), waiting while a window is spent. Waiting requests are served
+by priority class, then earliest deadline, and lower classes may only spend a
+share of each window, so a scarce daily budget is kept for the most valuable
+work:
+
+    with quota.scheduled(INTERACTIVE, timeout=5):
+        api.get_profile('billy-g')
+"""
+import bisect
+import contextlib
+import heapq
+import itertools
+import math
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+from linkedin_api.utils.helpers import load_json, save_json
+
+# priority classes, served in this order
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+
+# share of each window a priority class may spend; the rest is kept for higher classes
+DEFAULT_SHARES = {INTERACTIVE: 1.0, NORMAL: 0.9, BACKGROUND: 0.7}
+
+# endpoint family of a request, by the first pattern matching its url path
+FAMILIES = (
+    ("search", re.compile(r"/search/|/salesApi\w*Search")),
+    ("messaging", re.compile(r"/messaging/")),
+    ("invitations", re.compile(r"[iI]nvitation")),
+    ("connections", re.compile(r"/relationships/connections")),
+    ("companies", re.compile(r"/organization/")),
+    ("profiles", re.compile(r"/identity/|/me/?$|/salesApiProfiles")),
+)
+
+# family -> ((max requests, window seconds), ...); "*" limits every family of an account together
+DEFAULT_LIMITS = {
+    "search": ((300, 24 * 60 * 60), (100, 60 * 60)),
+    "profiles": ((1000, 24 * 60 * 60),),
+    "*": ((2500, 24 * 60 * 60), (500, 60 * 60)),
+}
+
+
+class QuotaExceeded(Exception):
+    """
+    A request could not be given budget before its deadline.
+
+    [deadline] - the time.monotonic() deadline it missed, None if the budget
+    would never have come
+    """
+
+    def __init__(self, message, deadline=None):
+        super().__init__(message)
+        self.deadline = deadline
+
+
+def endpoint_family(url):
+    path = urlparse(url).path
+    for family, pattern in FAMILIES:
+        if pattern.search(path):
+            return family
+    return "other"
+
+
+class QuotaManager(object):
+    """
+    Thread-safe budgets of requests per account and endpoint family.
+
+    [limits] - family -> ((max requests, window seconds), ...), "*" for every family together
+    [shares] - priority class -> share of each window the class may spend, rounded up
+    [path] - JSON file usage is loaded from and saved to, so budgets survive restarts
+    """
+
+    def __init__(self, limits=DEFAULT_LIMITS, shares=DEFAULT_SHARES, path=None):
+        self.limits = {family: tuple(windows) for family, windows in limits.items()}
+        self.shares = shares
+        self.path = path
+        # usage older than the longest window is forgotten
+        self._longest = max(
+            (window for windows in self.limits.values() for _, window in windows), default=0
+        )
+
+        self._cond = threading.Condition()
+        # (account, family) -> sorted times requests were sent
+        self._sent = {}
+        # (account, family) -> heap of waiting (priority, deadline, seq)
+        self._waiting = {}
+        self._seq = itertools.count()
+        self._context = threading.local()
+
+        if path is not None and os.path.exists(path):
+            for key, times in load_json(path).items():
+                account, family = key.rsplit("|", 1)
+                self._sent[(account, family)] = sorted(times)
+
+    @contextlib.contextmanager
+    def scheduled(self, priority=NORMAL, timeout=None):
+        """
+        Send the requests of the block, on this thread, as [priority], each
+        failing with QuotaExceeded if it has no budget within [timeout] seconds
+        of the block's start.
+        """
+        previous = getattr(self._context, "schedule", None)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._context.schedule = (priority, deadline)
+        try:
+            yield
+        finally:
+            self._context.schedule = previous
+
+    def acquire(self, account, url, priority=None, deadline=None):
+        """
+        Wait until [account] has budget for a request to [url], and spend it.
+
+        [priority] and [deadline] (a time.monotonic() time) default to those of
+        the enclosing scheduled block, or NORMAL without a deadline.
+        """
+        if priority is None:
+            priority, scheduled_deadline = getattr(self._context, "schedule", None) or (NORMAL, None)
+            if deadline is None or (scheduled_deadline is not None and scheduled_deadline < deadline):
+                deadline = scheduled_deadline
+
+        family = endpoint_family(url)
+        key = (account, family)
+        waiter = (priority, math.inf if deadline is None else deadline, next(self._seq))
+
+        with self._cond:
+            queue = self._waiting.setdefault(key, [])
+            heapq.heappush(queue, waiter)
+            try:
+                while True:
+                    now = time.monotonic()
+                    # only the first in line may spend; the rest wait for it
+                    delay = self._delay(account, family, priority) if queue[0] is waiter else 0.0
+                    if queue[0] is waiter and delay <= 0:
+                        self._spend(account, family)
+                        return
+                    if delay == math.inf or now + delay >= waiter[1]:
+                        raise QuotaExceeded(
+                            f"no {family} budget for {account} before the deadline",
+                            None if delay == math.inf else waiter[1],
+                        )
+                    timeout = min(delay or math.inf, waiter[1] - now)
+                    self._cond.wait(None if timeout == math.inf else timeout)
+            finally:
+                queue.remove(waiter)
+                if queue:
+                    heapq.heapify(queue)
+                else:
+                    del self._waiting[key]
+                self._cond.notify_all()
+
+    def _windows(self, family):
+        for scope in (family, "*"):
+            for limit, window in self.limits.get(scope, ()):
+                yield scope, limit, window
+
+    def _delay(self, account, family, priority):
+        # seconds until every window of the family has room for [priority]
+        now = time.time()
+        share = self.shares.get(priority, 1.0)
+        delay = 0.0
+        for scope, limit, window in self._windows(family):
+            allowed = math.ceil(limit * share)
+            if allowed <= 0:
+                return math.inf
+            times = self._sent.get((account, scope), [])
+            start = bisect.bisect_right(times, now - window)
+            if len(times) - start >= allowed:
+                delay = max(delay, times[len(times) - allowed] + window - now)
+        return delay
+
+    def _spend(self, account, family):
+        now = time.time()
+        for scope in (family, "*"):
+            times = self._sent.setdefault((account, scope), [])
+            del times[: bisect.bisect_right(times, now - self._longest)]
+            times.append(now)
+
+    def usage(self, account, family="*", window=24 * 60 * 60):
+        """
+        Return the requests [account] sent to [family] ("*" for all) in the last [window] seconds.
+        """
+        with self._cond:
+            times = self._sent.get((account, family), [])
+            return len(times) - bisect.bisect_right(times, time.time() - window)
+
+    def remaining(self, account, family, priority=NORMAL):
+        """
+        Return the requests [account] may still send to [family] as [priority] right now.
+        """
+        now = time.time()
+        share = self.shares.get(priority, 1.0)
+        remaining = math.inf
+        with self._cond:
+            for scope, limit, window in self._windows(family):
+                times = self._sent.get((account, scope), [])
+                used = len(times) - bisect.bisect_right(times, now - window)
+                remaining = min(remaining, max(0, math.ceil(limit * share) - used))
+        return remaining
+
+    def save(self):
+        """
+        Write usage to self.path.
+        """
+        with self._cond:
+            data = {f"{account}|{family}": list(times) for (account, family), times in self._sent.items()}
+        save_json(self.path, data)
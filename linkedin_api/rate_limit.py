@@ -0,0 +1,187 @@
+"""
+Rate limiters shared by every process sending as the same account
+
+Each Linkedin instance paces itself, so many worker processes sending as one
+account add up to many times the intended rate. Give their Clients a rate
+limiter backed by the same store and they share one token bucket per account
+instead: [rate] requests a second on average, in bursts of at most [burst].
+
+SQLiteRateLimiter coordinates processes on one host through a SQLite file;
+RedisRateLimiter coordinates hosts through a Redis (or Redis-compatible)
+server, and requires redis: pip install linkedin_api[redis]
+"""
+import abc
+import sqlite3
+import threading
+import time
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL,
+    updated_at REAL
+);
+"""
+
+# KEYS[1] bucket; ARGV rate, burst, now, cost. Returns the seconds to wait, 0 if the tokens were taken
+_REDIS_SCRIPT = """
+local rate, burst, now, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens, updated_at = tonumber(bucket[1]), tonumber(bucket[2])
+if tokens == nil then
+    tokens, updated_at = burst, now
+end
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RateLimitExceeded(Exception):
+    """
+    A request could not be given a token before its timeout.
+    """
+
+
+def _refill(tokens, updated_at, now, rate, burst, cost):
+    # (tokens left, seconds to wait) of a bucket last updated at [updated_at]
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class RateLimiter(abc.ABC):
+    """
+    Token bucket per key: [rate] tokens a second, holding at most [burst].
+
+    Subclasses store the buckets, in try_acquire.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+
+    @abc.abstractmethod
+    def try_acquire(self, key, cost=1):
+        """
+        Take [cost] tokens from the bucket of [key] if it has them, returning 0,
+        otherwise return the seconds until it will.
+        """
+
+    def acquire(self, key, cost=1, timeout=None):
+        """
+        Wait until the bucket of [key] has [cost] tokens, and take them.
+
+        Raise RateLimitExceeded if that would take longer than [timeout] seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(key, cost)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(f"no token for {key} within {timeout}s")
+            time.sleep(wait)
+
+
+class LocalRateLimiter(RateLimiter):
+    """
+    Token buckets in memory, shared by the threads of one process.
+    """
+
+    def __init__(self, rate, burst=1):
+        super().__init__(rate, burst)
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def try_acquire(self, key, cost=1):
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens, wait = _refill(tokens, updated_at, now, self.rate, self.burst, cost)
+            self._buckets[key] = (tokens, now)
+        return wait
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Token buckets in the SQLite database at [path], shared by every process opening it.
+    """
+
+    def __init__(self, path, rate, burst=1):
+        super().__init__(rate, burst)
+        self.path = path
+        # sqlite connections can't be shared between threads
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def try_acquire(self, key, cost=1):
+        conn = self._connection()
+        # taking the write lock up front serializes processes reading the same bucket
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated_at = row or (self.burst, now)
+            tokens, wait = _refill(tokens, updated_at, now, self.rate, self.burst, cost)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return wait
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Token buckets in Redis, shared by every process connected to it.
+
+    [client] - a redis.Redis, or any client with a compatible register_script
+    [prefix] - of the keys buckets are stored at
+    """
+
+    def __init__(self, client, rate, burst=1, prefix="linkedin_api:rate:"):
+        super().__init__(rate, burst)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url, rate, burst=1, **kwargs):
+        """
+        Return a limiter storing its buckets at [url], i.e. redis://localhost:6379/0
+        """
+        if redis is None:
+            raise ImportError("redis is required for RedisRateLimiter: pip install linkedin_api[redis]")
+        return cls(redis.Redis.from_url(url), rate, burst, **kwargs)
+
+    def try_acquire(self, key, cost=1):
+        wait = self._script(
+            keys=[self.prefix + key], args=[self.rate, self.burst, time.time(), cost]
+        )
+        return float(wait)
@@ -1,28 +1,94 @@
 """
 Provides linkedin api-related code
 """
-import random
 import logging
-from time import sleep
-from urllib.parse import urlencode
+from urllib.parse import urlencode, quote
 import json
 import re
 
-from linkedin_api.utils.helpers import get_id_from_urn
+from linkedin_api.utils.helpers import check_status, get_id_from_urn
 
-from linkedin_api.client_sales_navigator import Client
+from linkedin_api.client import Client
+from linkedin_api import deadlines
 
 logger = logging.getLogger(__name__)
 
+# decoration fragment of each lead field that isn't requested by name alone
+_SALES_LEAD_DECORATIONS = {
+    "currentPositions": "currentPositions*",
+    "pastPositions": "pastPositions*",
+    "tags": "tags*",
+    "matchedArticles": "matchedArticles*",
+    "facePiles": "facePiles*",
+    "sharedConnectionsHighlight": "sharedConnectionsHighlight(count)",
+    "highlight": (
+        "highlight("
+        "com.linkedin.sales.profile.profileHighlights.MentionedInTheNewsHighlight"
+        "!_nt=com.linkedin.sales.deco.common.profile.highlights.DecoratedMentionedInTheNewsHighlight"
+        "(articleName,count,source,url),"
+        "com.linkedin.sales.profile.profileHighlights.ProfileHighlights"
+        "!_nt=com.linkedin.sales.deco.common.profile.highlights.DecoratedProfileHighlights"
+        "(sharedConnection(sharedConnectionUrns*~fs_salesProfile(entityUrn,firstName,lastName,"
+        "fullName,pictureInfo,profilePictureDisplayImage,presenceStatus)),teamlinkInfo(totalCount),"
+        "sharedEducations*(overlapInfo,entityUrn~fs_salesSchool(entityUrn,logoId,name,url,"
+        "schoolPictureDisplayImage)),sharedExperiences*(overlapInfo,entityUrn~fs_salesCompany("
+        "companyPictureDisplayImage,entityUrn,name,pictureInfo)),sharedGroups*(entityUrn~fs_salesGroup("
+        "entityUrn,name,largeLogoId,smallLogoId,groupPictureDisplayImage))),"
+        "com.linkedin.sales.profile.profileHighlights.RecentPositionChangeHighlight"
+        "!_nt=com.linkedin.sales.deco.common.profile.highlights.DecoratedRecentPositionChangeHighlight"
+        "(companyUrn,companyName,duration,title))"
+    ),
+}
+
+# keys kept from each of a lead's positions
+_SALES_POSITION_FIELDS = ("title", "companyName", "companyUrn", "current", "startedOn")
+
+DEFAULT_SALES_LEAD_FIELDS = (
+    "entityUrn",
+    "objectUrn",
+    "firstName",
+    "lastName",
+    "fullName",
+    "geoRegion",
+    "degree",
+    "currentPositions",
+)
+
+
+def build_decoration(fields):
+    """
+    Return the rest.li decoration projecting a lead onto [fields].
+
+    Fields missing from _SALES_LEAD_DECORATIONS are projected by name. Raw
+    decoration fragments, i.e. "positions*", raise ValueError, as leads are
+    projected onto field names and would silently drop them.
+    """
+    fragments = [field for field in fields if not re.fullmatch(r"\w+", field)]
+    if fragments:
+        raise ValueError(f"lead fields must be field names, not decoration fragments: {fragments}")
 
-def default_evade():
+    return "({})".format(
+        ",".join(_SALES_LEAD_DECORATIONS.get(field, field) for field in fields)
+    )
+
+
+def restli_encode(value):
     """
-    A catch-all method to try and evade suspension from Linkedin.
-    Currenly, just delays the request by a random (bounded) time
+    Return [value] (dict, list, bool or scalar) encoded for a rest.li 2.0 query string.
     """
-    sleep(random.uniform(0, 0))  # sleep a random duration to try and evade suspention
+    if isinstance(value, dict):
+        return "({})".format(
+            ",".join(f"{key}:{restli_encode(item)}" for key, item in value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return "List({})".format(",".join(restli_encode(item) for item in value))
+    if isinstance(value, bool):
+        return "true" if value else "false"
 
+    return quote(str(value), safe="")
 
+
+@deadlines.accepts_deadline
 class Linkedin(object):
     """
     Class for accessing Linkedin API.
@@ -30,34 +96,37 @@ class Linkedin(object):
 
     _MAX_UPDATE_COUNT = 100  # max seems to be 100
     _MAX_SEARCH_COUNT = 49  # max seems to be 49
+    _MAX_SALES_SEARCH_COUNT = 25  # max seems to be 25
+    _MAX_SALES_SEARCH_RETURNED = 2500
     _MAX_REPEATED_REQUESTS = (
         200
     )  # VERY conservative max requests count to avoid rate-limit
 
-    def __init__(self, username, password, refresh_cookies=False, debug=False):
-        self.client = Client(refresh_cookies=refresh_cookies, debug=debug)
-        self.client.authenticate(username, password)
-        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+    def __init__(self, username, password, refresh_cookies=False, debug=False, proxies={}, client=None):
+        if client is None:
+            client = Client(refresh_cookies=refresh_cookies, debug=debug, proxies=proxies)
+        if username is not None:
+            # authenticated on the first request
+            client.set_credentials(username, password)
+        self.client = client
+        if client.profiler is not None:
+            client.profiler.attach(self, prefix="sales_navigator.")
 
         self.logger = logger
 
-    def _fetch(self, uri, evade=default_evade, **kwargs):
+    def _fetch(self, uri, evade=None, **kwargs):
         """
         GET request to Linkedin API
         """
-        evade()
-
-        url = f"{self.client.API_BASE_URL}{uri}"
-        return self.client.session.get(url, **kwargs)
+        url = f"{self.client.SALES_API_BASE_URL}{uri}"
+        return self.client.request("GET", url, evade=evade, **kwargs)
 
-    def _post(self, uri, evade=default_evade, **kwargs):
+    def _post(self, uri, evade=None, **kwargs):
         """
         POST request to Linkedin API
         """
-        evade()
-
-        url = f"{self.client.API_BASE_URL}{uri}"
-        return self.client.session.post(url, **kwargs)
+        url = f"{self.client.SALES_API_BASE_URL}{uri}"
+        return self.client.request("POST", url, evade=evade, **kwargs)
 
     def get_current_profile(self):
         """
@@ -804,10 +873,6 @@ class Linkedin(object):
         """"
         Return current user profile
         """
-        sleep(
-            random.randint(0, 1)
-        )  # sleep a random duration to try and evade suspention
-
         res = self._fetch(f"/me")
 
         data = res.json()
@@ -825,10 +890,7 @@ class Linkedin(object):
             "q": "receivedInvitation"
         }
 
-        res = self.client.session.get(
-            f"{self.client.API_BASE_URL}/relationships/invitationViews",
-            params=params
-        )
+        res = self._fetch("/relationships/invitationViews", params=params)
 
         if res.status_code != 200:
             return []
@@ -854,8 +916,8 @@ class Linkedin(object):
             "isGenericInvitation": False
         })
 
-        res = self.client.session.post(
-            f"{self.client.API_BASE_URL}/relationships/invitations/{invitation_id}",
+        res = self._post(
+            f"/relationships/invitations/{invitation_id}",
             params=params,
             data=payload
         )
@@ -898,17 +960,68 @@ class Linkedin(object):
         return elements
 
 
-    def try_sales_navigator(self):
-
-        res = self._fetch(
-            f'/salesApiPeopleSearch?q=peopleSearchQuery&start=0&count=25&query=(doFetchHeroCard:true,keywords:python,recentSearchParam:(doLogHistory:true),searchHistoryParam:(doLogHistory:true),spotlightParam:(selectedType:ALL),doFetchFilters:true,doFetchHits:true,doFetchSpotlights:true)&decoration=%28degree%2CentityUrn%2CfirstName%2ClastName%2CfullName%2CobjectUrn%2CgeoRegion%2Chighlight%28com.linkedin.sales.profile.profileHighlights.MentionedInTheNewsHighlight!_nt%3Dcom.linkedin.sales.deco.common.profile.highlights.DecoratedMentionedInTheNewsHighlight%28articleName%2Ccount%2Csource%2Curl%29%2Ccom.linkedin.sales.profile.profileHighlights.ProfileHighlights!_nt%3Dcom.linkedin.sales.deco.common.profile.highlights.DecoratedProfileHighlights%28sharedConnection%28sharedConnectionUrns*~fs_salesProfile%28entityUrn%2CfirstName%2ClastName%2CfullName%2CpictureInfo%2CprofilePictureDisplayImage%2CpresenceStatus%29%29%2CteamlinkInfo%28totalCount%29%2CsharedEducations*%28overlapInfo%2CentityUrn~fs_salesSchool%28entityUrn%2ClogoId%2Cname%2Curl%2CschoolPictureDisplayImage%29%29%2CsharedExperiences*%28overlapInfo%2CentityUrn~fs_salesCompany%28companyPictureDisplayImage%2CentityUrn%2Cname%2CpictureInfo%29%29%2CsharedGroups*%28entityUrn~fs_salesGroup%28entityUrn%2Cname%2ClargeLogoId%2CsmallLogoId%2CgroupPictureDisplayImage%29%29%29%2Ccom.linkedin.sales.profile.profileHighlights.RecentPositionChangeHighlight!_nt%3Dcom.linkedin.sales.deco.common.profile.highlights.DecoratedRecentPositionChangeHighlight%28companyUrn%2CcompanyName%2Cduration%2Ctitle%29%29%2CteamlinkIntrosHighlight%2CopenLink%2Cpremium%2Cteamlink%2CpendingInvitation%2CprofilePictureDisplayImage%2Cviewed%2Csaved%2CcrmStatus%2CtrackingId%2CrecommendedLeadTrackingId%2ClistCount%2CcurrentPositions*%2Ctags*%2CpastPositions*%2CmatchedArticles*%2CfacePiles*%2CsharedConnectionsHighlight%28count%29%29',
-            headers={"accept": "application/vnd.linkedin.normalized+json+2.1"}
-        )
+    def iter_sales_people_search(self, query, fields=DEFAULT_SALES_LEAD_FIELDS, limit=None):
+        """
+        Yield leads matching a Sales Navigator people search.
 
-        import ipdb; ipdb.set_trace()
+        [query] - keywords, or a dict of peopleSearchQuery fields
+            i.e. {"keywords": "python", "titleIncluded": ["CTO"]}
+        [fields] - lead fields to fetch and return; see DEFAULT_SALES_LEAD_FIELDS
+        [limit] - maximum number of leads to yield
 
-        data = res.json()
+        Each lead is a dict of [fields], with positions trimmed to _SALES_POSITION_FIELDS.
+        Pages are fetched until one is empty, or the reported total (if any) is
+        reached. A page that can't be fetched raises requests.HTTPError.
+        """
+        if not isinstance(query, dict):
+            query = {"keywords": query}
+        query = dict(
+            {
+                "doFetchHits": True,
+                "doFetchFilters": False,
+                "doFetchSpotlights": False,
+                "doFetchHeroCard": False,
+            },
+            **query,
+        )
 
-        return data 
+        encoded_query = restli_encode(query)
+        decoration = quote(build_decoration(fields), safe="")
+        count = (
+            limit
+            if limit and limit <= Linkedin._MAX_SALES_SEARCH_COUNT
+            else Linkedin._MAX_SALES_SEARCH_COUNT
+        )
 
-    
+        start = 0
+        yielded = 0
+        while start < Linkedin._MAX_SALES_SEARCH_RETURNED:
+            res = self._fetch(
+                f"/salesApiPeopleSearch?q=peopleSearchQuery&start={start}&count={count}"
+                f"&query={encoded_query}&decoration={decoration}"
+            )
+            check_status(res)
+
+            data = res.json()
+            elements = data.get("elements", [])
+
+            for element in elements:
+                lead = {field: element.get(field) for field in fields if field in element}
+                for key in ("currentPositions", "pastPositions"):
+                    if key in lead:
+                        lead[key] = [
+                            {k: position[k] for k in _SALES_POSITION_FIELDS if k in position}
+                            for position in lead[key]
+                        ]
+
+                yield lead
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+            start += count
+            total = data.get("paging", {}).get("total")
+            if not elements or (total is not None and start >= total):
+                return
+
+            self.logger.debug(f"leads grew to {yielded}")
@@ -0,0 +1,122 @@
+"""
+Serve many Linkedin accounts from one process
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+from requests.adapters import HTTPAdapter
+
+from linkedin_api.client import Client, default_evade
+from linkedin_api.linkedin import Linkedin
+from linkedin_api.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool(object):
+    """
+    Holds many accounts, routing calls to each account's own Linkedin instance.
+
+    Every account has its own cookies (kept in the shared session store) and
+    its own pacing, while all of them share one connection pool. Instances are
+    built on first use and at most [max_active] are kept in memory; evicting
+    one costs nothing, since its session stays in the store and the next
+    instance reuses it without logging in.
+    """
+
+    def __init__(
+        self,
+        session_store=None,
+        max_active=100,
+        evade=default_evade,
+        pool_connections=10,
+        pool_maxsize=100,
+        quota=None,
+        rate_limiter=None,
+        transport=None,
+    ):
+        self.session_store = session_store or SessionStore()
+        self.max_active = max_active
+        self.evade = evade
+        # linkedin_api.quota.QuotaManager budgeting the requests of every account, if any
+        self.quota = quota
+        # linkedin_api.rate_limit.RateLimiter pacing every account, if any
+        self.rate_limiter = rate_limiter
+        # requests adapter shared by every account's client, i.e. an HTTP2Transport
+        self.adapter = transport or HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+
+        self._accounts = {}
+        self._active = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def __contains__(self, account_id):
+        return account_id in self._accounts
+
+    def add_account(self, account_id, username, password, proxies={}, evade=None):
+        """
+        Register an account. Nothing is sent until the account is first used.
+
+        [evade] - pacing for this account (default: the pool's)
+        """
+        with self._lock:
+            self._accounts[account_id] = {
+                "username": username,
+                "password": password,
+                "proxies": proxies,
+                "evade": evade or self.evade,
+            }
+            self._active.pop(account_id, None)
+
+    def remove_account(self, account_id):
+        with self._lock:
+            self._accounts.pop(account_id, None)
+            api = self._active.pop(account_id, None)
+
+        if api is not None:
+            api.client.stop_health_check()
+
+    def get(self, account_id):
+        """
+        Return the Linkedin instance of [account_id], building it if needed.
+        """
+        with self._lock:
+            api = self._active.get(account_id)
+            if api is not None:
+                self._active.move_to_end(account_id)
+                return api
+
+            account = self._accounts[account_id]
+            api = self._build(account_id, account)
+            self._active[account_id] = api
+
+            while len(self._active) > self.max_active:
+                evicted_id, evicted = self._active.popitem(last=False)
+                evicted.client.stop_health_check()
+                logger.debug(f"evicted account {evicted_id}")
+
+        return api
+
+    def call(self, account_id, method, *args, **kwargs):
+        """
+        Call Linkedin.[method] as [account_id].
+        """
+        return getattr(self.get(account_id), method)(*args, **kwargs)
+
+    def _build(self, account_id, account):
+        client = Client(
+            proxies=account["proxies"],
+            evade=account["evade"],
+            session_store=self.session_store,
+            quota=self.quota,
+            rate_limiter=self.rate_limiter,
+            account=account_id,
+            transport=self.adapter,
+        )
+
+        return Linkedin(account["username"], account["password"], client=client)
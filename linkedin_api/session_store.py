@@ -0,0 +1,129 @@
+"""
+Per-account store of authenticated session cookies
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+import linkedin_api.settings as settings
+from linkedin_api.utils.helpers import save_json
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; writes are still atomic
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# cookies whose expiry bounds the life of an authenticated session
+SESSION_COOKIES = ("li_at", "JSESSIONID")
+
+
+class SessionStore(object):
+    """
+    Stores the session cookies of each account as JSON, one file per account.
+
+    Files are replaced atomically, and `lock` serializes logins to the same
+    account across threads and processes. The directory (when created) and the
+    files are readable by their owner only.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or settings.COOKIE_DIR
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def _path(self, account, suffix=".json"):
+        name = hashlib.sha1(account.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    @contextlib.contextmanager
+    def lock(self, account):
+        """
+        Hold an exclusive lock on [account] for the duration of the block.
+        """
+        with open(self._path(account, ".lock"), "a") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def load(self, account):
+        """
+        Return the stored cookies of [account], or None if missing or expired.
+        """
+        try:
+            with open(self._path(account), "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        expires_at = data.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            logger.debug("Stored session expired")
+            return None
+
+        cookiejar = RequestsCookieJar()
+        for cookie in data["cookies"]:
+            cookiejar.set_cookie(create_cookie(**cookie))
+
+        return cookiejar
+
+    def save(self, account, cookiejar):
+        """
+        Store the cookies of [account], replacing any stored before.
+        """
+        cookies = []
+        expiries = []
+        for cookie in cookiejar:
+            cookies.append(
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires,
+                    "secure": cookie.secure,
+                    "rest": cookie._rest,
+                }
+            )
+            if cookie.name in SESSION_COOKIES and cookie.expires:
+                expiries.append(cookie.expires)
+
+        save_json(
+            self._path(account),
+            {
+                "saved_at": time.time(),
+                "expires_at": min(expiries) if expiries else None,
+                "cookies": cookies,
+            },
+            mode=0o600,
+        )
+
+    def metadata(self, account):
+        """
+        Return {"saved_at", "expires_at"} of the stored session of [account], or None.
+        """
+        try:
+            with open(self._path(account), "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return {"saved_at": data.get("saved_at"), "expires_at": data.get("expires_at")}
+
+    def delete(self, account):
+        """
+        Remove the stored cookies of [account].
+        """
+        try:
+            os.remove(self._path(account))
+        except FileNotFoundError:
+            pass
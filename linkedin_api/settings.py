@@ -1,4 +1,7 @@
 import os
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
-COOKIE_FILE_PATH = os.path.join(ROOT_DIR, ".cookie.jr")
+COOKIE_DIR = os.getenv(
+    "LINKEDIN_API_COOKIE_DIR",
+    os.path.join(os.path.expanduser("~"), ".linkedin_api", "cookies"),
+)
@@ -0,0 +1,164 @@
+"""
+Pluggable transports for Client.session: record interactions to cassettes, and replay them
+
+A transport is a requests adapter, given to Client(transport=...) in place
+of the default HTTPAdapter. RecordingTransport forwards each request to a
+real adapter and appends the interaction to a Cassette; ReplayTransport
+answers requests from a cassette without the network, optionally taking as
+long as the recorded response did, so tests and benchmarks run offline and
+deterministically.
+
+Cassettes store request methods, urls and bodies, and response statuses,
+content types, bodies and latencies. Request headers (and so cookies and
+csrf tokens) are never stored.
+"""
+import base64
+import collections
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from linkedin_api.utils.helpers import save_json
+
+
+class UnrecordedRequestException(requests.ConnectionError):
+    pass
+
+
+def make_response(request, status, body, content_type=None):
+    """
+    Return a requests Response to [request], as if received from the network.
+    """
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict({"content-type": content_type or ""})
+    response._content = body
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.reason = ""
+    return response
+
+
+def _request_body(request):
+    body = request.body
+    if isinstance(body, bytes):
+        return body.decode("utf-8", "replace")
+    return body
+
+
+class Cassette(object):
+    """
+    Recorded interactions, stored as JSON at [path].
+    """
+
+    def __init__(self, path, interactions=None):
+        self.path = path
+        self.interactions = interactions or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls(path, json.load(f)["interactions"])
+
+    def save(self):
+        with self._lock:
+            # indented, so re-recorded cassettes diff readably
+            save_json(self.path, {"interactions": self.interactions}, indent=1)
+
+    def add(self, request, response, elapsed):
+        interaction = {
+            "method": request.method,
+            "url": request.url,
+            "body": _request_body(request),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type"),
+            "elapsed": round(elapsed, 4),
+        }
+        try:
+            interaction["response"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["response_base64"] = base64.b64encode(response.content).decode("ascii")
+
+        with self._lock:
+            self.interactions.append(interaction)
+
+
+class RecordingTransport(BaseAdapter):
+    """
+    Sends requests through [adapter] (default: a new HTTPAdapter), recording each to [cassette].
+
+    The cassette is saved when the transport (or the session it is mounted on) is closed.
+    """
+
+    def __init__(self, cassette, adapter=None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # read the body now, so the recorded latency includes the download
+        response.content
+        self.cassette.add(request, response, time.perf_counter() - started)
+        return response
+
+    def close(self):
+        self.adapter.close()
+        self.cassette.save()
+
+
+class ReplayTransport(BaseAdapter):
+    """
+    Answers requests with the responses recorded in [cassette].
+
+    Requests are matched on method, url and body. Repeated requests are answered
+    in recorded order, the last recorded response being reused once the others
+    are used up. Each response is delayed by [latency] times its recorded latency
+    (0 to answer immediately).
+    """
+
+    def __init__(self, cassette, latency=1.0):
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions = collections.defaultdict(collections.deque)
+        for interaction in cassette.interactions:
+            key = (interaction["method"], interaction["url"], interaction.get("body"))
+            self._interactions[key].append(interaction)
+
+    def send(self, request, **kwargs):
+        key = (request.method, request.url, _request_body(request))
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                raise UnrecordedRequestException(
+                    f"{request.method} {request.url} is not in {self.cassette.path}"
+                )
+            interaction = recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+        if self.latency:
+            time.sleep(interaction["elapsed"] * self.latency)
+
+        if "response_base64" in interaction:
+            body = base64.b64decode(interaction["response_base64"])
+        else:
+            body = interaction["response"].encode("utf-8")
+
+        return make_response(
+            request,
+            interaction["status"],
+            body,
+            content_type=interaction.get("content_type"),
+        )
+
+    def close(self):
+        pass
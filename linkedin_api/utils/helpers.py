@@ -1,3 +1,10 @@
+import json
+import os
+import threading
+
+import requests
+
+
 def get_id_from_urn(urn):
     """
     Return the ID of a given Linkedin URN.
@@ -5,3 +12,39 @@ def get_id_from_urn(urn):
     Example: urn:li:fs_miniProfile:<id>
     """
     return urn.split(":")[3]
+
+
+def check_status(res, expected=200):
+    """
+    Raise requests.HTTPError unless [res] has the [expected] status.
+
+    Unlike res.raise_for_status(), this also fails on Linkedin's 999s, so pages
+    cut short by throttling aren't mistaken for the end of a listing.
+    """
+    if res.status_code != expected:
+        raise requests.HTTPError(f"{res.status_code} from {res.url}", response=res)
+
+
+def load_json(path, default=None):
+    """
+    Return the JSON document stored at [path], or [default] if there is none.
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def save_json(path, data, indent=None, mode=0o666):
+    """
+    Atomically replace the JSON document stored at [path] with [data].
+
+    [mode] - permissions of the file (less the umask), i.e. 0o600 for secrets;
+        set when it is created, so it's never readable by others
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
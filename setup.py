@@ -33,6 +33,15 @@ setuptools.setup(
     license="MIT",
     packages=setuptools.find_packages(),
     install_requires=["requests"],
+    extras_require={
+        "arrow": ["pyarrow"],
+        "pandas": ["pandas"],
+        "archive": ["zstandard"],
+        "otel": ["opentelemetry-api"],
+        "redis": ["redis"],
+        "http2": ["httpx[http2]"],
+    },
+    entry_points={"console_scripts": ["linkedin-api = linkedin_api.cli:main"]},
     classifiers=(
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,726 @@
+"""
+Local mock of the voyager and Sales Navigator APIs, for the tests, benchmarks and offline load tests
+
+Serves generated (deterministic) data in the shapes the Linkedin parsers
+expect: /me, /search/blended, /identity/profiles/*/profileView and skills,
+/messaging/conversations, /relationships/* and /sales-api/salesApiPeopleSearch.
+Every POST succeeds. Point a Linkedin instance at it with `mock_linkedin`:
+
+    with MockVoyagerServer() as server:
+        api = mock_linkedin(server.base_url)
+        api.get_profile("person-1")
+
+A FaultProfile (see PROFILES) makes the server slow, throttled or flaky:
+latency distributions, 429 bursts and rate limits, 999s, 5xxs and truncated
+JSON. GET /__mock/stats returns the count of responses sent by status, and of
+connections accepted.
+
+Clients speaking HTTP/2 with prior knowledge (h2c, i.e. linkedin_api.http2's
+HTTP2Transport(http1=False)) are served too, multiplexed on one connection;
+this requires h2: pip install linkedin_api[http2]
+
+or run it on its own: python tests/mock_server.py --port 8080
+"""
+import argparse
+import collections
+import io
+import json
+import math
+import multiprocessing
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:  # optional dependency
+    h2 = None
+
+# first bytes a client speaking HTTP/2 with prior knowledge sends
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+# headers HTTP/2 forbids
+_CONNECTION_HEADERS = frozenset(
+    ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+)
+
+
+def _int(query, name, default):
+    try:
+        return int(query[name][0])
+    except (KeyError, ValueError):
+        return default
+
+
+def mini_profile(i):
+    return {
+        "entityUrn": f"urn:li:fs_miniProfile:ACoAA{i:06d}",
+        "publicIdentifier": f"person-{i}",
+        "firstName": f"First{i}",
+        "lastName": f"Last{i}",
+        "occupation": f"Engineer at Company {i % 50}",
+    }
+
+
+class FaultProfile(object):
+    """
+    Faults injected by a MockVoyagerServer into its responses.
+
+    [latency] - delay of every response: ("constant", seconds), ("uniform", low, high)
+        or ("lognormal", median, sigma)
+    [errors] - {status or "truncated": probability}, i.e. {999: 0.01, 503: 0.02};
+        truncated responses are cut short JSON bodies, with a 200
+    [rate_limit] - (requests per second, burst): requests beyond this token bucket get a 429
+    [bursts] - (period, duration): for the first [duration] of every [period] seconds,
+        every request gets a 429
+    [retry_after] - Retry-After seconds sent with each 429, or None
+    [seed] - seed of the random faults, so runs are repeatable
+    """
+
+    def __init__(
+        self, latency=None, errors=None, rate_limit=None, bursts=None, retry_after=None, seed=0
+    ):
+        self.latency = latency
+        self.errors = errors or {}
+        self.rate_limit = rate_limit
+        self.bursts = bursts
+        self.retry_after = retry_after
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._random = random.Random(self.seed)
+        self._started = time.monotonic()
+        self._tokens = self.rate_limit[1] if self.rate_limit else 0
+        self._refilled = self._started
+
+    def __getstate__(self):
+        # sent to a start_process child without its lock; it resets on arrival
+        return {key: value for key, value in self.__dict__.items() if not key.startswith("_")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.reset()
+
+    def delay(self):
+        if self.latency is None:
+            return 0.0
+
+        kind, *args = self.latency
+        with self._lock:
+            if kind == "uniform":
+                return self._random.uniform(*args)
+            if kind == "lognormal":
+                median, sigma = args
+                return self._random.lognormvariate(math.log(median), sigma)
+        return args[0]
+
+    def fault(self):
+        """
+        Return the fault to inject in the next response: a status, "truncated", or None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.bursts:
+                period, duration = self.bursts
+                if (now - self._started) % period < duration:
+                    return 429
+
+            if self.rate_limit:
+                rate, burst = self.rate_limit
+                self._tokens = min(burst, self._tokens + (now - self._refilled) * rate)
+                self._refilled = now
+                if self._tokens < 1:
+                    return 429
+                self._tokens -= 1
+
+            roll = self._random.random()
+        for fault, probability in self.errors.items():
+            if roll < probability:
+                return fault
+            roll -= probability
+
+        return None
+
+
+# named fault profiles, for the load driver
+PROFILES = {
+    "healthy": FaultProfile(latency=("constant", 0.005)),
+    "slow": FaultProfile(latency=("lognormal", 0.05, 1.0)),
+    "throttled": FaultProfile(latency=("constant", 0.005), rate_limit=(100, 20), retry_after=1),
+    "bursty_429": FaultProfile(latency=("constant", 0.005), bursts=(5, 1)),
+    "flaky": FaultProfile(
+        latency=("uniform", 0.002, 0.02), errors={999: 0.02, 503: 0.03, "truncated": 0.02}
+    ),
+}
+
+
+def _person_id(public_id):
+    match = re.search(r"(\d+)$", public_id)
+    return int(match.group(1)) if match else 0
+
+
+class MockVoyagerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # cut the next response's body short (a "truncated" fault)
+    truncate = False
+
+    # (method, path pattern, handler method name)
+    ROUTES = (
+        ("GET", re.compile(r"/voyager/api/me/?$"), "me"),
+        ("GET", re.compile(r"/voyager/api/search/blended$"), "search_blended"),
+        ("GET", re.compile(r"/voyager/api/identity/profiles/([^/]+)/profileView$"), "profile_view"),
+        ("GET", re.compile(r"/voyager/api/identity/profiles/([^/]+)/skills$"), "skills"),
+        (
+            "GET",
+            re.compile(r"/voyager/api/identity/profiles/([^/]+)/profileContactInfo$"),
+            "contact_info",
+        ),
+        ("GET", re.compile(r"/voyager/api/messaging/conversations$"), "conversations"),
+        ("GET", re.compile(r"/voyager/api/messaging/conversations/([^/]+)/events$"), "events"),
+        ("GET", re.compile(r"/voyager/api/relationships/connections$"), "connections"),
+        (
+            "GET",
+            re.compile(r"/(?:voyager/api|sales-api)/relationships/invitationViews$"),
+            "invitations",
+        ),
+        (
+            "GET",
+            re.compile(r"/voyager/api/relationships/sentInvitationViewsV2$"),
+            "sent_invitations",
+        ),
+        ("GET", re.compile(r"/sales-api/me$"), "me"),
+        ("GET", re.compile(r"/sales-api/salesApiPeopleSearch$"), "sales_search"),
+    )
+
+    def handle(self):
+        self.server.count_connection()
+        if h2 is not None and self.rfile.peek(len(H2_PREFACE)).startswith(H2_PREFACE):
+            self.handle_h2()
+        else:
+            super().handle()
+
+    def handle_h2(self):
+        """
+        Serve an HTTP/2 connection, answering each stream with the response to
+        it as an HTTP/1.1 request, from a pool of threads.
+        """
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        # guards conn and the socket; notified when the client opens a flow control window
+        cond = threading.Condition()
+        streams = {}
+
+        def flush():
+            data = conn.data_to_send()
+            if data:
+                self.connection.sendall(data)
+
+        def respond(stream_id, headers, body):
+            status, response_headers, response_body = self.handle_h1(headers, body)
+            with cond:
+                conn.send_headers(stream_id, [(":status", str(status))] + response_headers)
+                while True:
+                    size = min(
+                        conn.local_flow_control_window(stream_id),
+                        conn.max_outbound_frame_size,
+                        len(response_body),
+                    )
+                    if size or not response_body:
+                        end_stream = size == len(response_body)
+                        conn.send_data(stream_id, response_body[:size], end_stream=end_stream)
+                        response_body = response_body[size:]
+                        flush()
+                        if end_stream:
+                            break
+                    elif not cond.wait(5):
+                        # the client stopped reading
+                        return
+
+        with cond:
+            conn.initiate_connection()
+            flush()
+        with ThreadPoolExecutor(max_workers=100) as executor:
+            while True:
+                try:
+                    data = self.rfile.read1(65535)
+                except ConnectionError:
+                    break
+                if not data:
+                    break
+                with cond:
+                    try:
+                        events = conn.receive_data(data)
+                    except h2.exceptions.ProtocolError:
+                        # i.e. a stream opened out of order: h2 queued a GOAWAY
+                        flush()
+                        return
+                    for event in events:
+                        if isinstance(event, h2.events.RequestReceived):
+                            streams[event.stream_id] = (event.headers, bytearray())
+                        elif isinstance(event, h2.events.DataReceived):
+                            streams[event.stream_id][1].extend(event.data)
+                            conn.acknowledge_received_data(
+                                event.flow_controlled_length, event.stream_id
+                            )
+                        elif isinstance(event, h2.events.StreamEnded):
+                            executor.submit(respond, event.stream_id, *streams.pop(event.stream_id))
+                        elif isinstance(event, h2.events.WindowUpdated):
+                            cond.notify_all()
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            return
+                    flush()
+
+    def handle_h1(self, headers, body):
+        """
+        Return the (status, headers, body) this handler answers the HTTP/2 request
+        of [headers] and [body] with, as if sent over HTTP/1.1.
+        """
+        pseudo = {name: value for name, value in headers if name.startswith(":")}
+        lines = [
+            f"{pseudo[':method']} {pseudo[':path']} HTTP/1.1",
+            f"Host: {pseudo.get(':authority', '')}",
+        ]
+        lines += [f"{name}: {value}" for name, value in headers if not name.startswith(":")]
+        lines.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + bytes(body)
+
+        handler = type(self).__new__(type(self))
+        handler.server = self.server
+        handler.client_address = self.client_address
+        handler.rfile = io.BytesIO(request)
+        handler.wfile = io.BytesIO()
+        handler.handle_one_request()
+
+        head, _, response_body = handler.wfile.getvalue().partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        response_headers = []
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name.lower() not in _CONNECTION_HEADERS:
+                response_headers.append((name.lower(), value.strip()))
+        return int(status_line.split()[1]), response_headers, response_body
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        if url.path == "/__mock/stats":
+            return self.respond(200, self.server.stats(), count=False)
+
+        faults = self.server.faults
+        if faults is not None:
+            time.sleep(faults.delay())
+            fault = faults.fault()
+            if fault == 999:
+                return self.respond_raw(999, b"<html></html>", "text/html")
+            if isinstance(fault, int):
+                headers = {}
+                if fault == 429 and faults.retry_after is not None:
+                    headers["Retry-After"] = str(faults.retry_after)
+                return self.respond(fault, {"status": fault}, headers=headers)
+            self.truncate = fault == "truncated"
+
+        if method == "POST":
+            created = url.path.endswith(("/events", "/conversations", "/normInvitations"))
+            return self.respond(201 if created else 200, {})
+
+        for route_method, pattern, name in MockVoyagerHandler.ROUTES:
+            match = pattern.search(url.path)
+            if route_method == method and match:
+                return self.respond(200, getattr(self, name)(query, *match.groups()))
+
+        self.respond(404, {"status": 404, "message": f"no mock for {url.path}"})
+
+    def respond(self, status, data, headers=None, count=True):
+        body = json.dumps(data).encode("utf-8")
+        if self.truncate:
+            self.truncate = False
+            body = body[: len(body) // 2]
+        self.respond_raw(status, body, "application/json", headers, count)
+
+    def respond_raw(self, status, body, content_type, headers=None, count=True):
+        if count:
+            self.server.count(status)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def options(self):
+        return self.server.options
+
+    def me(self, query):
+        profile = mini_profile(0)
+        return {
+            "data": {"premiumSubscriber": False},
+            "included": [dict(profile, picture=None)],
+            "miniProfile": profile,
+            "plainId": 0,
+        }
+
+    def search_blended(self, query):
+        start = _int(query, "start", 0)
+        count = _int(query, "count", 10)
+        total = self.options["people"]
+        people = [mini_profile(i) for i in range(start, min(start + count, total))]
+        return {
+            "data": {
+                "metadata": {"totalResultCount": total},
+                "elements": [
+                    {
+                        "elements": [
+                            {
+                                "targetUrn": person["entityUrn"],
+                                "publicIdentifier": person["publicIdentifier"],
+                                "headline": {"text": person["occupation"]},
+                                "subline": {"text": "Brisbane, Australia"},
+                                "secondaryTitle": {"text": "2nd"},
+                                "snippetText": {"text": "Current: " + person["occupation"]},
+                                "navigationUrl": f"https://www.linkedin.com/in/{person['publicIdentifier']}",
+                            }
+                            for person in people
+                        ]
+                    }
+                ],
+            },
+            "included": people,
+        }
+
+    def profile_view(self, query, public_id):
+        i = _person_id(public_id)
+        profile = mini_profile(i)
+        return {
+            "profile": {
+                "firstName": profile["firstName"],
+                "lastName": profile["lastName"],
+                "headline": profile["occupation"],
+                "summary": "Builds things. " * 20,
+                "locationName": "Brisbane, Australia",
+                "industryName": "Computer Software",
+                "miniProfile": profile,
+                "defaultLocale": {"country": "US", "language": "en"},
+                "supportedLocales": [{"country": "US", "language": "en"}],
+                "versionTag": str(i),
+                "showEducationOnProfileTopCard": True,
+            },
+            "positionView": {
+                "elements": [
+                    {
+                        "title": f"Engineer {n}",
+                        "companyName": f"Company {(i + n) % 50}",
+                        "companyUrn": f"urn:li:fs_miniCompany:{(i + n) % 50}",
+                        "locationName": "Brisbane, Australia",
+                        "description": "Worked on things. " * 10,
+                        "timePeriod": {"startDate": {"year": 2010 + n, "month": 1}},
+                        "company": {"miniCompany": {"name": f"Company {(i + n) % 50}"}},
+                    }
+                    for n in range(self.options["positions"])
+                ]
+            },
+            "educationView": {
+                "elements": [
+                    {
+                        "schoolName": f"University {n}",
+                        "degreeName": "Bachelor of Engineering",
+                        "fieldOfStudy": "Software Engineering",
+                        "timePeriod": {"startDate": {"year": 2005}, "endDate": {"year": 2009}},
+                    }
+                    for n in range(2)
+                ]
+            },
+        }
+
+    def skills(self, query, public_id):
+        return {
+            "elements": [
+                {"name": f"Skill {n}", "entityUrn": f"urn:li:fs_skill:({public_id},{n})"}
+                for n in range(self.options["skills"])
+            ]
+        }
+
+    def contact_info(self, query, public_id):
+        return {"emailAddress": f"{public_id}@example.com", "websites": [], "phoneNumbers": []}
+
+    def conversations(self, query):
+        if "recipients" in query:
+            return {"elements": [{"entityUrn": "urn:li:fs_conversation:2-0"}]}
+
+        return {
+            "elements": [
+                {
+                    "entityUrn": f"urn:li:fs_conversation:2-{i}",
+                    "participants": [
+                        {"com.linkedin.voyager.messaging.MessagingMember": {"miniProfile": mini_profile(i)}}
+                    ],
+                }
+                for i in range(self.options["conversations"])
+            ]
+        }
+
+    def events(self, query, conversation_id):
+        i = _person_id(conversation_id)
+        return {
+            "elements": [
+                {
+                    "from": {
+                        "com.linkedin.voyager.messaging.MessagingMember": {
+                            "miniProfile": mini_profile(i if n % 2 else 0)
+                        }
+                    },
+                    "eventContent": {
+                        "com.linkedin.voyager.messaging.event.MessageEvent": {"body": f"message {n}"}
+                    },
+                }
+                for n in range(10)
+            ]
+        }
+
+    def connections(self, query):
+        start = _int(query, "start", 0)
+        count = _int(query, "count", 40)
+        ids = range(start, min(start + count, self.options["connections"]))
+        return {
+            "data": {"*elements": [f"urn:li:fs_relConnection:{i}" for i in ids]},
+            "included": [
+                {
+                    "entityUrn": f"urn:li:fs_relConnection:{i}",
+                    "createdAt": 1600000000000 - i * 60000,
+                    "*miniProfile": mini_profile(i)["entityUrn"],
+                }
+                for i in ids
+            ]
+            + [mini_profile(i) for i in ids],
+        }
+
+    def invitations(self, query):
+        start = _int(query, "start", 0)
+        count = _int(query, "count", 3)
+        return {
+            "elements": [
+                {
+                    "invitation": {
+                        "entityUrn": f"urn:li:fs_relInvitation:{6000 + i}",
+                        "sharedSecret": f"secret-{i}",
+                        "fromMember": mini_profile(i),
+                    }
+                }
+                for i in range(start, min(start + count, self.options["invitations"]))
+            ]
+        }
+
+    def sent_invitations(self, query):
+        start = _int(query, "start", 0)
+        count = _int(query, "count", 100)
+        return {
+            "included": [
+                {
+                    "entityUrn": f"urn:li:fs_relInvitation:{7000 + i}",
+                    "toMemberId": mini_profile(i)["entityUrn"].split(":")[-1],
+                }
+                for i in range(start, min(start + count, self.options["sent_invitations"]))
+            ]
+        }
+
+    def sales_search(self, query):
+        start = _int(query, "start", 0)
+        count = _int(query, "count", 25)
+        total = self.options["people"]
+        return {
+            "paging": {"start": start, "count": count, "total": total},
+            "elements": [
+                {
+                    "entityUrn": f"urn:li:fs_salesProfile:(ACoAA{i:06d},NAME_SEARCH,x)",
+                    "objectUrn": f"urn:li:member:{i}",
+                    "firstName": f"First{i}",
+                    "lastName": f"Last{i}",
+                    "fullName": f"First{i} Last{i}",
+                    "geoRegion": "Brisbane, Australia",
+                    "degree": 2,
+                    "currentPositions": [
+                        {
+                            "title": "Engineer",
+                            "companyName": f"Company {i % 50}",
+                            "current": True,
+                            "description": "Worked on things.",
+                        }
+                    ],
+                }
+                for i in range(start, min(start + count, total))
+            ],
+        }
+
+
+class MockVoyagerServer(object):
+    """
+    Serves the mock APIs on [host]:[port] (default: a free port) from a background thread.
+
+    [people], [connections], [invitations], [sent_invitations] and [conversations]
+    size the generated collections; [positions] and [skills] size each profile.
+    [faults] - FaultProfile injected into every response, if any
+    """
+
+    handler_class = MockVoyagerHandler
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        people=1000,
+        connections=500,
+        invitations=50,
+        sent_invitations=250,
+        conversations=20,
+        positions=5,
+        skills=20,
+        faults=None,
+    ):
+        self.host = host
+        self.port = port
+        self.options = {
+            "people": people,
+            "connections": connections,
+            "invitations": invitations,
+            "sent_invitations": sent_invitations,
+            "conversations": conversations,
+            "positions": positions,
+            "skills": skills,
+        }
+        self.faults = faults
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self.handler_class)
+        self._server.daemon_threads = True
+        self._server.options = self.options
+        self._server.faults = self.faults
+        if self.faults is not None:
+            self.faults.reset()
+        counts = collections.Counter()
+        connections = [0]
+        lock = threading.Lock()
+
+        def count(status):
+            with lock:
+                counts[status] += 1
+
+        def count_connection():
+            with lock:
+                connections[0] += 1
+
+        def stats():
+            with lock:
+                return {
+                    "requests": sum(counts.values()),
+                    "statuses": dict(counts),
+                    "connections": connections[0],
+                }
+
+        self._server.count = count
+        self._server.count_connection = count_connection
+        self._server.stats = stats
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def wait(self):
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _serve(server, urls):
+    server.start()
+    urls.put(server.base_url)
+    server.wait()
+
+
+def start_process(server):
+    """
+    Run [server] (a MockVoyagerServer, not yet started) in a child process, so
+    its CPU time isn't counted against the client's.
+
+    Return (process, base_url); stop it with process.terminate().
+    """
+    urls = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(server, urls), daemon=True)
+    process.start()
+    return process, urls.get(timeout=10)
+
+
+def mock_linkedin(base_url, **client_kwargs):
+    """
+    Return a Linkedin instance that sends every request to the mock at [base_url], unpaced.
+    """
+    from linkedin_api.client import Client
+    from linkedin_api.linkedin import Linkedin
+
+    client = Client(**dict({"evade": lambda: None}, **client_kwargs))
+    client.API_BASE_URL = f"{base_url}/voyager/api"
+    client.SALES_API_BASE_URL = f"{base_url}/sales-api"
+    return Linkedin(None, None, client=client)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Linkedin APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--people", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--faults", choices=sorted(PROFILES), help="fault profile to inject")
+    args = parser.parse_args(argv)
+
+    server = MockVoyagerServer(
+        host=args.host,
+        port=args.port,
+        people=args.people,
+        connections=args.connections,
+        faults=PROFILES.get(args.faults),
+    ).start()
+    print(f"serving on {server.base_url}", flush=True)
+    server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import os
+from urllib.parse import urlparse
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from linkedin_api.archive import ArchiveAdapter, ResponseArchive, offline_linkedin, replay
+from linkedin_api.client import Client
+from linkedin_api.linkedin import Linkedin
+from linkedin_api.session_store import SessionStore
+
+from mock_server import MockVoyagerServer, mock_linkedin
+
+PROFILE_VIEW = {
+    "profile": {
+        "firstName": "Tom",
+        "lastName": "Quirk",
+        "miniProfile": {"entityUrn": "urn:li:fs_miniProfile:ACoAAA"},
+        "defaultLocale": {},
+        "supportedLocales": [],
+        "versionTag": "1",
+        "showEducationOnProfileTopCard": True,
+    },
+    "positionView": {"elements": [{"title": "Engineer", "companyName": "Acme"}]},
+    "educationView": {"elements": []},
+}
+SKILLS = {"elements": [{"name": "Python", "entityUrn": "urn:li:fs_skill:1"}]}
+
+
+class JsonAdapter(BaseAdapter):
+    """
+    Answers each request with the JSON mapped to its path in [responses].
+    """
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = responses
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps(self.responses[urlparse(request.url).path]).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def archived_api(archive):
+    client = Client(evade=lambda: None, session_store=SessionStore(), archive=archive)
+    client.session.mount(
+        "https://",
+        JsonAdapter(
+            {
+                "/voyager/api/identity/profiles/tom-quirk/profileView": PROFILE_VIEW,
+                "/voyager/api/identity/profiles/tom-quirk/skills": SKILLS,
+            }
+        ),
+    )
+    return Linkedin(None, None, client=client)
+
+
+@pytest.fixture(autouse=True)
+def cookie_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("linkedin_api.settings.COOKIE_DIR", str(tmp_path / "cookies"))
+
+
+@pytest.mark.parametrize("compression", ["zstd", "gzip"])
+def test_records_round_trip(tmp_path, compression):
+    with ResponseArchive(str(tmp_path / "archive"), compression=compression) as archive:
+        archived_api(archive).get_profile("tom-quirk")
+
+    records = list(archive.records())
+    assert [urlparse(r["url"]).path.rsplit("/", 1)[-1] for r in records] == [
+        "profileView",
+        "skills",
+    ]
+    assert json.loads(records[1]["body"]) == SKILLS
+    assert records[0]["status"] == 200
+
+
+def test_segments_rotate(tmp_path):
+    archive = ResponseArchive(str(tmp_path), segment_size=1)
+    api = archived_api(archive)
+    api.get_profile_skills("tom-quirk")
+    api.get_profile_skills("tom-quirk")
+    archive.close()
+
+    assert len(archive.segments()) == 2
+    assert len(list(archive.records())) == 2
+
+
+def test_truncated_segment_keeps_complete_records(tmp_path):
+    archive = ResponseArchive(str(tmp_path))
+    archived_api(archive).get_profile("tom-quirk")
+    archive.close()
+
+    (path,) = archive.segments()
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 5)
+
+    assert len(list(archive.records())) == 1
+
+
+def test_replay_reparses_offline(tmp_path):
+    with ResponseArchive(str(tmp_path)) as archive:
+        live = archived_api(archive).get_profile("tom-quirk")
+
+    ((method, kwargs, profile),) = list(replay(archive))
+    assert method == "get_profile"
+    assert kwargs == {"public_id": "tom-quirk"}
+    assert profile == live
+    assert profile["skills"] == [{"name": "Python"}]
+
+
+def test_segments_of_archives_sharing_a_directory_dont_collide(tmp_path, monkeypatch):
+    monkeypatch.setattr("linkedin_api.archive.time.time", lambda: 1700000000.0)
+    archives = [ResponseArchive(str(tmp_path)) for _ in range(2)]
+    for archive in archives:
+        archived_api(archive).get_profile_skills("tom-quirk")
+        archive.close()
+
+    assert len(archives[0].segments()) == 2
+    assert len(list(archives[0].records())) == 2
+
+
+def test_replay_reparses_people_searches(tmp_path):
+    with MockVoyagerServer(people=30) as server, ResponseArchive(str(tmp_path / "archive")) as archive:
+        api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), archive=archive)
+        live = api.search_people(keywords="python", limit=10, start=0)
+
+    ((method, kwargs, result),) = list(replay(archive))
+    assert method == "search_people"
+    assert kwargs == {"keywords": "python", "start": 0, "limit": 10}
+    assert result == live
+    assert result[1][0]["public_id"] == "person-0"
+
+
+def test_archive_adapter_refuses_unarchived_requests():
+    api = offline_linkedin(ArchiveAdapter())
+    with pytest.raises(requests.ConnectionError):
+        api.get_profile_skills("tom-quirk")
@@ -0,0 +1,99 @@
+import json
+import multiprocessing
+
+import pytest
+
+from linkedin_api import cli
+from linkedin_api.cli import load_checkpoint, load_jobs, parse_job, result_error, run
+
+
+def test_parse_job():
+    assert parse_job('"tom-quirk"', 1) == ("1", "get_profile", {"public_id": "tom-quirk"})
+    assert parse_job(
+        '{"id": "a", "method": "search_people", "keywords": "python"}', 2
+    ) == ("a", "search_people", {"keywords": "python"})
+
+
+def test_parse_job_rejects_unsupported_methods():
+    with pytest.raises(ValueError):
+        parse_job('{"method": "send_message", "message_body": "hi"}', 1)
+
+
+def test_load_jobs_skips_blank_lines(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('"a"\n\n{"urn_id": "b"}\n')
+
+    assert load_jobs(str(path)) == [
+        ("1", "get_profile", {"public_id": "a"}),
+        ("3", "get_profile", {"urn_id": "b"}),
+    ]
+
+
+def test_completed_jobs_are_not_run_again(tmp_path):
+    checkpoint = tmp_path / "out.jsonl.done"
+    checkpoint.write_text("1\n3\n")
+    assert load_checkpoint(str(checkpoint)) == {"1", "3"}
+
+    jobs = [("1", "get_profile", {}), ("3", "get_profile", {})]
+    progress = run(jobs, str(tmp_path / "out.jsonl"), str(checkpoint), "user", "password")
+    assert progress.total == 0
+
+
+def test_empty_and_error_results_are_failures():
+    assert result_error({}) == "empty result"
+    assert result_error(None) == "empty result"
+    assert result_error({"status": 429}) == "status 429"
+    assert result_error({"firstName": "Tom"}) is None
+    assert result_error((0, [])) is None
+
+
+class FakeLinkedin(object):
+    def get_profile(self, public_id):
+        return {} if public_id == "throttled" else {"public_id": public_id}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="patches the forked workers")
+def test_failed_jobs_are_not_checkpointed(tmp_path, monkeypatch):
+    def init_worker(username, password, cookie_dir):
+        cli._api = FakeLinkedin()
+
+    monkeypatch.setattr(cli, "_init_worker", init_worker)
+    jobs = [("1", "get_profile", {"public_id": "throttled"}), ("2", "get_profile", {"public_id": "tom-quirk"})]
+    checkpoint = str(tmp_path / "out.jsonl.done")
+    progress = run(
+        jobs, str(tmp_path / "out.jsonl"), checkpoint, "user", "password", cookie_dir=str(tmp_path), workers=1
+    )
+
+    assert (progress.done, progress.failed) == (2, 1)
+    assert load_checkpoint(checkpoint) == {"2"}
+    with open(f"{checkpoint}.failed") as f:
+        assert [json.loads(line) for line in f] == [{"id": "1", "method": "get_profile", "error": "empty result"}]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="patches the forked workers")
+def test_jobs_are_checkpointed_once_flushed(tmp_path, monkeypatch):
+    def init_worker(username, password, cookie_dir):
+        cli._api = FakeLinkedin()
+
+    checkpoint = str(tmp_path / "out.jsonl.done")
+    written, flushed = [], set()
+
+    class Sink(cli.JsonlSink):
+        flush_every = 2
+
+        def write(self, job_id, method, result, error):
+            assert load_checkpoint(checkpoint) <= flushed
+            written.append(job_id)
+            super().write(job_id, method, result, error)
+
+        def flush(self):
+            flushed.update(written)
+            super().flush()
+
+    monkeypatch.setattr(cli, "_init_worker", init_worker)
+    monkeypatch.setattr(cli, "JsonlSink", Sink)
+    jobs = [(str(i), "get_profile", {"public_id": f"person-{i}"}) for i in range(5)]
+    run(jobs, str(tmp_path / "out.jsonl"), checkpoint, "user", "password", cookie_dir=str(tmp_path), workers=1)
+
+    assert flushed == {"0", "1", "2", "3"}
+    assert load_checkpoint(checkpoint) == {"0", "1", "2", "3", "4"}
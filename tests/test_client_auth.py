@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from linkedin_api.client import ChallengeException, Client
+from linkedin_api.session_store import SessionStore
+
+
+class StatusAdapter(BaseAdapter):
+    """
+    Answers each request with the next of [statuses].
+    """
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = Response()
+        response.status_code = self.statuses.pop(0)
+        response._content = b"{}"
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    client = Client(evade=lambda: None, session_store=SessionStore(str(tmp_path)))
+    client.logins = 0
+
+    def authenticate(username, password, refresh=False):
+        client.logins += 1
+        client._set_authenticated(username)
+
+    monkeypatch.setattr(client, "authenticate", authenticate)
+    return client
+
+
+def test_authenticates_lazily_once(client):
+    client.session.mount("https://", StatusAdapter([200, 200]))
+    client.set_credentials("a@example.com", "password")
+    assert client.logins == 0
+
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+    assert client.logins == 1
+
+
+def test_401_is_replayed_after_reauthenticating(client):
+    adapter = StatusAdapter([401, 200])
+    client.session.mount("https://", adapter)
+    client.set_credentials("a@example.com", "password")
+
+    res = client.request("GET", f"{Client.API_BASE_URL}/me")
+
+    assert res.status_code == 200
+    assert len(adapter.requests) == 2
+    assert client.logins == 2
+
+
+def test_stale_session_is_refreshed(client):
+    client.session.mount("https://", StatusAdapter([200, 200]))
+    client.set_credentials("a@example.com", "password")
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+
+    client._session_expires_at = time.time() + Client.SESSION_REFRESH_MARGIN / 2
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+    assert client.logins == 2
+
+
+def test_failed_refresh_keeps_the_session(client, monkeypatch):
+    adapter = StatusAdapter([200] * 7)
+    client.session.mount("https://", adapter)
+    client.set_credentials("a@example.com", "password")
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+
+    def challenged(username, password, refresh=False):
+        client.logins += 1
+        raise ChallengeException("CHALLENGE")
+
+    monkeypatch.setattr(client, "authenticate", challenged)
+    client._session_expires_at = time.time() + Client.SESSION_REFRESH_MARGIN / 2
+    for _ in range(5):
+        assert client.request("GET", f"{Client.API_BASE_URL}/me").status_code == 200
+    assert client.logins == 2
+
+    # tried again once backed off
+    client._refresh_failed_at -= Client.SESSION_REFRESH_BACKOFF
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+    assert client.logins == 3
+
+    # and raised once the session has expired
+    client._session_expires_at = time.time() - 1
+    with pytest.raises(ChallengeException):
+        client.request("GET", f"{Client.API_BASE_URL}/me")
+    assert len(adapter.requests) == 7
+
+
+@pytest.mark.parametrize("status, logins", [(200, 1), (401, 2), (429, 1), (999, 1), (503, 1)])
+def test_health_check_logs_in_again_only_when_rejected(client, status, logins):
+    client.session.mount("https://", StatusAdapter([200, status]))
+    client.set_credentials("a@example.com", "password")
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+
+    client._check_health()
+    assert client.logins == logins
+
+
+def test_health_check_doesnt_repeat_a_concurrent_login(client, monkeypatch):
+    client.session.mount("https://", StatusAdapter([200, 401]))
+    client.set_credentials("a@example.com", "password")
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+
+    send = client._send
+
+    def send_while_reauthenticated(*args, **kwargs):
+        # a request replayed after a 401 logs in again while /me is checked
+        client.reauthenticate(client._auth_generation)
+        return send(*args, **kwargs)
+
+    monkeypatch.setattr(client, "_send", send_while_reauthenticated)
+    client._check_health()
+    assert client.logins == 2
@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests.cookies import RequestsCookieJar
+
+from linkedin_api.client import Client
+
+LATENCY = 0.04
+REQUESTS = 32
+# seconds each request is paced by, in the throughput test
+PACING = 0.05
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.peak = max(self.server.peak, self.server.in_flight)
+        time.sleep(LATENCY)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        self.server.sent.append((self.headers.get("csrf-token"), self.headers.get("Cookie")))
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    # (csrf-token, Cookie header) of each request
+    server.sent = []
+    server.lock = threading.Lock()
+    server.in_flight = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def session_cookies(csrf_token):
+    cookiejar = RequestsCookieJar()
+    cookiejar.set("li_at", "token", domain="127.0.0.1")
+    cookiejar.set("JSESSIONID", f'"{csrf_token}"', domain="127.0.0.1")
+    return cookiejar
+
+
+@pytest.fixture
+def client():
+    client = Client(evade=lambda: None, pool_maxsize=16)
+    client._set_session_cookies(session_cookies("ajax:123"))
+    return client
+
+
+def run(client, url, threads, requests=REQUESTS):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        statuses = list(
+            executor.map(lambda _: client.request("GET", url).status_code, range(requests))
+        )
+    assert statuses == [200] * requests
+
+
+def test_requests_are_sent_concurrently(server, client):
+    url = f"http://127.0.0.1:{server.server_port}/voyager/api/me"
+
+    for threads in (1, 8):
+        server.peak = 0
+        run(client, url, threads)
+        assert server.peak == threads
+
+
+def test_throughput_scales_with_threads(server, client):
+    # each thread is paced on its own, so n threads send up to n / (PACING + LATENCY) requests a second
+    url = f"http://127.0.0.1:{server.server_port}/voyager/api/me"
+    client.evade = lambda: time.sleep(PACING)
+
+    throughput = {}
+    for threads in (1, 8):
+        started = time.perf_counter()
+        run(client, url, threads, requests=16)
+        throughput[threads] = 16 / (time.perf_counter() - started)
+
+    limit = 1 / (PACING + LATENCY)
+    assert throughput[1] <= limit * 1.1
+    # generous, for loaded machines: linear scaling would be 8x
+    assert throughput[8] >= throughput[1] * 4
+    assert throughput[8] >= limit * 8 * 0.4
+
+
+def test_cookies_and_csrf_token_are_swapped_together(server, client):
+    url = f"http://127.0.0.1:{server.server_port}/voyager/api/me"
+    server.sent.clear()
+    stop = threading.Event()
+
+    def log_in_again():
+        generation = 0
+        while not stop.is_set():
+            generation += 1
+            client._set_session_cookies(session_cookies(f"ajax:{generation}"))
+
+    swapper = threading.Thread(target=log_in_again)
+    swapper.start()
+    try:
+        run(client, url, 8)
+    finally:
+        stop.set()
+        swapper.join()
+
+    assert len(server.sent) == REQUESTS
+    for csrf_token, cookie in server.sent:
+        assert f'JSESSIONID="{csrf_token}"' in cookie
+
+
+def test_concurrent_requests_share_headers_without_mutation(server, client):
+    url = f"http://127.0.0.1:{server.server_port}/voyager/api/me"
+    headers = dict(client.session.headers)
+    server.sent.clear()
+
+    run(client, url, 8)
+
+    assert client.session.headers == headers
+    assert [csrf_token for csrf_token, _ in server.sent] == ["ajax:123"] * REQUESTS
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import requests
+
+from linkedin_api.concurrency import AdaptiveLimiter
+from linkedin_api.metrics import Metrics
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+OK = SimpleNamespace(status_code=200)
+THROTTLED = SimpleNamespace(status_code=429)
+
+
+def fill(limiter):
+    return [limiter.acquire() for _ in range(limiter.limit)]
+
+
+def test_grows_while_saturated_and_healthy():
+    limiter = AdaptiveLimiter(initial=4, latency_window=1000)
+    limits = []
+    for _ in range(10):
+        for sent_at in fill(limiter):
+            limiter.release(sent_at, OK)
+        limits.append(limiter.limit)
+    assert limits == sorted(limits)
+    assert limits[-1] >= 6
+
+
+def test_idle_capacity_doesnt_grow():
+    limiter = AdaptiveLimiter(initial=4)
+    for _ in range(20):
+        limiter.release(limiter.acquire(), OK)
+    assert limiter.limit == 4
+
+
+def test_throttling_cuts_once_per_round_trip():
+    limiter = AdaptiveLimiter(initial=16)
+    sent = fill(limiter)
+    for sent_at in sent:
+        limiter.release(sent_at, THROTTLED)
+    assert limiter.limit == 8
+
+    limiter.release(limiter.acquire(), THROTTLED)
+    assert limiter.limit == 4
+
+
+def test_timeouts_cut():
+    limiter = AdaptiveLimiter(initial=8)
+    limiter.release(limiter.acquire(), error=requests.ReadTimeout())
+    assert limiter.limit == 4
+
+
+def test_rising_latency_cuts():
+    limiter = AdaptiveLimiter(initial=8, latency_window=10)
+    for latency in [0.01] * 10 + [0.1] * 10:
+        limiter.acquire()
+        limiter.release(time.perf_counter() - latency, OK)
+    assert limiter.limit == 4
+
+
+def test_requests_in_flight_are_bounded():
+    limiter = AdaptiveLimiter(initial=3, max_limit=3)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def request(method, url):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return OK
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(lambda _: limiter.send(request, "GET", "/"), range(50)))
+    assert in_flight[1] == 3
+
+
+def run(server, limiter, tmp_path, calls=200):
+    api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), concurrency=limiter)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda _: api.client.request("GET", f"{server.base_url}/voyager/api/me"), range(calls)))
+
+
+def test_converges_up_when_healthy(tmp_path):
+    metrics = Metrics()
+    limiter = AdaptiveLimiter(initial=2, metrics=metrics, name="account")
+    with MockVoyagerServer(faults=FaultProfile(latency=("constant", 0.005))) as server:
+        run(server, limiter, tmp_path)
+
+    assert limiter.limit > 8
+    assert metrics.counter("concurrency_limit", account="account") == limiter.limit
+    assert "linkedin_api_concurrency_limit{account=\"account\"}" in metrics.render()
+
+
+def test_backs_off_when_throttled(tmp_path):
+    limiter = AdaptiveLimiter(initial=16)
+    with MockVoyagerServer(faults=FaultProfile(errors={429: 0.2}, seed=1)) as server:
+        run(server, limiter, tmp_path)
+
+    assert limiter.limit < 4
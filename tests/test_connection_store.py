@@ -0,0 +1,112 @@
+import pytest
+import requests
+
+from linkedin_api.connection_store import ConnectionStore, split_occupation
+
+
+class FakeLinkedin(object):
+    def __init__(self, connections, fail_after=None):
+        self.connections = connections
+        self.fail_after = fail_after
+        self.listed = 0
+
+    def iter_connections(self):
+        for connection in self.connections:
+            if self.listed == self.fail_after:
+                raise requests.HTTPError("429")
+            self.listed += 1
+            yield connection
+
+
+def make_connection(i, occupation):
+    return {
+        "urn_id": f"urn{i}",
+        "public_id": f"person-{i}",
+        "first_name": "First",
+        "last_name": f"Last{i}",
+        "occupation": occupation,
+        "created_at": 1000 + i,
+    }
+
+
+@pytest.fixture
+def store():
+    with ConnectionStore(":memory:") as store:
+        yield store
+
+
+def test_split_occupation():
+    assert split_occupation("Software Engineer at Acme Corp") == (
+        "Software Engineer",
+        "Acme Corp",
+    )
+    assert split_occupation("Founder") == ("Founder", None)
+    assert split_occupation(None) == (None, None)
+
+
+def test_sync_and_find(store):
+    api = FakeLinkedin(
+        [
+            make_connection(3, "Engineer at Acme Corp"),
+            make_connection(2, "Designer at Acme"),
+            make_connection(1, "Engineer at Initech"),
+        ]
+    )
+
+    assert store.sync(api) == 3
+    assert len(store) == 3
+    assert [c["urn_id"] for c in store.find(company="acme")] == ["urn3", "urn2"]
+    assert [c["urn_id"] for c in store.find(title="engineer", company="ini")] == ["urn1"]
+    assert store.get(public_id="person-2")["company"] == "Acme"
+    assert store.get(urn_id="missing") is None
+
+
+def test_incremental_sync_stops_at_known_connections(store):
+    store.sync(FakeLinkedin([make_connection(2, "A at B"), make_connection(1, "C at D")]))
+
+    api = FakeLinkedin(
+        [
+            make_connection(4, "E at F"),
+            make_connection(3, "G at H"),
+            make_connection(2, "A at B"),
+            make_connection(1, "C at D"),
+        ]
+    )
+    assert store.sync(api) == 2
+    assert api.listed == 3
+    assert len(store) == 4
+
+
+def test_full_sync_removes_missing_connections(store):
+    store.sync(FakeLinkedin([make_connection(2, "A at B"), make_connection(1, "C at D")]))
+
+    assert store.sync(FakeLinkedin([make_connection(2, "A at B")]), full=True) == 1
+    assert len(store) == 1
+    assert store.get(urn_id="urn1") is None
+
+
+def test_interrupted_full_sync_removes_nothing(store):
+    store.sync(FakeLinkedin([make_connection(2, "A at B"), make_connection(1, "C at D")]))
+
+    api = FakeLinkedin([make_connection(2, "A at B"), make_connection(1, "C at D")], fail_after=1)
+    with pytest.raises(requests.HTTPError):
+        store.sync(api, full=True)
+    assert store.sync(FakeLinkedin([]), full=True) == 0
+    assert len(store) == 2
+
+
+def test_sync_keeps_enriched_fields(store):
+    store.upsert(dict(make_connection(1, "Engineer at Acme"), title="CTO", company="Initech", location="Perth"))
+
+    store.sync(FakeLinkedin([make_connection(1, "Engineer at Acme")]), full=True)
+    stored = store.get(urn_id="urn1")
+    assert (stored["title"], stored["company"], stored["location"]) == ("CTO", "Initech", "Perth")
+    assert stored["occupation"] == "Engineer at Acme"
+
+
+def test_find_uses_indexes(store):
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM connections WHERE company >= ? AND company < ?",
+        ("acme", "acme\U0010ffff"),
+    ).fetchall()
+    assert "connections_company" in " ".join(str(tuple(row)) for row in plan)
@@ -0,0 +1,66 @@
+import io
+import itertools
+import json
+import os
+
+import pytest
+import requests
+
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+
+def api_for(server, tmp_path):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)))
+
+
+def test_export_to_sink(tmp_path):
+    sink = io.StringIO()
+    with MockVoyagerServer(connections=90) as server:
+        connections = list(api_for(server, tmp_path).iter_connections(sink=sink, page_size=40))
+
+    assert len(connections) == 90
+    assert connections[0]["urn_id"] == "ACoAA000000"
+    assert [json.loads(line) for line in sink.getvalue().splitlines()] == connections
+
+
+def test_export_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    with MockVoyagerServer(connections=90) as server:
+        api = api_for(server, tmp_path)
+        first = list(itertools.islice(api.iter_connections(checkpoint_path, page_size=40), 40))
+        assert os.path.exists(checkpoint_path)
+
+        rest = list(api.iter_connections(checkpoint_path, page_size=40))
+
+    assert [c["urn_id"] for c in first + rest] == [f"ACoAA{i:06d}" for i in range(90)]
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_export_resumes_from_the_page_it_stopped_in(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    with MockVoyagerServer(connections=90) as server:
+        api = api_for(server, tmp_path)
+        first = list(itertools.islice(api.iter_connections(checkpoint_path, page_size=40), 50))
+        assert len(first) == 50
+
+        rest = list(api.iter_connections(checkpoint_path, page_size=40))
+
+    assert [c["urn_id"] for c in first[:40] + rest] == [f"ACoAA{i:06d}" for i in range(90)]
+
+
+def test_throttled_export_keeps_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    with MockVoyagerServer(connections=90) as server:
+        api = api_for(server, tmp_path)
+        list(itertools.islice(api.iter_connections(checkpoint_path, page_size=40), 40))
+
+    with MockVoyagerServer(connections=90, faults=FaultProfile(errors={429: 1.0})) as server:
+        with pytest.raises(requests.HTTPError):
+            list(api_for(server, tmp_path).iter_connections(checkpoint_path, page_size=40))
+    with open(checkpoint_path) as f:
+        assert json.load(f) == {"start": 40}
+
+    with MockVoyagerServer(connections=90) as server:
+        assert len(list(api_for(server, tmp_path).iter_connections(checkpoint_path, page_size=40))) == 50
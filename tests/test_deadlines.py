@@ -0,0 +1,141 @@
+import time
+
+import pytest
+import requests
+
+from linkedin_api import deadlines
+from linkedin_api.client import Client, default_evade
+from linkedin_api.deadlines import DeadlineExceeded
+from linkedin_api.quota import QuotaExceeded, QuotaManager
+from linkedin_api.rate_limit import LocalRateLimiter
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+LATENCY = 0.2
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockVoyagerServer(faults=FaultProfile(latency=("constant", LATENCY))) as server:
+        yield server
+
+
+def api_for(server, tmp_path, **client_kwargs):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), **client_kwargs)
+
+
+class Elapsed(object):
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.monotonic() - self.started
+
+
+def test_nested_deadlines_only_shorten():
+    assert deadlines.remaining() is None
+    with deadlines.within(10):
+        with deadlines.within(60):
+            assert deadlines.remaining() <= 10
+        with deadlines.within(1):
+            assert deadlines.remaining() <= 1
+        assert 1 < deadlines.remaining() <= 10
+    assert deadlines.current() is None
+
+
+def test_endpoint_timeouts(server, tmp_path):
+    api = api_for(server, tmp_path, timeouts={"profiles": (1, LATENCY / 4)})
+    assert api.client.timeout_for(f"{server.base_url}/voyager/api/me") == (1, LATENCY / 4)
+    assert api.client.timeout_for(f"{server.base_url}/voyager/api/search/blended") == Client.TIMEOUTS["search"]
+    with pytest.raises(requests.ReadTimeout):
+        api.get_user_profile()
+    api.get_invitations()
+
+
+def test_timeouts_are_cut_to_the_deadline(server, tmp_path):
+    client = api_for(server, tmp_path).client
+    with deadlines.within(2):
+        connect, read = client.timeout_for(f"{server.base_url}/voyager/api/me")
+    assert 1.9 < read <= 2 and connect == read
+
+
+def test_authentication_has_timeouts(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(Client, "AUTH_BASE_URL", server.base_url)
+    client = api_for(server, tmp_path, timeout=(1, LATENCY / 4)).client
+    with pytest.raises(requests.ReadTimeout):
+        client.authenticate("user@example.com", "password", refresh=True)
+
+
+def test_deadline_covers_a_request(server, tmp_path):
+    api = api_for(server, tmp_path)
+    with Elapsed() as elapsed, pytest.raises(DeadlineExceeded):
+        api.get_user_profile(deadline=LATENCY / 2)
+    assert elapsed.seconds < LATENCY
+
+
+def test_deadline_covers_sub_requests(server, tmp_path):
+    api = api_for(server, tmp_path)
+    assert api.get_profile("person-1", deadline=LATENCY * 4)
+
+    # time for the profile, but not its skills
+    with Elapsed() as elapsed, pytest.raises(DeadlineExceeded):
+        api.get_profile("person-1", deadline=LATENCY * 1.5)
+    assert elapsed.seconds < LATENCY * 2
+
+
+def test_deadline_covers_pacing(server, tmp_path):
+    api = api_for(server, tmp_path, evade=lambda: time.sleep(LATENCY))
+    with pytest.raises(DeadlineExceeded):
+        api.get_user_profile(deadline=LATENCY / 2)
+
+    with Elapsed() as elapsed, deadlines.within(1), pytest.raises(DeadlineExceeded):
+        # sleeps 2 to 10 seconds
+        default_evade()
+    assert elapsed.seconds < 0.1
+
+
+def test_deadline_covers_quota_and_rate_limit_waits(server, tmp_path):
+    quota = QuotaManager(limits={"*": ((1, 60),)})
+    api = api_for(server, tmp_path, quota=quota)
+    api.get_user_profile()
+    with Elapsed() as elapsed, pytest.raises(DeadlineExceeded):
+        api.get_user_profile(deadline=1)
+    assert elapsed.seconds < 0.1
+    # a shorter scheduled timeout is the quota's own
+    with quota.scheduled(timeout=0.1), pytest.raises(QuotaExceeded):
+        api.get_user_profile(deadline=1)
+
+    api = api_for(server, tmp_path, rate_limiter=LocalRateLimiter(rate=0.1))
+    api.get_user_profile()
+    with Elapsed() as elapsed, pytest.raises(DeadlineExceeded):
+        api.get_user_profile(deadline=1)
+    assert elapsed.seconds < 0.1
+
+
+def test_deadline_covers_retries(tmp_path):
+    with MockVoyagerServer(faults=FaultProfile(errors={503: 1.0})) as server:
+        api = api_for(server, tmp_path, retries=5, retry_backoff=1)
+        with Elapsed() as elapsed, pytest.raises(DeadlineExceeded):
+            api.get_user_profile(deadline=0.5)
+    assert elapsed.seconds < 0.5
+
+
+def test_generators(server, tmp_path):
+    api = api_for(server, tmp_path)
+    with pytest.raises(DeadlineExceeded):
+        list(api.iter_invitations(page_size=25, deadline=LATENCY * 1.5))
+
+
+def test_batches_stop_at_the_deadline(server, tmp_path):
+    api = api_for(server, tmp_path)
+    invitations = api.get_invitations(limit=20)
+    assert len(invitations) == 20
+
+    with Elapsed() as elapsed:
+        results = api.reply_invitations(
+            ((invitation, "accept") for invitation in invitations), concurrency=2, deadline=LATENCY * 2.5
+        )
+    assert elapsed.seconds < LATENCY * 4
+    assert 0 < sum(results.values()) < len(invitations)
@@ -0,0 +1,68 @@
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from linkedin_api.export import ProfileWriter, write_people
+
+PROFILE = {
+    "profile_id": "ACoAAB",
+    "firstName": "Tom",
+    "lastName": "Quirk",
+    "headline": "Engineer",
+    "locationName": "Brisbane",
+    "experience": [
+        {
+            "title": "Engineer",
+            "companyName": "Acme",
+            "timePeriod": {"startDate": {"year": 2018, "month": 2}},
+        },
+        {"title": "Intern", "companyName": "Initech"},
+    ],
+    "education": [{"schoolName": "UQ", "timePeriod": {"endDate": {"year": 2017}}}],
+    "skills": [{"name": "Python"}, {"name": "SQL"}],
+}
+
+
+def test_write_people_in_batches(tmp_path):
+    people = (
+        {"urn_id": f"urn:li:fs_miniProfile:{i}", "first_name": "A", "occupation": "B at C"}
+        for i in range(25)
+    )
+    path = str(tmp_path / "people.parquet")
+
+    assert write_people(path, people, batch_size=10) == 25
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("urn_id").to_pylist()[:2] == ["0", "1"]
+    assert table.column("headline").to_pylist()[0] == "B at C"
+
+
+def test_profile_writer(tmp_path):
+    with ProfileWriter(str(tmp_path)) as writer:
+        writer.write_profile(PROFILE)
+        writer.write_person({"urn_id": "x", "first_name": "Jane"})
+
+    people = pq.read_table(str(tmp_path / "people")).to_pylist()
+    assert [(p["urn_id"], p["first_name"]) for p in people] == [("ACoAAB", "Tom"), ("x", "Jane")]
+
+    experience = pq.read_table(str(tmp_path / "experience")).to_pylist()
+    assert [(e["company_name"], e["start_year"]) for e in experience] == [
+        ("Acme", 2018),
+        ("Initech", None),
+    ]
+    assert pq.read_table(str(tmp_path / "education")).column("end_year").to_pylist() == [2017]
+    assert pq.read_table(str(tmp_path / "skills")).column("name").to_pylist() == ["Python", "SQL"]
+
+
+def test_flushed_parts_can_be_read(tmp_path):
+    writer = ProfileWriter(str(tmp_path))
+    writer.write_profile(PROFILE)
+    writer.flush()
+    writer.write_person({"urn_id": "x", "first_name": "Jane"})
+
+    # the part being written is skipped until it is closed
+    assert pq.read_table(str(tmp_path / "people")).column("urn_id").to_pylist() == ["ACoAAB"]
+    writer.close()
+    assert sorted(pq.read_table(str(tmp_path / "people")).column("urn_id").to_pylist()) == ["ACoAAB", "x"]
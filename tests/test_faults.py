@@ -0,0 +1,122 @@
+import time
+
+import pytest
+import requests
+import urllib3
+from requests.adapters import BaseAdapter
+from urllib3.exceptions import NewConnectionError
+
+from linkedin_api.client import Client
+from linkedin_api.session_store import SessionStore
+from linkedin_api.transport import make_response
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+
+def serve(faults):
+    return MockVoyagerServer(faults=faults)
+
+
+def api_for(server, tmp_path, **client_kwargs):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), **client_kwargs)
+
+
+def stats(server):
+    return requests.get(f"{server.base_url}/__mock/stats").json()
+
+
+def test_throttled_requests_fail_without_retries(tmp_path):
+    with serve(FaultProfile(errors={429: 1.0})) as server:
+        res = api_for(server, tmp_path).client.request("GET", f"{server.base_url}/voyager/api/me")
+        assert res.status_code == 429
+        assert stats(server)["requests"] == 1
+
+
+def test_retries_until_success(tmp_path):
+    with serve(FaultProfile(errors={503: 0.3, 999: 0.1}, seed=1)) as server:
+        api = api_for(server, tmp_path, retries=10, retry_backoff=0.001)
+        for i in range(10):
+            assert api.get_profile(f"person-{i}")["profile_id"]
+
+        server_stats = stats(server)
+        assert server_stats["requests"] > 20
+        assert server_stats["statuses"]["200"] == 20
+
+
+def test_retry_after_is_honoured(tmp_path):
+    with serve(FaultProfile(rate_limit=(1, 1), retry_after=1)) as server:
+        api = api_for(server, tmp_path, retries=1, retry_backoff=0)
+        api.get_user_profile()
+        started = time.perf_counter()
+        api.get_user_profile()
+        assert time.perf_counter() - started >= 1
+        assert stats(server)["statuses"] == {"200": 2, "429": 1}
+
+
+def test_truncated_json(tmp_path):
+    with serve(FaultProfile(errors={"truncated": 1.0})) as server:
+        with pytest.raises(ValueError):
+            api_for(server, tmp_path).get_user_profile()
+
+
+def test_latency(tmp_path):
+    with serve(FaultProfile(latency=("constant", 0.05))) as server:
+        started = time.perf_counter()
+        api_for(server, tmp_path).get_user_profile()
+        assert time.perf_counter() - started >= 0.05
+
+
+def test_retry_delay_backs_off(tmp_path):
+    client = Client(evade=lambda: None, session_store=SessionStore(str(tmp_path)), retry_backoff=1.0)
+    assert 0.5 <= client.retry_delay(0) <= 1
+    assert 2 <= client.retry_delay(2) <= 4
+    assert client.retry_delay(20) == Client.RETRY_MAX_DELAY
+
+
+class FailingAdapter(BaseAdapter):
+    """
+    Raises [error] for the first request, then answers 200.
+    """
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        if self.sent == 1:
+            raise self.error
+        return make_response(request, 200, b"{}")
+
+    def close(self):
+        pass
+
+
+RESET = requests.ConnectionError(ConnectionResetError("reset by peer"))
+REFUSED = requests.ConnectionError(
+    urllib3.exceptions.MaxRetryError(None, "/", NewConnectionError(None, "refused"))
+)
+
+
+@pytest.mark.parametrize(
+    "method, error, sent",
+    [
+        ("GET", RESET, 2),
+        ("POST", RESET, 1),
+        ("POST", REFUSED, 2),
+        ("POST", requests.ConnectTimeout("timed out"), 2),
+    ],
+)
+def test_connection_errors_are_retried_unless_the_request_may_have_been_handled(tmp_path, method, error, sent):
+    adapter = FailingAdapter(error)
+    client = Client(
+        evade=lambda: None, session_store=SessionStore(str(tmp_path)), transport=adapter, retries=1, retry_backoff=0
+    )
+    url = f"{Client.API_BASE_URL}/messaging/conversations"
+    if sent == 1:
+        with pytest.raises(requests.ConnectionError):
+            client.request(method, url)
+    else:
+        assert client.request(method, url).status_code == 200
+    assert adapter.sent == sent
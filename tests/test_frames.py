@@ -0,0 +1,81 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from linkedin_api.export import person_row
+from linkedin_api.frames import (
+    company_counts,
+    experience_frame,
+    people_columns,
+    people_frame,
+    skill_frequency,
+    skills_frame,
+)
+
+
+def test_people_columns():
+    columns = people_columns(
+        [
+            {"urn_id": "1", "first_name": "A", "location": "Brisbane"},
+            {"urn_id": "urn:li:fs_miniProfile:2", "first_name": "B", "occupation": "Engineer at Acme"},
+            {"profile_id": "3", "firstName": "C", "locationName": "Sydney"},
+            {"firstName": "D", "headline": "Designer"},
+        ]
+    )
+
+    assert columns["urn_id"] == ["1", "2", "3", None]
+    assert columns["first_name"] == ["A", "B", "C", "D"]
+    assert columns["headline"] == [None, "Engineer at Acme", None, "Designer"]
+    assert columns["location"] == ["Brisbane", None, "Sydney", None]
+    assert columns["network_depth"] == [None] * 4
+
+
+def test_people_columns_match_export_rows():
+    people = [
+        {"urn_id": "urn:li:fs_miniProfile:1", "occupation": "Engineer", "network_depth": "F"},
+        {"profile_id": "2", "firstName": "B", "industryName": "Software"},
+    ]
+    columns = people_columns(people)
+
+    for i, person in enumerate(people):
+        row = person_row(person)
+        assert {name: values[i] for name, values in columns.items()} == {
+            name: row.get(name) for name in columns
+        }
+
+
+def test_people_frame_is_categorical():
+    frame = people_frame([{"urn_id": "1", "location": "Brisbane"}, {"urn_id": "2", "location": "Brisbane"}])
+
+    assert frame["location"].dtype == "category"
+    assert list(frame["location"].cat.categories) == ["Brisbane"]
+
+
+def test_skill_frequency():
+    skills = skills_frame(
+        [
+            ("1", [{"name": "Python"}, {"name": "SQL"}]),
+            ("2", [{"name": "Python"}]),
+        ]
+    )
+
+    assert skills["skill"].dtype == "category"
+    assert skill_frequency(skills).to_dict() == {"Python": 2, "SQL": 1}
+
+
+def test_company_counts():
+    experience = experience_frame(
+        [
+            {
+                "profile_id": "1",
+                "experience": [
+                    {"companyName": "Acme"},
+                    {"companyName": "Initech", "timePeriod": {"endDate": {"year": 2015}}},
+                ],
+            },
+            {"profile_id": "2", "experience": [{"companyName": "Acme"}]},
+        ]
+    )
+
+    assert company_counts(experience).to_dict() == {"Acme": 2}
+    assert company_counts(experience, current_only=False).to_dict() == {"Acme": 2, "Initech": 1}
@@ -0,0 +1,164 @@
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from requests.cookies import RequestsCookieJar, extract_cookies_to_jar
+
+from linkedin_api.deadlines import DeadlineExceeded
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+httpx = pytest.importorskip("httpx")
+h2 = pytest.importorskip("h2")
+
+import h2.connection  # noqa: E402
+import h2.errors  # noqa: E402
+import h2.events  # noqa: E402
+
+from linkedin_api.http2 import HTTP2Transport  # noqa: E402
+
+
+def api_for(server, tmp_path, **client_kwargs):
+    return mock_linkedin(
+        server.base_url,
+        session_store=SessionStore(str(tmp_path)),
+        transport=HTTP2Transport(http1=False),
+        **client_kwargs,
+    )
+
+
+def stats(server):
+    return requests.get(f"{server.base_url}/__mock/stats").json()
+
+
+def test_requests_are_multiplexed(tmp_path):
+    with MockVoyagerServer(faults=FaultProfile(latency=("constant", 0.01))) as server:
+        api = api_for(server, tmp_path)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            profiles = list(executor.map(lambda i: api.get_profile(f"person-{i}"), range(32)))
+
+        assert [profile["firstName"] for profile in profiles] == [f"First{i}" for i in range(32)]
+        # and the stats request
+        assert stats(server)["connections"] == 2
+
+        res = api.client.request("GET", f"{server.base_url}/voyager/api/me")
+        assert res.raw.version == 20
+        assert res.json()["miniProfile"]
+
+
+def test_many_threads_share_a_connection(tmp_path):
+    # threads switching often would open streams out of order, and corrupt the connection
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        with MockVoyagerServer() as server:
+            api = api_for(server, tmp_path)
+            url = f"{server.base_url}/voyager/api/me"
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                statuses = list(
+                    executor.map(lambda i: api.client.request("GET", url).status_code, range(500))
+                )
+
+            assert statuses == [200] * 500
+            assert stats(server)["connections"] == 2
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_streams_opened_out_of_order_close_the_connection():
+    headers = [
+        (":method", "GET"),
+        (":scheme", "http"),
+        (":authority", "localhost"),
+        (":path", "/voyager/api/me"),
+    ]
+    streams = []
+    for stream_id in (3, 1):
+        conn = h2.connection.H2Connection()
+        conn.initiate_connection()
+        preface = conn.data_to_send()
+        conn.send_headers(stream_id, headers, end_stream=True)
+        streams.append(conn.data_to_send())
+
+    with MockVoyagerServer() as server, socket.create_connection((server.host, server.port)) as sock:
+        sock.sendall(preface + streams[0] + streams[1])
+        events = []
+        while True:
+            data = sock.recv(65535)
+            if not data:
+                break
+            events += conn.receive_data(data)
+
+    terminated = [event for event in events if isinstance(event, h2.events.ConnectionTerminated)]
+    assert terminated[0].error_code == h2.errors.ErrorCodes.PROTOCOL_ERROR
+
+
+def test_posts(tmp_path):
+    with MockVoyagerServer() as server:
+        api = api_for(server, tmp_path)
+        assert api.send_message(message_body="hello", recipients=["ACoAA000001"]) is False
+
+
+def test_timeouts(tmp_path):
+    with MockVoyagerServer(faults=FaultProfile(latency=("constant", 0.5))) as server:
+        api = api_for(server, tmp_path, timeout=(1, 0.1))
+        with pytest.raises(requests.ReadTimeout):
+            api.get_user_profile()
+        with pytest.raises(DeadlineExceeded):
+            api.get_user_profile(deadline=0.1)
+
+
+def test_connection_errors(tmp_path):
+    api = mock_linkedin(
+        "http://127.0.0.1:1",
+        session_store=SessionStore(str(tmp_path)),
+        transport=HTTP2Transport(http1=False),
+    )
+    with pytest.raises(requests.ConnectionError):
+        api.get_user_profile()
+
+
+def test_proxies(tmp_path, monkeypatch):
+    # the mock server answers absolute-form requests itself, as a proxy forwarding them would
+    with MockVoyagerServer() as server, MockVoyagerServer() as proxy:
+        transport = HTTP2Transport()
+        url = f"{server.base_url}/voyager/api/me"
+        api = mock_linkedin(
+            server.base_url,
+            session_store=SessionStore(str(tmp_path)),
+            transport=transport,
+            proxies={"http": proxy.base_url},
+        )
+        assert api.get_user_profile()
+
+        with monkeypatch.context() as env, requests.Session() as session:
+            env.delenv("NO_PROXY", raising=False)
+            env.delenv("no_proxy", raising=False)
+            env.setenv("HTTP_PROXY", proxy.base_url)
+            session.mount("http://", transport)
+            assert session.get(url).status_code == 200
+
+            # and the transport's own proxy only for requests without one
+            session.trust_env = False
+            assert session.get(url).status_code == 200
+            session.mount("http://", HTTP2Transport(proxy=proxy.base_url))
+            assert session.get(url).status_code == 200
+
+        assert stats(server)["requests"] == 1
+        assert stats(proxy)["requests"] == 3
+
+
+def test_cookies_are_kept():
+    request = requests.Request("GET", "https://www.linkedin.com/voyager/api/me").prepare()
+    response = httpx.Response(
+        200, headers=[("set-cookie", "lidc=1; Path=/"), ("set-cookie", "bcookie=2; Path=/")], content=b"{}"
+    )
+    res = HTTP2Transport().build_response(request, response)
+
+    jar = RequestsCookieJar()
+    extract_cookies_to_jar(jar, request, res.raw)
+    assert jar.get_dict() == {"lidc": "1", "bcookie": "2"}
+    assert res.json() == {}
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+
+@pytest.fixture
+def server():
+    with MockVoyagerServer(invitations=10, sent_invitations=250) as server:
+        yield server
+
+
+@pytest.fixture
+def api(server, tmp_path):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)))
+
+
+def requests_sent(server):
+    return requests.get(f"{server.base_url}/__mock/stats").json()["requests"]
+
+
+def test_sent_invitations_are_indexed_by_member(api):
+    index = api.refresh_sent_invitations()
+    assert len(index) == 250
+    assert index["ACoAA000001"] == "urn:li:fs_relInvitation:7001"
+
+
+def test_refresh_stops_at_known_invitations(server, api):
+    api.refresh_sent_invitations()
+    sent = requests_sent(server)
+    api.refresh_sent_invitations()
+    assert requests_sent(server) - sent == 1
+
+    api.refresh_sent_invitations(full=True)
+    assert requests_sent(server) - sent == 4
+
+
+def test_withdraw_invitations(server, api):
+    results = api.withdraw_invitations(["ACoAA000001", "ACoAA000002", "ACoAA999999"])
+    assert results == {"ACoAA000001": True, "ACoAA000002": True, "ACoAA999999": False}
+
+    # the index is looked up, not refreshed, for invitations already in it
+    sent = requests_sent(server)
+    assert api.get_invitation_entity_urn("ACoAA000003") == "urn:li:fs_relInvitation:7003"
+    assert requests_sent(server) == sent
+
+
+def test_throttled_pages_are_raised(tmp_path):
+    with MockVoyagerServer(faults=FaultProfile(errors={429: 1.0})) as server:
+        api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)))
+        assert api.get_invitations() == []
+        with pytest.raises(requests.HTTPError):
+            list(api.iter_invitations())
+
+
+def test_throttled_sent_invitation_pages_are_raised(tmp_path):
+    with MockVoyagerServer(sent_invitations=10, faults=FaultProfile(errors={429: 1.0})) as server:
+        api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)))
+        with pytest.raises(requests.HTTPError):
+            api.get_invitation_entity_urn("ACoAA000001")
+        with pytest.raises(requests.HTTPError):
+            api.withdraw_invitations(["ACoAA000001"])
+
+
+def test_reply_invitations(api):
+    invitations = list(api.iter_invitations(page_size=3))
+    assert len(invitations) == 10
+
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def reply_invitation(entity_urn, shared_secret, action="accept"):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        try:
+            time.sleep(0.02)
+            if entity_urn.endswith("6003"):
+                raise requests.ConnectionError("reset")
+            return action == "accept"
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    api.reply_invitation = reply_invitation
+    decisions = [(invitation, "ignore" if i == 5 else "accept") for i, invitation in enumerate(invitations)]
+    results = api.reply_invitations(decisions, concurrency=3)
+
+    assert in_flight[1] == 3
+    assert results == {
+        invitation["entityUrn"]: i not in (3, 5) for i, invitation in enumerate(invitations)
+    }
@@ -0,0 +1,106 @@
+import pytest
+import requests
+
+from linkedin_api.metrics import Metrics, endpoint_template, serve
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockVoyagerServer() as server:
+        yield server
+
+
+@pytest.fixture
+def metrics():
+    return Metrics()
+
+
+@pytest.fixture
+def api(server, metrics, tmp_path):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), metrics=metrics)
+
+
+@pytest.mark.parametrize(
+    "path,template",
+    [
+        ("/voyager/api/identity/profiles/tom-quirk/profileView", "/voyager/api/identity/profiles/{id}/profileView"),
+        ("/voyager/api/messaging/conversations/2-abc/events", "/voyager/api/messaging/conversations/{id}/events"),
+        ("/voyager/api/relationships/invitations/6001", "/voyager/api/relationships/invitations/{id}"),
+        ("/voyager/api/relationships/sentInvitationViewsV2", "/voyager/api/relationships/sentInvitationViewsV2"),
+        ("/voyager/api/me/", "/voyager/api/me"),
+    ],
+)
+def test_endpoint_template(path, template):
+    assert endpoint_template(path) == template
+
+
+def test_requests_are_counted_by_endpoint(api, metrics):
+    api.get_profile("person-1")
+    api.get_profile("person-2")
+
+    endpoint = "/voyager/api/identity/profiles/{id}/profileView"
+    assert metrics.counter("requests_total", endpoint=endpoint, method="GET", status="200") == 2
+    assert metrics.histogram("request_duration_seconds", endpoint=endpoint, method="GET")["count"] == 2
+    assert metrics.histogram("response_bytes", endpoint=endpoint)["sum"] > 0
+    assert metrics.histogram("decode_duration_seconds", endpoint=endpoint)["count"] == 2
+    assert metrics.histogram("pacing_wait_seconds")["count"] == 4
+
+
+def test_sent_invitations_cache(api, metrics):
+    api.get_invitation_entity_urn("ACoAA000001")
+    api.get_invitation_entity_urn("ACoAA000001")
+    assert metrics.counter("cache_requests_total", cache="sent_invitations", result="miss") == 1
+    assert metrics.counter("cache_requests_total", cache="sent_invitations", result="hit") == 1
+
+
+def test_failed_requests_are_counted(metrics, tmp_path):
+    api = mock_linkedin("http://127.0.0.1:1", session_store=SessionStore(str(tmp_path)), metrics=metrics)
+    with pytest.raises(requests.ConnectionError):
+        api.get_user_profile()
+    assert metrics.counter("request_errors_total", endpoint="/voyager/api/me", method="GET") == 1
+
+
+def test_statuses_are_labelled(metrics, tmp_path):
+    with MockVoyagerServer(faults=FaultProfile(errors={429: 1.0})) as server:
+        api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), metrics=metrics)
+        api.get_invitations()
+    endpoint = "/voyager/api/relationships/invitationViews"
+    assert metrics.counter("requests_total", endpoint=endpoint, method="GET", status="429") == 1
+
+
+def test_prometheus_export(api, metrics):
+    api.get_user_profile()
+    exporter = serve(metrics, port=0)
+    try:
+        text = requests.get(f"http://127.0.0.1:{exporter.server_port}/metrics").text
+    finally:
+        exporter.shutdown()
+
+    assert "# TYPE linkedin_api_requests_total counter" in text
+    assert 'linkedin_api_requests_total{endpoint="/voyager/api/me",method="GET",status="200"} 1' in text
+    assert 'linkedin_api_request_duration_seconds_bucket{endpoint="/voyager/api/me",method="GET",le="+Inf"} 1' in text
+    assert "linkedin_api_pacing_wait_seconds_count 1" in text
+
+
+def test_spans(server, tmp_path):
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    export = pytest.importorskip("opentelemetry.sdk.trace.export")
+    in_memory = pytest.importorskip("opentelemetry.sdk.trace.export.in_memory_span_exporter")
+
+    exporter = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+
+    metrics = Metrics(tracer=provider.get_tracer("test"))
+    api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), metrics=metrics)
+    api.get_profile("person-1")
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == [
+        "GET /voyager/api/identity/profiles/{id}/profileView",
+        "GET /voyager/api/identity/profiles/{id}/skills",
+    ]
+    assert spans[0].attributes["http.response.status_code"] == 200
@@ -0,0 +1,45 @@
+import pytest
+
+from linkedin_api.session_store import SessionStore
+
+from mock_server import MockVoyagerServer, mock_linkedin
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockVoyagerServer(people=120, connections=90, invitations=7, sent_invitations=130) as server:
+        yield server
+
+
+@pytest.fixture
+def api(server, tmp_path):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)))
+
+
+def test_search_people(api):
+    total, people = api.search_people(keywords="python", limit=10, start=0)
+    assert total == 120
+    assert [person["public_id"] for person in people[:2]] == ["person-0", "person-1"]
+
+
+def test_get_profile(api):
+    profile = api.get_profile("person-7")
+    assert profile["profile_id"] == "ACoAA000007"
+    assert len(profile["experience"]) == 5
+    assert len(profile["skills"]) == 20
+
+
+def test_get_conversation_id(api):
+    assert api.get_conversation_id("person-19") == "2-19"
+    assert api.get_conversation_id("nobody") is None
+
+
+def test_pagination_helpers(api):
+    assert len(list(api.iter_connections())) == 90
+    assert len(list(api.iter_invitations(page_size=3))) == 7
+    assert len(api.refresh_sent_invitations(full=True)) == 130
+
+
+def test_sales_people_search(api):
+    leads = list(api.sales_navigator().iter_sales_people_search("python"))
+    assert len(leads) == 120
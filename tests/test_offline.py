@@ -0,0 +1,121 @@
+"""
+Linkedin and Sales Navigator methods, replayed from the cassettes in tests/cassettes
+"""
+import os
+
+import pytest
+
+from linkedin_api.client import Client
+from linkedin_api.linkedin import Linkedin
+from linkedin_api.session_store import SessionStore
+from linkedin_api.transport import Cassette, ReplayTransport
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+
+
+def replay_api(tmp_path, cassette):
+    transport = ReplayTransport(Cassette.load(os.path.join(CASSETTE_DIR, cassette)), latency=0)
+    client = Client(evade=lambda: None, session_store=SessionStore(str(tmp_path)), transport=transport)
+    return Linkedin(None, None, client=client)
+
+
+@pytest.fixture
+def api(tmp_path):
+    return replay_api(tmp_path, "linkedin.json")
+
+
+@pytest.fixture
+def sales(tmp_path):
+    return replay_api(tmp_path, "sales_navigator.json").sales_navigator()
+
+
+def test_get_current_profile(api):
+    profile = api.get_current_profile()
+    assert profile["publicIdentifier"] == "reedhoffman"
+    assert profile["message_id"] == "ACoAA0"
+    assert profile["avatarUrl"] is None
+
+
+def test_get_user_profile(api):
+    assert api.get_user_profile()["miniProfile"]["publicIdentifier"] == "reedhoffman"
+
+
+def test_search_people(api):
+    total, people = api.search_people(keywords="python", limit=2)
+    assert total == 2
+    assert [person["public_id"] for person in people] == ["tom-quirk", "jane-doe"]
+    assert people[0]["urn_id"] == "ACoAA1"
+    assert people[0]["location"] == "Brisbane, Australia"
+
+
+def test_get_profile(api):
+    profile = api.get_profile("tom-quirk")
+    assert profile["summary"][0] == "👋"
+    assert profile["profile_id"] == "ACoAA1"
+    assert profile["experience"][0]["companyName"] == "Acme"
+    assert [skill["name"] for skill in profile["skills"]] == ["Python", "Django"]
+    assert profile["education"][0]["schoolName"] == "The University of Queensland"
+
+
+def test_get_profile_contact_info(api):
+    contact_info = api.get_profile_contact_info("tom-quirk")
+    assert contact_info["email_address"] == "tom@example.com"
+    assert contact_info["websites"] == [{"url": "https://example.com", "label": "PERSONAL"}]
+
+
+def test_get_profile_and_company_updates(api):
+    assert len(api.get_profile_updates("tom-quirk", results=[])) == 2
+    assert len(api.get_company_updates("linkedin", results=[])) == 2
+
+
+def test_get_company_and_school(api):
+    assert api.get_company("linkedin")["universalName"] == "linkedin"
+    assert api.get_school("uq")["universalName"] == "uq"
+
+
+def test_get_current_profile_views(api):
+    assert api.get_current_profile_views() == 42
+
+
+def test_conversations(api):
+    assert api.get_conversations()["elements"]
+    assert api.get_conversation("2-abc")["elements"]
+    assert api.get_conversation_details("ACoAA1")["id"] == "2-abc"
+    assert not api.send_message(conversation_urn_id="2-abc", message_body="hello")
+    assert not api.mark_conversation_as_seen("2-abc")
+
+
+def test_iter_connections(api):
+    connections = list(api.iter_connections(page_size=2))
+    assert [connection["public_id"] for connection in connections] == ["tom-quirk", "jane-doe"]
+    assert connections[0]["created_at"] == 1600000000000
+
+
+def test_invitations(api):
+    (invitation,) = api.get_invitations()
+    assert api.reply_invitation(invitation["entityUrn"], invitation["sharedSecret"])
+
+
+def test_connection_requests(api):
+    assert api.add_connection("ACoAA2") == 201
+    assert not api.remove_connection("jane-doe")
+    assert api.withdraw_invitations(["ACoAA3"]) == {"ACoAA3": True}
+
+
+def test_get_typehead(api):
+    assert api.get_typehead(keywords="acme", type="COMPANY")[0]["objectUrn"] == "urn:li:company:1"
+
+
+def test_sales_get_user_profile(sales):
+    assert sales.get_user_profile()["miniProfile"]["publicIdentifier"] == "reedhoffman"
+
+
+def test_sales_people_search(sales):
+    leads = list(sales.iter_sales_people_search("python"))
+    assert [lead["fullName"] for lead in leads] == ["Tom Quirk", "Jane Doe"]
+    assert "description" not in leads[0]["currentPositions"][0]
+
+
+def test_sales_invitations(sales):
+    (invitation,) = sales.get_invitations()
+    assert sales.reply_invitation(invitation["entityUrn"], invitation["sharedSecret"])
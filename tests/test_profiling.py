@@ -0,0 +1,104 @@
+import json
+import time
+
+import pytest
+
+from linkedin_api.profiling import PHASES, Profiler
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerServer, mock_linkedin
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockVoyagerServer(faults=FaultProfile(latency=("constant", 0.02))) as server:
+        yield server
+
+
+@pytest.fixture
+def profiler():
+    return Profiler()
+
+
+@pytest.fixture
+def api(server, profiler, tmp_path):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)), profiler=profiler)
+
+
+def rows(profiler):
+    return {row["method"]: row for row in profiler.summary()}
+
+
+def test_phases_add_up(api, profiler):
+    api.get_profile("person-1")
+
+    summary = rows(profiler)
+    profile, skills = summary["get_profile"], summary["get_profile_skills"]
+    assert profile["calls"] == skills["calls"] == 1
+    # the server's latency is time to first byte
+    assert profile["ttfb"] >= 0.02
+    assert profile["connect"] > 0
+    assert profile["decode"] > 0
+    assert profile["sub_requests"] == pytest.approx(skills["total"])
+    assert sum(profile[phase] for phase in PHASES) == pytest.approx(profile["total"])
+
+
+def test_pacing_is_a_phase(server, profiler, tmp_path):
+    api = mock_linkedin(
+        server.base_url,
+        session_store=SessionStore(str(tmp_path)),
+        profiler=profiler,
+        evade=lambda: time.sleep(0.05),
+    )
+    api.get_user_profile()
+    assert rows(profiler)["get_user_profile"]["wait"] >= 0.05
+
+
+def test_generators_exclude_the_callers_time(api, profiler):
+    for _ in api.iter_invitations(page_size=25):
+        time.sleep(0.01)
+
+    invitations = rows(profiler)["iter_invitations"]
+    assert invitations["calls"] == 1
+    # three pages, each taking the server's latency
+    assert invitations["ttfb"] >= 0.02 * 3
+    assert invitations["total"] < 0.01 * 50
+
+
+def test_sales_navigator_methods_are_prefixed(api, profiler):
+    api.sales_navigator().get_user_profile()
+    assert "sales_navigator.get_user_profile" in rows(profiler)
+
+
+def test_chrome_trace(api, profiler, tmp_path):
+    api.get_profile("person-1")
+    path = tmp_path / "trace.json"
+    profiler.save_chrome_trace(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    calls = [event["name"] for event in events if event["cat"] == "call"]
+    assert calls == ["get_profile", "get_profile_skills"]
+    profile = events[0]
+    for event in events[1:]:
+        assert profile["ts"] <= event["ts"]
+        assert event["ts"] + event["dur"] <= profile["ts"] + profile["dur"] + 1
+
+
+def test_folded_stacks(api, profiler):
+    api.get_profile("person-1")
+    stacks = dict(line.rsplit(" ", 1) for line in profiler.folded().splitlines())
+    assert int(stacks["get_profile;ttfb"]) >= 20000
+    assert int(stacks["get_profile;get_profile_skills;ttfb"]) >= 20000
+    assert not any(stack.endswith("sub_requests") for stack in stacks)
+
+
+def test_report(api, profiler):
+    api.get_user_profile()
+    lines = profiler.report().splitlines()
+    assert lines[0].split()[:3] == ["method", "calls", "mean"]
+    assert lines[2].startswith("get_user_profile")
+
+
+def test_unprofiled_methods_are_untouched(server, tmp_path):
+    api = mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path)))
+    assert "get_profile" not in vars(api)
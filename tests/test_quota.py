@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+
+from linkedin_api.quota import (
+    BACKGROUND,
+    INTERACTIVE,
+    NORMAL,
+    QuotaExceeded,
+    QuotaManager,
+    endpoint_family,
+)
+from linkedin_api.session_pool import SessionPool
+from linkedin_api.session_store import SessionStore
+
+from mock_server import MockVoyagerServer, mock_linkedin
+
+API = "https://www.linkedin.com/voyager/api"
+SEARCH = f"{API}/search/blended?q=all"
+PROFILE = f"{API}/identity/profiles/tom-quirk/profileView"
+
+EQUAL_SHARES = {INTERACTIVE: 1.0, NORMAL: 1.0, BACKGROUND: 1.0}
+
+
+@pytest.mark.parametrize(
+    "url,family",
+    [
+        (SEARCH, "search"),
+        (PROFILE, "profiles"),
+        (f"{API}/me", "profiles"),
+        (f"{API}/messaging/conversations/2-abc/events", "messaging"),
+        (f"{API}/relationships/sentInvitationViewsV2", "invitations"),
+        (f"{API}/relationships/connections", "connections"),
+        (f"{API}/organization/companies?q=universalName", "companies"),
+        ("https://www.linkedin.com/sales-api/salesApiPeopleSearch?q=peopleSearchQuery", "search"),
+        (f"{API}/feed/updates", "other"),
+    ],
+)
+def test_endpoint_family(url, family):
+    assert endpoint_family(url) == family
+
+
+def test_windows_roll():
+    quota = QuotaManager(limits={"search": ((3, 0.3),)}, shares=EQUAL_SHARES)
+    for _ in range(3):
+        quota.acquire("account", SEARCH)
+    assert quota.usage("account", "search") == 3
+    # other families have their own budget
+    quota.acquire("account", PROFILE)
+    assert quota.usage("account") == 4
+
+    started = time.monotonic()
+    quota.acquire("account", SEARCH)
+    assert time.monotonic() - started >= 0.25
+
+
+def test_accounts_have_their_own_budget():
+    quota = QuotaManager(limits={"search": ((1, 60),)})
+    quota.acquire("first", SEARCH)
+    quota.acquire("second", SEARCH)
+    assert quota.remaining("first", "search") == 0
+
+
+def test_every_family_together():
+    quota = QuotaManager(limits={"*": ((2, 60),)}, shares=EQUAL_SHARES)
+    quota.acquire("account", SEARCH)
+    quota.acquire("account", PROFILE)
+    with pytest.raises(QuotaExceeded):
+        quota.acquire("account", f"{API}/me", deadline=time.monotonic() + 1)
+
+
+def test_deadlines_fail_fast():
+    quota = QuotaManager(limits={"search": ((1, 60),)})
+    quota.acquire("account", SEARCH)
+
+    started = time.monotonic()
+    with quota.scheduled(INTERACTIVE, timeout=5):
+        with pytest.raises(QuotaExceeded):
+            quota.acquire("account", SEARCH)
+    assert time.monotonic() - started < 1
+
+
+def test_lower_classes_keep_budget_for_higher_ones():
+    quota = QuotaManager(limits={"search": ((10, 60),)})
+    with quota.scheduled(BACKGROUND, timeout=0.1):
+        for _ in range(7):
+            quota.acquire("account", SEARCH)
+        with pytest.raises(QuotaExceeded):
+            quota.acquire("account", SEARCH)
+
+    assert quota.remaining("account", "search", BACKGROUND) == 0
+    assert quota.remaining("account", "search", INTERACTIVE) == 3
+    with quota.scheduled(INTERACTIVE, timeout=0.1):
+        quota.acquire("account", SEARCH)
+
+
+def test_waiting_requests_are_served_by_priority():
+    quota = QuotaManager(limits={"search": ((1, 0.2),)}, shares=EQUAL_SHARES)
+    quota.acquire("account", SEARCH)
+
+    served = []
+
+    def send(priority):
+        quota.acquire("account", SEARCH, priority=priority)
+        served.append(priority)
+
+    threads = []
+    for priority in (BACKGROUND, NORMAL, INTERACTIVE):
+        thread = threading.Thread(target=send, args=(priority,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert served == [INTERACTIVE, NORMAL, BACKGROUND]
+
+
+def test_usage_survives_restarts(tmp_path):
+    path = str(tmp_path / "quota.json")
+    quota = QuotaManager(limits={"search": ((2, 60),)}, path=path)
+    quota.acquire("account", SEARCH)
+    quota.save()
+
+    assert QuotaManager(limits={"search": ((2, 60),)}, path=path).usage("account", "search") == 1
+
+
+def test_client_requests_take_budget(tmp_path):
+    quota = QuotaManager(limits={"profiles": ((2, 60),)}, shares=EQUAL_SHARES)
+    with MockVoyagerServer() as server:
+        api = mock_linkedin(
+            server.base_url, session_store=SessionStore(str(tmp_path)), quota=quota, account="account"
+        )
+        # the profile and its skills
+        api.get_profile("person-1")
+        assert quota.usage("account", "profiles") == 2
+
+        with quota.scheduled(timeout=0.1), pytest.raises(QuotaExceeded):
+            api.get_user_profile()
+        api.get_invitations()
+
+
+def test_session_pool_charges_each_account(tmp_path):
+    quota = QuotaManager()
+    pool = SessionPool(session_store=SessionStore(str(tmp_path)), quota=quota)
+    pool.add_account("account-0", "user0@example.com", "password")
+
+    client = pool.get("account-0").client
+    assert client.quota is quota
+    assert client.account == "account-0"
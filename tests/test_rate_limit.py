@@ -0,0 +1,93 @@
+import multiprocessing
+import time
+
+import pytest
+
+from linkedin_api.rate_limit import (
+    LocalRateLimiter,
+    RateLimiter,
+    RateLimitExceeded,
+    RedisRateLimiter,
+    SQLiteRateLimiter,
+)
+from linkedin_api.session_store import SessionStore
+
+from mock_server import MockVoyagerServer, mock_linkedin
+
+RATE = 50
+PER_PROCESS = 15
+
+
+def take_tokens(path):
+    limiter = SQLiteRateLimiter(path, rate=RATE)
+    times = []
+    for _ in range(PER_PROCESS):
+        limiter.acquire("account")
+        times.append(time.time())
+    return times
+
+
+def test_bursts_then_paces():
+    limiter = LocalRateLimiter(rate=20, burst=2)
+    assert limiter.try_acquire("account") == 0
+    assert limiter.try_acquire("account") == 0
+    assert 0 < limiter.try_acquire("account") <= 0.05
+
+    started = time.monotonic()
+    limiter.acquire("account")
+    assert time.monotonic() - started >= 0.04
+
+
+def test_limiters_store_their_buckets():
+    with pytest.raises(TypeError):
+        RateLimiter(rate=1)
+
+
+def test_keys_have_their_own_bucket(tmp_path):
+    limiter = SQLiteRateLimiter(str(tmp_path / "rate.db"), rate=1)
+    assert limiter.try_acquire("first") == 0
+    assert limiter.try_acquire("second") == 0
+    assert limiter.try_acquire("first") > 0
+
+
+def test_timeout(tmp_path):
+    limiter = SQLiteRateLimiter(str(tmp_path / "rate.db"), rate=0.1)
+    limiter.acquire("account")
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("account", timeout=1)
+
+
+def test_processes_share_one_budget(tmp_path):
+    path = str(tmp_path / "rate.db")
+    SQLiteRateLimiter(path, rate=RATE)
+    with multiprocessing.get_context("spawn").Pool(3) as pool:
+        times = sorted(t for result in pool.map(take_tokens, [path] * 3) for t in result)
+
+    # 45 tokens, the first from a full bucket of 1, the rest at 50 a second
+    assert times[-1] - times[0] >= (len(times) - 2) / RATE - 0.02
+    for first, last in zip(times, times[10:]):
+        assert last - first >= 9 / RATE - 0.02
+
+
+def test_redis(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    limiter = RedisRateLimiter(fakeredis.FakeRedis(), rate=1)
+    assert limiter.try_acquire("account") == 0
+    assert 0 < limiter.try_acquire("account") <= 1
+
+
+def test_clients_take_tokens(tmp_path):
+    limiter = SQLiteRateLimiter(str(tmp_path / "rate.db"), rate=20)
+    with MockVoyagerServer() as server:
+        api = mock_linkedin(
+            server.base_url,
+            session_store=SessionStore(str(tmp_path)),
+            rate_limiter=limiter,
+            account="account",
+        )
+        started = time.monotonic()
+        for _ in range(5):
+            api.get_user_profile()
+        assert time.monotonic() - started >= 4 / 20
@@ -0,0 +1,71 @@
+import pytest
+import requests
+
+from linkedin_api.sales_navigator import build_decoration, restli_encode
+from linkedin_api.session_store import SessionStore
+
+from mock_server import FaultProfile, MockVoyagerHandler, MockVoyagerServer, mock_linkedin
+
+
+class RecordingHandler(MockVoyagerHandler):
+    # sales searches without paging, each query string recorded
+    queries = []
+
+    def sales_search(self, query):
+        RecordingHandler.queries.append(query)
+        data = super().sales_search(query)
+        del data["paging"]
+        return data
+
+
+class RecordingServer(MockVoyagerServer):
+    handler_class = RecordingHandler
+
+
+def sales_for(server, tmp_path):
+    return mock_linkedin(server.base_url, session_store=SessionStore(str(tmp_path))).sales_navigator()
+
+
+def test_restli_encode():
+    assert restli_encode({"keywords": "data eng", "titleIncluded": ["CTO", "VP"], "spotlight": False}) == (
+        "(keywords:data%20eng,titleIncluded:List(CTO,VP),spotlight:false)"
+    )
+
+
+def test_build_decoration():
+    assert build_decoration(["entityUrn", "currentPositions"]) == "(entityUrn,currentPositions*)"
+    with pytest.raises(ValueError):
+        build_decoration(["entityUrn", "pastPositions*"])
+
+
+def test_pages_until_total(tmp_path):
+    with MockVoyagerServer(people=60) as server:
+        leads = list(sales_for(server, tmp_path).iter_sales_people_search("python"))
+    assert [lead["firstName"] for lead in leads] == [f"First{i}" for i in range(60)]
+
+
+def test_pages_until_empty_without_total(tmp_path):
+    RecordingHandler.queries = []
+    with RecordingServer(people=60) as server:
+        assert len(list(sales_for(server, tmp_path).iter_sales_people_search("python"))) == 60
+    assert [query["start"] for query in RecordingHandler.queries] == [["0"], ["25"], ["50"], ["75"]]
+
+
+def test_fields_are_projected(tmp_path):
+    RecordingHandler.queries = []
+    with RecordingServer(people=3) as server:
+        leads = list(
+            sales_for(server, tmp_path).iter_sales_people_search("python", fields=("fullName", "currentPositions"))
+        )
+
+    assert RecordingHandler.queries[0]["decoration"] == ["(fullName,currentPositions*)"]
+    assert leads[0] == {
+        "fullName": "First0 Last0",
+        "currentPositions": [{"title": "Engineer", "companyName": "Company 0", "current": True}],
+    }
+
+
+def test_throttled_pages_are_raised(tmp_path):
+    with MockVoyagerServer(faults=FaultProfile(errors={999: 1.0})) as server:
+        with pytest.raises(requests.HTTPError):
+            list(sales_for(server, tmp_path).iter_sales_people_search("python"))
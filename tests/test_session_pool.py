@@ -0,0 +1,61 @@
+import pytest
+from requests.adapters import HTTPAdapter
+
+from linkedin_api.session_pool import SessionPool
+from linkedin_api.session_store import SessionStore
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SessionPool(session_store=SessionStore(str(tmp_path)), max_active=2)
+    for i in range(3):
+        pool.add_account(f"account-{i}", f"user{i}@example.com", "password")
+    return pool
+
+
+def test_accounts_get_their_own_client(pool):
+    first = pool.get("account-0")
+    second = pool.get("account-1")
+
+    assert first is pool.get("account-0")
+    assert first.client is not second.client
+    assert first.client.session.headers is not second.client.session.headers
+    assert first.client._credentials[0] == "user0@example.com"
+
+
+def test_accounts_share_one_connection_pool(pool):
+    first = pool.get("account-0")
+    second = pool.get("account-1")
+
+    assert first.client.session.get_adapter("https://www.linkedin.com") is pool.adapter
+    assert second.client.session.get_adapter("https://www.linkedin.com") is pool.adapter
+
+
+def test_least_recently_used_accounts_are_evicted(pool):
+    first = pool.get("account-0")
+    second = pool.get("account-1")
+    pool.get("account-0")
+    third = pool.get("account-2")
+
+    # account-1 was evicted, and is rebuilt on its next use
+    assert pool.get("account-0") is first
+    assert pool.get("account-2") is third
+    assert "account-1" in pool
+    rebuilt = pool.get("account-1")
+    assert rebuilt is not second
+    assert rebuilt.client._credentials[0] == "user1@example.com"
+
+
+def test_accounts_share_a_given_transport(tmp_path):
+    adapter = HTTPAdapter()
+    pool = SessionPool(session_store=SessionStore(str(tmp_path)), transport=adapter)
+    pool.add_account("account-0", "user0@example.com", "password")
+
+    client = pool.get("account-0").client
+    assert client.transport is adapter
+    assert client.session.get_adapter("https://www.linkedin.com") is adapter
+
+
+def test_unknown_account(pool):
+    with pytest.raises(KeyError):
+        pool.get("missing")
@@ -0,0 +1,77 @@
+import os
+import stat
+import time
+
+import pytest
+from requests.cookies import RequestsCookieJar, create_cookie
+
+import linkedin_api.client
+from linkedin_api.client import Client
+from linkedin_api.session_store import SessionStore
+
+
+def make_cookiejar(expires):
+    cookiejar = RequestsCookieJar()
+    cookiejar.set_cookie(
+        create_cookie("li_at", "token", domain=".www.linkedin.com", expires=expires)
+    )
+    cookiejar.set_cookie(
+        create_cookie("JSESSIONID", '"ajax:123"', domain=".www.linkedin.com", expires=expires)
+    )
+    return cookiejar
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path))
+
+
+def test_save_and_load(store):
+    store.save("a@example.com", make_cookiejar(int(time.time()) + 3600))
+
+    cookies = store.load("a@example.com")
+    assert cookies["li_at"] == "token"
+    assert cookies["JSESSIONID"] == '"ajax:123"'
+    assert store.load("b@example.com") is None
+
+
+def test_expired_session_is_not_loaded(store):
+    store.save("a@example.com", make_cookiejar(int(time.time()) - 1))
+
+    assert store.load("a@example.com") is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_sessions_are_private(tmp_path):
+    store = SessionStore(str(tmp_path / "cookies"))
+    store.save("a@example.com", make_cookiejar(int(time.time()) + 3600))
+
+    assert stat.S_IMODE(os.stat(store.directory).st_mode) == 0o700
+    (path,) = [os.path.join(store.directory, name) for name in os.listdir(store.directory)]
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_accounts_do_not_overwrite_each_other(store):
+    store.save("a@example.com", make_cookiejar(int(time.time()) + 3600))
+    other = make_cookiejar(int(time.time()) + 3600)
+    other.set("li_at", "other-token", domain=".www.linkedin.com")
+    store.save("b@example.com", other)
+
+    assert store.load("a@example.com")["li_at"] == "token"
+    assert store.load("b@example.com")["li_at"] == "other-token"
+
+
+def test_authenticate_reuses_stored_session(store, monkeypatch):
+    store.save("a@example.com", make_cookiejar(int(time.time()) + 3600))
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("authenticate should not hit the network")
+
+    monkeypatch.setattr(linkedin_api.client.requests, "get", no_network)
+    monkeypatch.setattr(linkedin_api.client.requests, "post", no_network)
+
+    client = Client(session_store=store)
+    client.authenticate("a@example.com", "password")
+
+    assert client.session.cookies["li_at"] == "token"
+    assert client.csrf_token == "ajax:123"
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from requests.adapters import BaseAdapter
+
+from linkedin_api.client import Client
+from linkedin_api.linkedin import Linkedin
+from linkedin_api.session_store import SessionStore
+from linkedin_api.transport import (
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+    UnrecordedRequestException,
+    make_response,
+)
+
+
+class CountingAdapter(BaseAdapter):
+    """
+    Answers each request with {"n": <number of requests so far>}.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        body = f'{{"n": {self.sent}}}'.encode()
+        return make_response(request, 200, body, content_type="application/json")
+
+    def close(self):
+        pass
+
+
+def client_with(tmp_path, transport):
+    return Client(
+        evade=lambda: None, session_store=SessionStore(str(tmp_path)), transport=transport
+    )
+
+
+def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    client = client_with(tmp_path, RecordingTransport(Cassette(path), CountingAdapter()))
+    url = f"{Client.API_BASE_URL}/me"
+    assert client.request("GET", url).json() == {"n": 1}
+    assert client.request("POST", url, data="{}").json() == {"n": 2}
+    client.session.close()
+
+    client = client_with(tmp_path, ReplayTransport(Cassette.load(path), latency=0))
+    assert client.request("POST", url, data="{}").json() == {"n": 2}
+    assert client.request("GET", url).json() == {"n": 1}
+
+
+def test_repeated_requests_replay_in_order(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.json"))
+    client = client_with(tmp_path, RecordingTransport(cassette, CountingAdapter()))
+    url = f"{Client.API_BASE_URL}/me"
+    for _ in range(2):
+        client.request("GET", url)
+
+    client = client_with(tmp_path, ReplayTransport(cassette, latency=0))
+    assert [client.request("GET", url).json()["n"] for _ in range(3)] == [1, 2, 2]
+
+
+def test_unrecorded_request_raises(tmp_path):
+    client = client_with(tmp_path, ReplayTransport(Cassette("empty.json"), latency=0))
+    api = Linkedin(None, None, client=client)
+    with pytest.raises(UnrecordedRequestException):
+        api.get_user_profile()
+
+
+def test_replay_latency(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.json"))
+    client = client_with(tmp_path, RecordingTransport(cassette, CountingAdapter()))
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+    cassette.interactions[0]["elapsed"] = 0.2
+
+    client = client_with(tmp_path, ReplayTransport(cassette, latency=0.5))
+    started = time.perf_counter()
+    client.request("GET", f"{Client.API_BASE_URL}/me")
+    assert 0.1 <= time.perf_counter() - started < 0.2